@@ -3,20 +3,30 @@
 Event Scraper API Server - Standalone Flask server for the event scraper
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import io
 import os
 import sys
-import json
 import logging
+import threading
 from datetime import datetime
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from database_manager import AADSDataManager
-from scraper import DartConnectScraper
-from event_data_manager import EventDataManager
+from database_manager import open_data_manager
+from scraper import DartConnectScraper, event_id_from_url
+from event_data_manager import RAW_KINDS, EventDataManager
+from response_cache import ResponseCache
+from bulk_scraper import BulkRecapScraper, stats_entries_for_match
+from config_loader import load_config
+from http_cache import HTTPCache
+from throttling import HostRateLimiter
+from serializer import dump_file, dumps, dumps_text, loads
+from job_queue import JOB_QUEUED, JOB_RUNNING, JobQueue
+from live_tail import EventTailer, load_tail_cursor, request_tail_stop
 
 # Setup logging
 logging.basicConfig(
@@ -25,14 +35,215 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class SerializerJSONProvider(DefaultJSONProvider):
+    """jsonify() through the shared serializer, encoding straight to response bytes"""
+    
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, pretty=False).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, pretty=False), mimetype=self.mimetype)
+
+
 # Initialize Flask app
 app = Flask(__name__, static_folder='.')
+app.json = SerializerJSONProvider(app)
 CORS(app)
 
-# Initialize managers
-db_manager = AADSDataManager(db_file="data/aads_master_db.json")
-event_manager = EventDataManager(base_dir="data/event_data")
-scraper = DartConnectScraper(db_manager, log_level=logging.INFO)
+# Load config/config.json (defaults for anything missing)
+config = load_config()
+scraper_config = config['scraper']
+
+# Initialize managers (DB_FILE ending in .db selects the SQLite backend)
+db_manager = open_data_manager(db_file=os.environ.get('DB_FILE', 'data/aads_master_db.json'))
+event_manager = EventDataManager(base_dir="data/event_data", raw_retention=config['data']['raw_retention'])
+
+# On-disk HTTP cache; HTTP_CACHE_OFFLINE=1 replays cached responses without network access
+cache_config = config['http_cache']
+http_cache = None
+if cache_config['enabled']:
+    http_cache = HTTPCache(
+        cache_dir=cache_config['dir'],
+        max_size_mb=cache_config['max_size_mb'],
+        offline=cache_config['offline'] or os.environ.get('HTTP_CACHE_OFFLINE', '').lower() in ('1', 'true', 'yes')
+    )
+
+scraper = DartConnectScraper(
+    db_manager,
+    log_level=logging.INFO,
+    use_selenium=scraper_config['use_selenium'],
+    driver_pool_size=scraper_config['driver_pool_size'],
+    max_pages_per_driver=scraper_config['max_pages_per_driver'],
+    page_ready_timeout=scraper_config['page_ready_timeout_seconds'],
+    network_idle_ms=scraper_config['network_idle_ms'],
+    rate_limiter=HostRateLimiter(scraper_config['delay_between_requests_ms']),
+    http_cache=http_cache
+)
+
+# The scraper above is per process (each gunicorn worker imports this module);
+# request threads use their own copy of it, see get_scraper()
+_worker_scrapers = threading.local()
+
+
+def get_scraper() -> DartConnectScraper:
+    """The calling thread's scraper (own HTTP session; browsers, caches and rate limiter are shared)"""
+    worker_scraper = getattr(_worker_scrapers, 'scraper', None)
+    if worker_scraper is None:
+        worker_scraper = _worker_scrapers.scraper = scraper.spawn_worker()
+    return worker_scraper
+
+
+bulk_scraper = BulkRecapScraper(
+    scraper,
+    db_manager,
+    event_manager,
+    workers=scraper_config['bulk_workers'],
+    max_retries=scraper_config['max_retries']
+)
+
+# Pre-encoded responses for the polled read endpoints
+response_cache = ResponseCache()
+
+
+def cached_json_response(key: str, version, build):
+    """Serve a cached JSON payload with ETag / If-None-Match and gzip support"""
+    entry = response_cache.get(key, version, build)
+    
+    if request.if_none_match.contains(entry.etag):
+        response = Response(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(entry.gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(entry.body, mimetype='application/json')
+    
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def run_scrape_event(event_url: str, event_number, log_step=None):
+    """Stage 1: find an event's matches and save them
+    
+    Args:
+        event_url: Event page URL
+        event_number: AADS event number
+        log_step: Optional callable receiving each progress message as it happens
+    
+    Returns:
+        (response payload, HTTP status code)
+    """
+    logger.info(f"Scraping Event {event_number}: {event_url}")
+    
+    # Scrape the event for matches
+    result = get_scraper().scrape_event_for_matches(event_url, progress_callback=log_step)
+    
+    if not result['success']:
+        return result, 400
+    
+    event_id = result['event_id']
+    matches = result['matches']
+    raw_response = result.get('raw_response')
+    
+    # Save matches using event data manager with event number
+    saved_to = event_manager.save_event_matches(
+        event_id=event_id,
+        matches=matches,
+        raw_api_response=raw_response,
+        event_number=event_number
+    )
+    
+    # Get event summary
+    summary = event_manager.get_event_summary(event_id)
+    
+    # Check if event already existed
+    is_duplicate = event_manager.event_exists(event_id)
+    
+    return {
+        'success': True,
+        'event_id': event_id,
+        'event_number': event_number,
+        'matches': matches,
+        'saved_to': saved_to,
+        'is_duplicate_event': is_duplicate,
+        'data_summary': summary,
+        'progress_log': result.get('progress_log', [])
+    }, 200
+
+
+def run_scrape_event_details(event_id: str, limit=None, log_step=None, match_urls=None):
+    """Stage 2 (bulk): scrape an event's pending matches (or only match_urls), reporting each one as it finishes"""
+    def on_result(result):
+        if log_step:
+            name = result.get('title') or result['url']
+            if result['success']:
+                log_step(f"✓ {name}: {result['players_added']} player entries added")
+            else:
+                log_step(f"✗ {name}: {result['error']}")
+    
+    if log_step:
+        log_step(f"Scraping pending matches for event {event_id}...")
+    summary = bulk_scraper.scrape_event(event_id, on_result=on_result, limit=limit, urls=match_urls)
+    if log_step:
+        log_step(f"✓ Complete: {summary['matches_completed']}/{summary['matches_total']} matches, "
+                 f"{summary['players_added']} player entries added")
+    return {'success': True, **summary}
+
+
+def run_tail_event(event_id: str, event_number=None, log_step=None):
+    """Live mode: poll an event's match list and queue a recap scrape for each newly completed match
+    
+    Runs until the event has been quiet for live_tail.idle_timeout_minutes or
+    DELETE /api/events/<event_id>/tail is called; occupies one job worker meanwhile.
+    """
+    tail_config = config['live_tail']
+    
+    def enqueue(matches):
+        job_id = job_queue.submit('scrape_event_details', {
+            'event_id': event_id,
+            'match_urls': [match['url'] for match in matches]
+        })
+        if log_step:
+            log_step(f"Queued recap scrape of {len(matches)} match(es) as job {job_id}")
+    
+    tailer = EventTailer(
+        get_scraper(), event_manager, event_id,
+        on_new_matches=enqueue,
+        event_number=event_number,
+        min_interval=tail_config['min_interval_seconds'],
+        max_interval=tail_config['max_interval_seconds'],
+        backoff=tail_config['backoff'],
+        idle_timeout=tail_config['idle_timeout_minutes'] * 60
+    )
+    return tailer.run(log_step)
+
+
+# Background jobs: long scrapes run on worker threads and stream their progress
+jobs_config = config['jobs']
+job_queue = JobQueue(jobs_dir=jobs_config['dir'], workers=jobs_config['workers'],
+                     keep_finished=jobs_config['keep_finished'])
+job_queue.register('scrape_event', lambda params, log_step: run_scrape_event(
+    params['event_url'], params['event_number'], log_step)[0])
+job_queue.register('scrape_event_details', lambda params, log_step: run_scrape_event_details(
+    params['event_id'], params.get('limit'), log_step, params.get('match_urls')))
+job_queue.register('tail_event', lambda params, log_step: run_tail_event(
+    params['event_id'], params.get('event_number'), log_step))
+
+
+def active_tails() -> dict:
+    """Queued or running tail_event jobs by event id"""
+    tails = {}
+    for summary in job_queue.list_jobs():
+        if summary['type'] == 'tail_event' and summary['status'] in (JOB_QUEUED, JOB_RUNNING):
+            job = job_queue.get(summary['id'], include_log=False)
+            if job is not None:
+                tails[job['params']['event_id']] = summary['id']
+    return tails
 
 # ==================== STATIC FILES ====================
 
@@ -50,7 +261,7 @@ def serve_scraper():
 
 @app.route('/api/scrape_event', methods=['POST'])
 def scrape_event():
-    """Scrape an event page to find all match URLs"""
+    """Scrape an event page to find all match URLs (blocking; see /api/jobs for the background version)"""
     try:
         data = request.json
         event_url = data.get('event_url')
@@ -62,42 +273,8 @@ def scrape_event():
         if not event_number:
             return jsonify({'success': False, 'error': 'event_number is required'}), 400
         
-        logger.info(f"Scraping Event {event_number}: {event_url}")
-        
-        # Scrape the event for matches
-        result = scraper.scrape_event_for_matches(event_url)
-        
-        if result['success']:
-            event_id = result['event_id']
-            matches = result['matches']
-            raw_response = result.get('raw_response')
-            
-            # Save matches using event data manager with event number
-            saved_to = event_manager.save_event_matches(
-                event_id=event_id,
-                matches=matches,
-                raw_api_response=raw_response,
-                event_number=event_number
-            )
-            
-            # Get event summary
-            summary = event_manager.get_event_summary(event_id)
-            
-            # Check if event already existed
-            is_duplicate = event_manager.event_exists(event_id)
-            
-            return jsonify({
-                'success': True,
-                'event_id': event_id,
-                'event_number': event_number,
-                'matches': matches,
-                'saved_to': saved_to,
-                'is_duplicate_event': is_duplicate,
-                'data_summary': summary,
-                'progress_log': result.get('progress_log', [])
-            })
-        else:
-            return jsonify(result), 400
+        payload, status = run_scrape_event(event_url, event_number)
+        return jsonify(payload), status
             
     except Exception as e:
         logger.error(f"Error scraping event: {e}", exc_info=True)
@@ -120,7 +297,7 @@ def scrape_match_result():
         logger.info(f"Stage 1 - Scraping match result: {recap_url}")
         
         # Extract basic match result (player names, scores, winner)
-        result = scraper.extract_match_result(recap_url, match_index)
+        result = get_scraper().extract_match_result(recap_url, match_index)
         
         if result:
             return jsonify({
@@ -164,7 +341,7 @@ def scrape_match_details():
         is_knockout = phase in ['quarterfinal', 'semifinal', 'final']
         
         # Extract detailed player stats
-        players_stats = scraper.extract_player_stats_from_recap(recap_url)
+        players_stats = get_scraper().extract_player_stats_from_recap(recap_url)
         
         if not players_stats:
             return jsonify({
@@ -176,7 +353,7 @@ def scrape_match_details():
         sets_played = 0
         if is_knockout:
             # For knockout, extract set scores
-            sets_played = scraper.extract_sets_count(recap_url)
+            sets_played = get_scraper().extract_sets_count(recap_url)
         
         return jsonify({
             'success': True,
@@ -191,6 +368,132 @@ def scrape_match_details():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/scrape_event_details', methods=['POST'])
+def scrape_event_details():
+    """Stage 2 (bulk): scrape every pending match of an event concurrently"""
+    try:
+        data = request.json or {}
+        event_id = data.get('event_id')
+        
+        if not event_id:
+            return jsonify({'success': False, 'error': 'event_id is required'}), 400
+        
+        if not event_manager.event_exists(event_id):
+            return jsonify({'success': False, 'error': f'Event {event_id} not found'}), 404
+        
+        workers = data.get('workers')
+        runner = bulk_scraper
+        if workers:
+            try:
+                workers = int(workers)
+            except (TypeError, ValueError):
+                return jsonify({'success': False, 'error': 'workers must be an integer'}), 400
+            # Each worker is a thread (and with Selenium a browser page); never more than configured
+            workers = max(1, min(workers, scraper_config['max_bulk_workers']))
+            runner = BulkRecapScraper(scraper, db_manager, event_manager,
+                                      workers=workers, max_retries=scraper_config['max_retries'])
+        
+        logger.info(f"Stage 2 (bulk) - Scraping pending matches for event {event_id}")
+        summary = runner.scrape_event(event_id, limit=data.get('limit'))
+        
+        return jsonify({'success': True, **summary})
+        
+    except Exception as e:
+        logger.error(f"Error bulk scraping event details: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ==================== BACKGROUND JOBS ====================
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a scrape job; returns its id at once (202)"""
+    try:
+        data = request.json or {}
+        job_type = data.get('type')
+        params = data.get('params') or {}
+        
+        if job_type == 'scrape_event':
+            if not params.get('event_url') or not params.get('event_number'):
+                return jsonify({'success': False, 'error': 'event_url and event_number are required'}), 400
+        elif job_type == 'scrape_event_details':
+            if not params.get('event_id'):
+                return jsonify({'success': False, 'error': 'event_id is required'}), 400
+            if not event_manager.event_exists(params['event_id']):
+                return jsonify({'success': False, 'error': f"Event {params['event_id']} not found"}), 404
+            if not isinstance(params.get('match_urls', []), list):
+                return jsonify({'success': False, 'error': 'match_urls must be a list'}), 400
+        elif job_type == 'tail_event':
+            if not params.get('event_id') and params.get('event_url'):
+                params['event_id'] = event_id_from_url(params['event_url'])
+            if not params.get('event_id') or params['event_id'] == 'unknown':
+                return jsonify({'success': False, 'error': 'event_id or an event_url is required'}), 400
+            tails = active_tails()
+            if params['event_id'] in tails:
+                return jsonify({'success': False, 'error': f"Event {params['event_id']} is already being tailed",
+                                'job_id': tails[params['event_id']]}), 409
+            # A tail holds its worker for the whole event; keep one free for the recap scrapes it queues
+            if len(tails) + 1 >= job_queue.workers:
+                return jsonify({'success': False, 'error': f"{len(tails)} tail(s) already use the job workers; "
+                                                           f"raise jobs.workers to tail more events"}), 409
+        else:
+            return jsonify({'success': False, 'error': f"Unknown job type '{job_type}'"}), 400
+        
+        job_id = job_queue.submit(job_type, params)
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': f'/api/jobs/{job_id}',
+            'events_url': f'/api/jobs/{job_id}/events'
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error submitting job: {e}", exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent jobs, newest first (?status=queued|running|completed|failed)"""
+    return jsonify({'success': True, 'jobs': job_queue.list_jobs(request.args.get('status'))})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status, progress log and (once finished) result"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Job {job_id} not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job(job_id):
+    """Server-Sent Events: one 'log' event per progress message, then a 'done' event"""
+    if job_queue.get(job_id, include_log=False) is None:
+        return jsonify({'success': False, 'error': f'Job {job_id} not found'}), 404
+    
+    # EventSource reconnects send the id of the last message they received
+    try:
+        start = int(request.headers.get('Last-Event-ID', request.args.get('after', -1))) + 1
+    except ValueError:
+        start = 0
+    
+    def generate():
+        for event, index, payload in job_queue.stream(job_id, start):
+            if event == 'log':
+                yield f"id: {index}\nevent: log\ndata: {dumps_text({'index': index, 'message': payload})}\n\n"
+            elif event == 'done':
+                yield f"event: done\ndata: {dumps_text(payload)}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/api/send_to_admin', methods=['POST'])
 def send_to_admin():
     """Send scraped data to Supabase staging table"""
@@ -237,7 +540,7 @@ def scrape_recap():
         logger.info(f"Scraping recap: {recap_url}")
         
         # Extract stats from recap
-        players_stats = scraper.extract_player_stats_from_recap(recap_url)
+        players_stats = get_scraper().extract_player_stats_from_recap(recap_url)
         
         if not players_stats:
             return jsonify({
@@ -245,28 +548,10 @@ def scrape_recap():
                 'error': 'No player stats found in recap'
             }), 400
         
-        # Add stats to database
-        players_added = 0
-        for player_stats in players_stats:
-            success = db_manager.add_match_stats(
-                player_name=player_stats['player_name'],
-                event_id=event_id,
-                match_url=recap_url,
-                stats_dict={
-                    'three_dart_average': player_stats['three_dart_average'],
-                    'legs_played': player_stats.get('legs_played', 1),
-                    'matches_played': player_stats.get('matches_played', 1),
-                    'match_won': player_stats.get('match_won', 0),
-                    'count_180s': player_stats.get('count_180s', 0),
-                    'count_140_plus': player_stats.get('count_140_plus', 0),
-                    'count_100_plus': player_stats.get('count_100_plus', 0),
-                    'highest_finish': player_stats.get('highest_finish', 0),
-                    'double_attempts': player_stats.get('double_attempts', 0),
-                    'doubles_hit': player_stats.get('doubles_hit', 0)
-                }
-            )
-            if success:
-                players_added += 1
+        # Add stats to database (one write for the whole match)
+        players_added = db_manager.add_match_stats_bulk(
+            stats_entries_for_match(players_stats, event_id, recap_url, data.get('phase'), data.get('group'))
+        )
         
         # Update event data manager with match status
         event_manager.update_match_status(event_id, recap_url, 'completed', players_stats)
@@ -301,18 +586,18 @@ def upload_stage2():
         logger.info(f"Uploading Stage 2 data: {len(stats)} matches for event {event_id}")
         
         matches_processed = 0
-        players_added = 0
+        entries = []
         
         for match_data in stats:
             match_url = match_data.get('match_url', '')
             players = match_data.get('players', [])
             
             for player_stats in players:
-                success = db_manager.add_match_stats(
-                    player_name=player_stats.get('player_name', 'Unknown'),
-                    event_id=event_id,
-                    match_url=match_url,
-                    stats_dict={
+                entries.append({
+                    'player_name': player_stats.get('player_name', 'Unknown'),
+                    'event_id': event_id,
+                    'match_url': match_url,
+                    'stats_dict': {
                         'three_dart_average': player_stats.get('three_dart_average', 0),
                         'legs_played': player_stats.get('legs_played', 1),
                         'matches_played': player_stats.get('matches_played', 1),
@@ -322,15 +607,17 @@ def upload_stage2():
                         'count_100_plus': player_stats.get('count_100_plus', 0),
                         'highest_finish': player_stats.get('highest_finish', 0),
                         'double_attempts': player_stats.get('double_attempts', 0),
-                        'doubles_hit': player_stats.get('doubles_hit', 0)
+                        'doubles_hit': player_stats.get('doubles_hit', 0),
+                        **{key: match_data[key] for key in ('phase', 'group') if match_data.get(key)}
                     }
-                )
-                if success:
-                    players_added += 1
+                })
             
             if players:
                 matches_processed += 1
         
+        # Single database write for the whole upload
+        players_added = db_manager.add_match_stats_bulk(entries)
+        
         message = f"Uploaded {matches_processed} matches with {players_added} players"
         logger.info(message)
         
@@ -350,31 +637,154 @@ def upload_stage2():
 def get_events():
     """Get list of all events"""
     try:
-        events = event_manager.list_events()
-        return jsonify({'success': True, 'events': events})
+        return cached_json_response(
+            'events',
+            event_manager.data_version,
+            lambda: {'success': True, 'events': event_manager.list_events()}
+        )
     except Exception as e:
         logger.error(f"Error getting events: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/events/<event_id>/matches.csv', methods=['GET'])
+def export_event_csv(event_id):
+    """An event's matches with their current scrape status as CSV (generated on request)"""
+    try:
+        if not event_manager.event_exists(event_id):
+            return jsonify({'success': False, 'error': 'Event not found'}), 404
+        
+        buffer = io.StringIO(newline='')
+        event_manager.write_csv(event_id, buffer)
+        return Response(buffer.getvalue(), mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename={event_id}_matches.csv'})
+    except Exception as e:
+        logger.error(f"Error exporting CSV for {event_id}: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/events/<event_id>/raw/<kind>', methods=['GET'])
+def get_event_raw(event_id, kind):
+    """A saved raw payload (kind 'api_response' or 'matches'), streamed from the archive (?version=-1)"""
+    try:
+        if kind not in RAW_KINDS:
+            return jsonify({'success': False, 'error': f'Unknown payload kind: {kind}'}), 400
+        try:
+            version = int(request.args.get('version', -1))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'version must be an integer'}), 400
+        
+        versions = event_manager.raw_versions(event_id, kind)
+        digest = versions[version]['sha256'] if -len(versions) <= version < len(versions) else None
+        if digest and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            # Archived objects are stored gzipped: send them as they are
+            try:
+                stream = event_manager.archive.open(digest, compressed=True)
+            except OSError:
+                stream = None
+            encoding = 'gzip'
+        else:
+            stream = event_manager.open_raw(event_id, kind, version)
+            encoding = None
+        if stream is None:
+            return jsonify({'success': False, 'error': 'Payload not found'}), 404
+        
+        response = Response(_stream_chunks(stream), mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    except Exception as e:
+        logger.error(f"Error reading raw {kind} for {event_id}: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/events/<event_id>/tail', methods=['GET'])
+def get_event_tail(event_id):
+    """Live tail status: the cursor (matches seen, polls, current interval) and the running job"""
+    cursor = load_tail_cursor(event_manager.base_dir, event_id)
+    job_id = active_tails().get(event_id)
+    if cursor is None and job_id is None:
+        return jsonify({'success': False, 'error': f'Event {event_id} was never tailed'}), 404
+    return jsonify({'success': True, 'event_id': event_id, 'active': job_id is not None, 'job_id': job_id,
+                    'cursor': cursor})
+
+
+@app.route('/api/events/<event_id>/tail', methods=['DELETE'])
+def stop_event_tail(event_id):
+    """Stop an event's live tail after its current poll"""
+    job_id = active_tails().get(event_id)
+    if job_id is None:
+        return jsonify({'success': False, 'error': f'Event {event_id} is not being tailed'}), 404
+    request_tail_stop(event_manager.base_dir, event_id)
+    return jsonify({'success': True, 'event_id': event_id, 'job_id': job_id}), 202
+
+
+def _stream_chunks(stream, chunk_size: int = 64 * 1024):
+    with stream:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get all player statistics"""
     try:
-        stats = db_manager.get_all_stats()
-        return jsonify(stats)
+        return cached_json_response('stats', db_manager.data_version, db_manager.get_all_stats)
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+def query_list(name: str):
+    """Values of a repeatable / comma-separated query parameter (None if absent)"""
+    values = [value.strip() for arg in request.args.getlist(name) for value in arg.split(',') if value.strip()]
+    return values or None
+
+
+@app.route('/api/leaderboard', methods=['GET'])
+def get_filtered_leaderboard():
+    """Leaderboard over a slice of the matches (?event=&phase=&group=&scraped_since=, each optional)"""
+    try:
+        filters = {
+            'events': query_list('event'),
+            'phases': query_list('phase'),
+            'groups': query_list('group'),
+            'scraped_since': request.args.get('scraped_since') or None
+        }
+        if filters['scraped_since'] is not None:
+            try:
+                datetime.fromisoformat(filters['scraped_since'])
+            except ValueError:
+                return jsonify({'success': False, 'error': 'scraped_since must be an ISO date (YYYY-MM-DD)'}), 400
+        
+        key = 'leaderboard?' + '&'.join(f"{name}={','.join(value) if isinstance(value, list) else value}"
+                                        for name, value in filters.items() if value is not None)
+        return cached_json_response(
+            key,
+            db_manager.data_version,
+            lambda: {'success': True, 'filters': filters, 'players': db_manager.query_leaderboard(**filters)}
+        )
+    except Exception as e:
+        logger.error(f"Error getting leaderboard: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/admin/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'ok',
         'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'page_wait_metrics': scraper.get_wait_metrics(),
+        'recap_cache': {'size': len(scraper.recap_cache), **scraper.recap_cache.stats},
+        'jobs': job_queue.stats(),
+        'http_cache': {'entries': len(http_cache), 'bytes': http_cache.size_bytes(), 'offline': http_cache.offline,
+                       **http_cache.stats} if http_cache is not None else None
     })
 
 
@@ -397,8 +807,7 @@ def push_to_admin():
         filename = f'event{event_number}_stage{stage}_{timestamp}.json'
         filepath = os.path.join(review_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        dump_file(data, filepath)
         
         logger.info(f"Data pushed to admin panel: {filepath}")
         
@@ -420,10 +829,15 @@ if __name__ == '__main__':
     logger.info(f"Data directory: {os.path.abspath('data')}")
     logger.info(f"Event data directory: {os.path.abspath('data/event_data')}")
     logger.info("Server will be available at: http://localhost:5000")
+    logger.info("Development server - for production use: python wsgi.py (or gunicorn -c gunicorn.conf.py wsgi:app)")
     logger.info("=" * 50)
     
     # Ensure data directories exist
     os.makedirs('data', exist_ok=True)
     os.makedirs('data/event_data', exist_ok=True)
     
+    # The debug reloader runs this module twice; only the serving child runs jobs
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_queue.start()
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
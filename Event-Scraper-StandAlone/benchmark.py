@@ -0,0 +1,1120 @@
+#!/usr/bin/env python3
+"""
+Event Scraper Benchmarks - Micro-benchmarks for the storage and scraping paths
+
+Usage:
+    python benchmark.py dedup [--sizes 1000 10000 100000]
+    python benchmark.py pool [--pages 60] [--size 4]
+    python benchmark.py async [--matches 27] [--latency-ms 100] [--concurrency 16]
+    python benchmark.py extract [--fixtures data/fixtures/recaps] [--repeat 50] [--record URL ...]
+    python benchmark.py serialize [--players 200] [--events 7] [--matches 60]
+    python benchmark.py load [--requests 200] [--concurrency 16] [--threads 8] [--url http://host:5000]
+    python benchmark.py stress [--threads 8] [--inserts 25] [--readers 4] [--processes 2]
+    python benchmark.py matchlog [--records 50000] [--players 200]
+    python benchmark.py columnar [--records 100000] [--players 200] [--repeat 20]
+    python benchmark.py status [--matches 100]
+    python benchmark.py catalog [--events 50] [--matches 100]
+    python benchmark.py archive [--saves 40] [--retention 10]
+    python benchmark.py rebuild [--events 35] [--matches 120] [--players 200] [--workers 4]
+    python benchmark.py tail [--matches 20] [--every-ms 400] [--rerun-ms 5000]
+"""
+
+import argparse
+import contextlib
+import csv
+import functools
+import glob
+import html
+import io
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from bs4 import BeautifulSoup
+
+from database_manager import AADSDataManager, ranked_rows
+from driver_pool import WebDriverPool
+from inertia import extract_data_page, extract_data_page_soup
+import serializer
+
+
+def _timeit(func, repeat: int) -> float:
+    """Return the mean seconds per call of func over `repeat` calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_dedup(sizes, lookups: int = 20000):
+    """Duplicate-match detection cost as the number of recorded matches grows"""
+    print("Duplicate detection: (match_id, player) hash index vs legacy URL list scan")
+    print(f"{'recorded':>10} {'index ns/op':>12} {'list scan ns/op':>16}")
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = AADSDataManager(db_file=os.path.join(tmp, 'db.json'))
+            db.add_match_stats_bulk(
+                {
+                    'player_name': f'Player {i % 64}',
+                    'event_id': f'Event_{i % 7}',
+                    'match_url': f'https://recap.dartconnect.com/matches/m{i:08d}',
+                    'stats_dict': {'three_dart_average': 50.0, 'legs_played': 3}
+                }
+                for i in range(size)
+            )
+
+            probes = [
+                (f'https://recap.dartconnect.com/matches/m{(i * 7919) % (size * 2):08d}', f'Player {i % 64}')
+                for i in range(lookups)
+            ]
+            it = iter(probes * 2)
+            index_cost = _timeit(lambda: db.is_match_scraped(*next(it)), lookups)
+
+            # The old implementation: `match_url in list` (capped, it is linear)
+            legacy_list = [f'https://recap.dartconnect.com/matches/m{i:08d}' for i in range(size)]
+            miss = 'https://recap.dartconnect.com/matches/missing'
+            list_cost = _timeit(lambda: miss in legacy_list, max(10, lookups // max(1, size // 100)))
+
+        print(f"{size:>10} {index_cost * 1e9:>12.0f} {list_cost * 1e9:>16.0f}")
+
+
+class StaticPageDriver:
+    """WebDriver stand-in that loads pages over plain HTTP
+
+    Mimics the parts of the Selenium API the scraper uses (get, page_source,
+    current_url, quit) plus a fixed render delay, so the pool can be exercised
+    against a local static server without Chrome.
+    """
+
+    def __init__(self, render_delay: float = 0.05):
+        self.render_delay = render_delay
+        self.current_url = None
+        self.page_source = ''
+
+    def get(self, url: str):
+        with urllib.request.urlopen(url, timeout=10) as response:
+            self.page_source = response.read().decode('utf-8')
+        time.sleep(self.render_delay)
+        self.current_url = url
+
+    def quit(self):
+        self.current_url = None
+
+
+def serve_static(directory: str) -> ThreadingHTTPServer:
+    """Start a local static HTTP server on a free port (daemon thread)"""
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_pool(pages: int, size: int, render_delay: float = 0.05):
+    """Page fetch throughput through the WebDriver pool vs one shared browser"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'recap.html'), 'w', encoding='utf-8') as f:
+            f.write('<html><body><div id="app" data-page="{&quot;props&quot;:{}}"></div></body></html>')
+        server = serve_static(tmp)
+        url = f'http://127.0.0.1:{server.server_address[1]}/recap.html'
+
+        print(f"WebDriver pool: {pages} pages, {render_delay * 1000:.0f} ms simulated render")
+        for pool_size in sorted({1, size}):
+            pool = WebDriverPool(lambda: StaticPageDriver(render_delay), size=pool_size, max_pages_per_driver=25)
+            pool.warm()
+
+            def fetch(_):
+                with pool.driver() as driver:
+                    driver.get(url)
+                    return len(driver.page_source)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=pool_size * 2) as executor:
+                list(executor.map(fetch, range(pages)))
+            elapsed = time.perf_counter() - start
+            pool.close()
+
+            print(f"  size={pool_size:<3} {pages / elapsed:8.1f} pages/s  "
+                  f"created={pool.stats['created']} recycled={pool.stats['recycled']}")
+
+        server.shutdown()
+
+
+def serve_fake_recaps(latency: float) -> ThreadingHTTPServer:
+    """Local keep-alive server answering /matches, /counts and /players after `latency` seconds"""
+    page = {'component': 'Recap', 'props': {
+        'matchInfo': {'total_games': 5, 'total_sets': 1, 'opponents': [
+            {'name': 'Home', 'ppr': '55.0', 'leg_wins': 3, 'score': 3},
+            {'name': 'Away', 'ppr': '50.0', 'leg_wins': 2, 'score': 2}]},
+        'segments': {}, 'homePlayers': [{'name': 'Home Player'}], 'awayPlayers': [{'name': 'Away Player'}]}}
+    recap_html = f'<html><body><div id="app" data-page="{html.escape(json.dumps(page))}"></div></body></html>'.encode()
+    tab_json = json.dumps({'props': {}}).encode()
+
+    class RecapHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            body, content_type = (recap_html, 'text/html') if self.path.startswith('/matches/') else (tab_json, 'application/json')
+            self.send_response(200)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    class RecapServer(ThreadingHTTPServer):
+        request_queue_size = 256  # accept a burst of concurrent connections without SYN retries
+
+    server = RecapServer(('127.0.0.1', 0), RecapHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_async(matches: int, latency: float, concurrency: int):
+    """Event enrichment (recap + counts + players per match): one request at a time vs concurrent"""
+    from async_scraper import AsyncDartConnectScraper
+
+    server = serve_fake_recaps(latency)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    urls = [f'{base}/matches/m{i:04d}' for i in range(matches)]
+
+    print(f"Async scraping: {matches} matches x 3 requests, {latency * 1000:.0f} ms simulated latency")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AADSDataManager(db_file=os.path.join(tmp, 'db.json'))
+        for label, limit in (('sequential', 1), ('concurrent', concurrency)):
+            scraper = AsyncDartConnectScraper(db, log_level=logging.WARNING, concurrency=limit, enrich_from_api=True,
+                                              recap_base_url=base, recap_cache_size=0)
+            start = time.perf_counter()
+            results = scraper.scrape_recaps(urls)
+            elapsed = time.perf_counter() - start
+            ok = sum(1 for stats in results.values() if stats)
+            print(f"  {label:<11} concurrency={limit:<3} {elapsed:7.2f}s  "
+                  f"({elapsed / latency:5.1f} round trips, {ok}/{matches} matches)")
+
+    server.shutdown()
+
+
+RECAP_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fixtures', 'recaps')
+
+
+def record_recap_pages(urls, fixtures_dir: str):
+    """Save recap pages exactly as DartConnect serves them (<match id>.html) for bench_extract"""
+    import requests
+    from database_manager import match_id_from_url
+    from scraper import BROWSER_HEADERS
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for url in urls:
+        response = requests.get(url, headers=BROWSER_HEADERS, timeout=30)
+        response.raise_for_status()
+        path = os.path.join(fixtures_dir, f'{match_id_from_url(url)}.html')
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"Recorded {url} -> {path} ({len(response.content) / 1024:.1f} KB)")
+
+
+def bench_extract(fixtures_dir: str, repeat: int):
+    """Inertia payload extraction on recorded recap pages: targeted scan vs full BeautifulSoup parse"""
+    from recap_document import RecapDocument
+
+    def soup_lxml(page_source):
+        app_div = BeautifulSoup(page_source, 'lxml').find('div', id='app')
+        return json.loads(app_div['data-page'])
+
+    extractors = [('fast scan', extract_data_page), ('bs4 html.parser', extract_data_page_soup)]
+    try:
+        import lxml  # noqa: F401
+        extractors.append(('bs4 lxml', soup_lxml))
+    except ImportError:
+        pass
+
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, '*.html')))
+    if not paths:
+        print(f"No recorded recap pages under {fixtures_dir}; record some first:")
+        print("  python benchmark.py extract --record https://recap.dartconnect.com/matches/<match id>")
+        return
+
+    print(f"Inertia data-page extraction ({repeat} runs per page)")
+    print(f"{'recap page':<32} {'KB':>6} " + ' '.join(f'{name:>16}' for name, _ in extractors)
+          + f" {'RecapDocument':>16}")
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            page_source = f.read()
+        reference = extractors[-1][1](page_source)
+        costs = []
+        for name, extract in extractors:
+            assert extract(page_source) == reference, f"{path}: {name} output differs"
+            costs.append(_timeit(lambda: extract(page_source), repeat))
+        # The production path: extraction plus player stats from the payload
+        players = RecapDocument(page_source=page_source, match_id='bench').player_stats
+        assert players, f"{path}: no player stats parsed"
+        costs.append(_timeit(lambda: RecapDocument(page_source=page_source, match_id='bench').player_stats, repeat))
+        print(f"{os.path.basename(path)[-32:]:<32} {len(page_source) / 1024:>6.1f} "
+              + ' '.join(f'{cost * 1000:>13.3f} ms' for cost in costs))
+
+
+def build_series_db(db_file: str, players: int, events: int, matches_per_event: int) -> AADSDataManager:
+    """A master database shaped like a full series (every match adds two players' stats)"""
+    db = AADSDataManager(db_file=db_file)
+    with db.batch():
+        for event in range(1, events + 1):
+            db.add_match_stats_bulk(
+                {
+                    'player_name': f'Player {(((event - 1) * matches_per_event + m) * 2 + side) % players:04d}',
+                    'event_id': f'Event_{event}',
+                    'match_url': f'https://recap.dartconnect.com/matches/e{event}m{m:05d}',
+                    'stats_dict': {
+                        'three_dart_average': 40 + (m * 7 + side * 13) % 40 + 0.37,
+                        'legs_played': 5, 'matches_played': 1, 'match_won': side,
+                        'count_180s': m % 3, 'count_140_plus': m % 5, 'count_100_plus': m % 9,
+                        'highest_finish': 40 + m % 100, 'double_attempts': 9, 'doubles_hit': 3
+                    }
+                }
+                for m in range(matches_per_event)
+                for side in (0, 1)
+            )
+    return db
+
+
+def bench_serialize(players: int, events: int, matches_per_event: int, repeat: int = 10):
+    """Master DB save and /api/stats encoding: old json.dump(indent=2) / jsonify vs the serializer"""
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_series_db(os.path.join(tmp, 'db.json'), players, events, matches_per_event)
+        history = sum(len(entries) for entries in db.get_match_history().values())
+        print(f"Serialization: {len(db.data['players'])} players, {events} events, {history} history records "
+              f"(fast backend: {'orjson' if serializer.ORJSON_AVAILABLE else 'not installed'})")
+
+        old_path = os.path.join(tmp, 'old.json')
+
+        def old_save():
+            with open(old_path, 'w', encoding='utf-8') as f:
+                # default=list: the old save turned the events_played sets into lists first
+                json.dump(db.data, f, indent=2, ensure_ascii=False, default=list)
+
+        stats_payload = db.get_stats_api_format()
+        flask_provider = DefaultJSONProvider(Flask('bench'))
+
+        rows = [('DB save: json.dump indent=2 (before)', _timeit(old_save, repeat), os.path.getsize(old_path)),
+                ('/api/stats: Flask jsonify (before)', _timeit(lambda: flask_provider.dumps(stats_payload), repeat),
+                 len(flask_provider.dumps(stats_payload).encode('utf-8')))]
+
+        backends = ['json'] + (['orjson'] if serializer.ORJSON_AVAILABLE else [])
+        original_backend = serializer.BACKEND
+        try:
+            for backend in backends:
+                serializer.BACKEND = backend
+                rows.append((f'DB save: serializer compact ({backend})', _timeit(db._save_database, repeat),
+                             os.path.getsize(db.db_file)))
+                rows.append((f'/api/stats: serializer ({backend})',
+                             _timeit(lambda: serializer.dumps(stats_payload, pretty=False), repeat),
+                             len(serializer.dumps(stats_payload, pretty=False))))
+        finally:
+            serializer.BACKEND = original_backend
+
+        for label, cost, size in rows:
+            print(f"  {label:<42} {cost * 1000:9.2f} ms  {size / 1024:9.1f} KB")
+
+
+def serve_wsgi(app, threads: int):
+    """Serve a WSGI app on a free local port: waitress when installed, else Werkzeug
+
+    Returns:
+        (base URL, shutdown callable, description)
+    """
+    try:
+        from waitress.server import create_server
+    except ImportError:
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', 0, app, threaded=threads > 1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        label = 'werkzeug threaded' if threads > 1 else 'werkzeug single-threaded'
+        return f'http://127.0.0.1:{server.port}', server.shutdown, label
+
+    # Requests queueing behind busy threads is the point of the single-threaded run
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    server = create_server(app, host='127.0.0.1', port=0, threads=threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    return f'http://127.0.0.1:{server.effective_port}', server.close, f'waitress threads={threads}'
+
+
+def _timed_request(base: str, method: str, path: str, body=None):
+    """One HTTP request; returns (seconds, ok)"""
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    headers = {'Content-Type': 'application/json'} if data else {}
+    req = urllib.request.Request(base + path, data=data, method=method, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            response.read()
+            ok = 200 <= response.status < 300
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def bench_load(requests_count: int, concurrency: int, threads: int, latency: float, url: str = None):
+    """Throughput of /api/stats and the scrape endpoints, single-threaded vs threaded serving
+
+    Without --url the API is served in-process from a temporary data directory
+    (seeded with a series-sized DB), scraping recaps from a local fake server
+    with no browser, HTTP cache or rate limit, so the numbers show the server.
+    With --url an already running server is measured (it must reach 127.0.0.1).
+    """
+    recaps = serve_fake_recaps(latency)
+    recap_base = f'http://127.0.0.1:{recaps.server_address[1]}'
+    tmp = None
+    targets = []
+
+    if url:
+        targets.append((url.rstrip('/'), None, url))
+    else:
+        here = os.path.dirname(os.path.abspath(__file__))
+        sys.path.insert(0, here)
+        tmp = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        os.environ['DB_FILE'] = os.path.join(tmp.name, 'data', 'aads_master_db.json')
+        build_series_db(os.environ['DB_FILE'], players=200, events=7, matches_per_event=60)
+
+        logging.disable(logging.INFO)
+        import api_server
+        api_server.scraper.use_selenium = False
+        api_server.scraper.http_cache = None
+        api_server.scraper.rate_limiter = None
+
+        for server_threads in sorted({1, threads}):
+            targets.append(serve_wsgi(api_server.app, server_threads))
+
+    scenarios = [
+        ('GET /api/stats', lambda run, i: ('GET', '/api/stats', None)),
+        ('POST /api/scrape_match_details', lambda run, i: ('POST', '/api/scrape_match_details', {
+            'recap_url': f'{recap_base}/matches/d{run}x{i:06d}', 'event_id': 'Load_Event'})),
+        ('POST /api/scrape_recap', lambda run, i: ('POST', '/api/scrape_recap', {
+            'recap_url': f'{recap_base}/matches/r{run}x{i:06d}', 'event_id': 'Load_Event'})),
+    ]
+
+    print(f"Load test: {requests_count} requests per endpoint, {concurrency} concurrent clients, "
+          f"{latency * 1000:.0f} ms simulated DartConnect latency")
+    print(f"{'server':<26} {'endpoint':<32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    try:
+        for run, (base, _, label) in enumerate(targets):
+            for name, make_request in scenarios:
+                def call(i):
+                    return _timed_request(base, *make_request(run, i))
+
+                start = time.perf_counter()
+                # The scraper prints progress to stdout; keep the table readable
+                with contextlib.redirect_stdout(io.StringIO()):
+                    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                        results = list(executor.map(call, range(requests_count)))
+                elapsed = time.perf_counter() - start
+
+                latencies = sorted(seconds for seconds, _ in results)
+                errors = sum(1 for _, ok in results if not ok)
+                p50 = latencies[len(latencies) // 2]
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(f"{label:<26} {name:<32} {requests_count / elapsed:8.1f} {p50 * 1000:8.1f} "
+                      f"{p95 * 1000:8.1f} {errors:>7}")
+    finally:
+        for _, shutdown, _ in targets:
+            if shutdown:
+                shutdown()
+        recaps.shutdown()
+        if tmp is not None:
+            os.chdir(cwd)
+            logging.disable(logging.NOTSET)
+            tmp.cleanup()
+
+
+STRESS_PLAYERS = 10
+
+
+def _stress_records(writer: int, thread: int, inserts: int):
+    """The (player, match_url) records one writer thread inserts"""
+    for i in range(inserts):
+        yield (f'Player {(writer * 7 + thread * 3 + i) % STRESS_PLAYERS:02d}',
+               f'https://recap.dartconnect.com/matches/w{writer}t{thread}m{i:05d}')
+
+
+def _stress_writer(db_file: str, writer: int, threads: int, inserts: int) -> int:
+    """Insert from `threads` threads through one AADSDataManager; returns records added
+
+    Every fifth record is submitted twice to exercise duplicate rejection.
+    Runs in the benchmark process and in each extra writer process.
+    """
+    db = AADSDataManager(db_file=db_file)
+
+    def insert(thread: int) -> int:
+        added = 0
+        for i, (player, match_url) in enumerate(_stress_records(writer, thread, inserts)):
+            for _ in range(2 if i % 5 == 0 else 1):
+                added += db.add_match_stats(player, f'Event_{writer}', match_url=match_url,
+                                            three_dart_average=50.0, legs_played=1, matches_played=1)
+        return added
+
+    with contextlib.redirect_stdout(io.StringIO()):  # duplicate notices
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return sum(pool.map(insert, range(threads)))
+
+
+def bench_stress(threads: int, inserts: int, readers: int, processes: int):
+    """Concurrent inserts into one JSON database, then verify every total
+
+    The benchmark process and `processes` extra processes each write from
+    `threads` threads while `readers` threads poll the stats snapshot, which
+    must always be internally consistent.
+    """
+    writers = 1 + processes
+    expected = Counter(player for writer in range(writers) for thread in range(threads)
+                       for player, _ in _stress_records(writer, thread, inserts))
+    total = sum(expected.values())
+    print(f"Stress: {writers} process(es) x {threads} threads x {inserts} inserts "
+          f"({total} records), {readers} reader threads")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'db.json')
+        AADSDataManager(db_file=db_file)  # create the file before the writers race
+
+        failures = []
+        stop = threading.Event()
+        reads = Counter()
+
+        def read_loop(reader_db: AADSDataManager):
+            while not stop.is_set():
+                stats = reader_db.get_stats_api_format()
+                row_total = sum(row['total_matches'] for row in stats['players'])
+                if row_total != stats['total_matches']:
+                    failures.append(f"inconsistent snapshot: players sum {row_total} != {stats['total_matches']}")
+                    return
+                reads['snapshots'] += 1
+
+        start = time.perf_counter()
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes) if processes else contextlib.nullcontext() as process_pool:
+            results = [process_pool.apply_async(_stress_writer, (db_file, writer, threads, inserts))
+                       for writer in range(1, writers)] if processes else []
+            reader_db = AADSDataManager(db_file=db_file)
+            reader_threads = [threading.Thread(target=read_loop, args=(reader_db,)) for _ in range(readers)]
+            for reader in reader_threads:
+                reader.start()
+            try:
+                added = _stress_writer(db_file, 0, threads, inserts)
+                added += sum(result.get() for result in results)
+            finally:
+                stop.set()
+                for reader in reader_threads:
+                    reader.join()
+        elapsed = time.perf_counter() - start
+
+        reloaded = AADSDataManager(db_file=db_file)
+        actual = Counter({name: player['total_matches'] for name, player in reloaded.data['players'].items()})
+        if added != total:
+            failures.append(f"add_match_stats accepted {added} records, expected {total}")
+        if reloaded.data['metadata']['total_matches'] != total:
+            failures.append(f"metadata total_matches {reloaded.data['metadata']['total_matches']}, expected {total}")
+        for player in sorted(set(expected) | set(actual)):
+            if actual[player] != expected[player]:
+                failures.append(f"{player}: {actual[player]} matches, expected {expected[player]}")
+        scraped = sum(len(players) for players in reloaded.data['scraped_matches'].values())
+        if scraped != total:
+            failures.append(f"{scraped} scraped (match, player) keys, expected {total}")
+
+    print(f"  {total / elapsed:9.1f} inserts/s  ({elapsed:.2f} s, {reads['snapshots']} consistent snapshot reads)")
+    if failures:
+        print("FAIL")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"PASS: {len(actual)} players, {total} matches, totals match after reload")
+
+
+def bench_matchlog(records: int, players: int):
+    """Per-match write cost (log append vs whole-file save), reopen with replay, and full rebuild"""
+    from database_manager import AGGREGATE_FIELDS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'db.json')
+        db = AADSDataManager(db_file=db_file, checkpoint_every=records * 2)
+        start = time.perf_counter()
+        chunk = 1000
+        for first in range(0, records, chunk):
+            db.add_match_stats_bulk(
+                {
+                    'player_name': f'Player {n % players:04d}',
+                    'event_id': f'Event_{n * 7 // records + 1}',
+                    'match_url': f'https://recap.dartconnect.com/matches/m{n:07d}',
+                    'stats_dict': {'three_dart_average': 40 + n % 40 + 0.37, 'legs_played': 5,
+                                   'match_won': n % 2, 'count_180s': n % 3, 'highest_finish': 40 + n % 100}
+                }
+                for n in range(first, min(first + chunk, records))
+            )
+        load_cost = time.perf_counter() - start
+        print(f"Match log: {records} records, {players} players "
+              f"({os.path.getsize(db._log.path) / 1024 / 1024:.1f} MB log; loaded in batches of {chunk} "
+              f"at {records / load_cost:.0f} records/s)")
+
+        single = iter(range(records, records + 200))
+        append_cost = _timeit(lambda: db.add_match_stats(
+            'Player 0000', 'Event_7', match_url=f'https://recap.dartconnect.com/matches/m{next(single):07d}',
+            three_dart_average=50.0), 200)
+        save_cost = _timeit(db._save_database, 5)
+        print(f"  {'add_match_stats: log append (now)':<44} {append_cost * 1000:9.2f} ms")
+        print(f"  {'whole-file save per write (before)':<44} {save_cost * 1000:9.2f} ms  "
+              f"({os.path.getsize(db_file) / 1024:.0f} KB checkpoint)")
+
+        db.add_match_stats('Player 0001', 'Event_7', match_url='https://recap.dartconnect.com/matches/tail',
+                           three_dart_average=50.0)
+        start = time.perf_counter()
+        reopened = AADSDataManager(db_file=db_file)
+        print(f"  {'open: checkpoint + replay of 1 record':<44} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+        start = time.perf_counter()
+        counts = reopened.rebuild()
+        rebuild_cost = time.perf_counter() - start
+        print(f"  {'rebuild from the log (one streaming pass)':<44} {rebuild_cost * 1000:9.2f} ms  "
+              f"({counts['records'] / rebuild_cost:.0f} records/s)")
+
+        mismatched = [name for name, player in db.data['players'].items()
+                      if any(reopened.data['players'][name][field] != player[field] for field in AGGREGATE_FIELDS
+                             if field != 'total_score')
+                      or abs(reopened.data['players'][name]['total_score'] - player['total_score']) > 1e-6]
+        print("  rebuilt totals match the incremental ones" if not mismatched
+              else f"  MISMATCH after rebuild: {mismatched[:5]}")
+
+
+def bench_columnar(records: int, players: int, repeat: int):
+    """Filtered leaderboards: merging per-(player, event, phase, group) partials vs Python loops over match history"""
+    import columnar_stats
+    from columnar_stats import ColumnarStats
+    from database_manager import leaderboard_from_history
+    from sqlite_manager import SQLiteDataManager
+
+    if not columnar_stats.NUMPY_AVAILABLE:
+        print("numpy not available. Install with: pip install numpy")
+        return
+
+    history = {}
+    for n in range(records):
+        index = n % 27  # position in a 27-match event: 7 knockout matches, then groups A and B
+        history.setdefault(f'Player {(n * 7919) % players:04d}', []).append({
+            'event_id': f'Event_{n * 7 // records + 1}',
+            'date': f'{n:09d}',
+            'match_url': None,
+            'stats': {
+                'three_dart_average': 35 + (n * 37) % 45 + 0.25, 'legs_played': 3 + n % 5, 'match_won': n % 2,
+                'count_180s': n % 3, 'count_140_plus': n % 4, 'count_100_plus': n % 7,
+                'highest_finish': (n * 13) % 171, 'double_attempts': 8, 'doubles_hit': 3,
+                'phase': 'round_robin' if index >= 7 else 'final',
+                **({'group': 'A' if index < 17 else 'B'} if index >= 7 else {})
+            }
+        })
+    stored = {name: {} for name in history}
+
+    start = time.perf_counter()
+    store = ColumnarStats.from_history(history)
+    build_cost = time.perf_counter() - start
+    print(f"Filtered leaderboards: {records} match records, {players} players -> {len(store)} partials "
+          f"(built in {build_cost * 1000:.0f} ms)")
+
+    tmp_dir = tempfile.mkdtemp(prefix='aads_columnar_')
+    sqlite_db = SQLiteDataManager(os.path.join(tmp_dir, 'bench.db'))
+    sqlite_db.add_match_stats_bulk({'player_name': name, 'event_id': entry['event_id'], 'stats_dict': entry['stats']}
+                                   for name, entries in history.items() for entry in entries)
+
+    queries = [
+        ('all matches', {}),
+        ('events 1-4', {'events': [f'Event_{i}' for i in range(1, 5)]}),
+        ('group A only', {'groups': ['A']}),
+        ('events 1-4, round robin, group B', {'events': [f'Event_{i}' for i in range(1, 5)],
+                                              'phases': ['round_robin'], 'groups': ['B']}),
+    ]
+    def summary(rows):
+        return [(r['name'], r['total_average'], r['highest_finish'], r['events_played']) for r in rows]
+
+    print(f"  {'query':<36} {'python loops':>14} {'numpy':>12} {'sqlite':>12}")
+    for label, filters in queries:
+        python_rows = leaderboard_from_history(history, stored, **filters)
+        numpy_rows = ranked_rows(store.player_totals(**filters), stored)
+        sqlite_rows = sqlite_db.query_leaderboard(**filters)
+        assert summary(python_rows) == summary(numpy_rows) == summary(sqlite_rows), label
+        python_cost = _timeit(lambda: leaderboard_from_history(history, stored, **filters), max(1, repeat // 10))
+        numpy_cost = _timeit(lambda: ranked_rows(store.player_totals(**filters), stored), repeat)
+        sqlite_cost = _timeit(lambda: sqlite_db.query_leaderboard(**filters), repeat)
+        print(f"  {label:<36} {python_cost * 1000:11.1f} ms {numpy_cost * 1000:9.2f} ms {sqlite_cost * 1000:9.2f} ms")
+
+    splits_cost = _timeit(lambda: store.splits('event', players=['Player 0001']), repeat)
+    sqlite_splits_cost = _timeit(lambda: sqlite_db.get_player_splits('Player 0001', 'event'), repeat)
+    print(f"  {'per-event splits for one player':<36} {'':>14} {splits_cost * 1000:9.2f} ms "
+          f"{sqlite_splits_cost * 1000:9.2f} ms")
+    sqlite_db.close()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _csv_status_update(csv_dir: str, match_url: str, status: str):
+    """The per-match update the event CSV used to get: find the latest CSV, read it, rewrite every row"""
+    latest = sorted(f for f in os.listdir(csv_dir) if f.startswith('matches_') and f.endswith('.csv'))[-1]
+    path = os.path.join(csv_dir, latest)
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = [{**row, 'status': status} if row['url'] == match_url else row for row in reader]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def bench_status(matches: int):
+    """Scraping a whole event: per-match CSV rewrites (before) vs status journal appends"""
+    from event_data_manager import EventDataManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = EventDataManager(os.path.join(tmp, 'event_data'))
+        event_matches = [{'url': f'https://recap.dartconnect.com/matches/m{n:05d}', 'title': f'Match {n}',
+                          'phase': 'round_robin', 'group_name': 'A'} for n in range(matches)]
+        manager.save_event_matches('ev_bench', event_matches)
+        csv_dir = os.path.dirname(manager.export_csv('ev_bench'))
+
+        start = time.perf_counter()
+        for match in event_matches:
+            _csv_status_update(csv_dir, match['url'], 'completed')
+        csv_cost = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for match in event_matches:
+            manager.update_match_status('ev_bench', match['url'], 'completed')
+        journal_cost = time.perf_counter() - start
+
+        summary = manager.get_event_summary('ev_bench')
+        assert summary['completed'] == matches and not manager.load_pending_matches('ev_bench')
+        summary_cost = _timeit(lambda: manager.get_event_summary('ev_bench'), 200)
+        pending_cost = _timeit(lambda: manager.load_pending_matches('ev_bench'), 200)
+        export_cost = _timeit(lambda: manager.write_csv('ev_bench', io.StringIO()), 20)
+
+        print(f"Match status updates for a {matches}-match event")
+        print(f"  {'CSV rewrite per match (before)':<40} {csv_cost * 1000:9.1f} ms total "
+              f"({csv_cost / matches * 1000:.2f} ms/match)")
+        print(f"  {'journal append per match (now)':<40} {journal_cost * 1000:9.1f} ms total "
+              f"({journal_cost / matches * 1000:.2f} ms/match, fsync'd)")
+        print(f"  {'get_event_summary (in-memory index)':<40} {summary_cost * 1000:9.3f} ms")
+        print(f"  {'load_pending_matches':<40} {pending_cost * 1000:9.3f} ms")
+        print(f"  {'CSV export on demand':<40} {export_cost * 1000:9.3f} ms")
+
+
+def _scan_events(base_dir: str):
+    """What list_events used to do: per event, read metadata.json and count statuses in its latest CSV"""
+    from event_data_manager import ARCHIVE_DIR
+
+    events = []
+    for event_id in os.listdir(base_dir):
+        event_dir = os.path.join(base_dir, event_id)
+        if event_id == ARCHIVE_DIR or not os.path.isdir(event_dir):
+            continue
+        metadata = serializer.load_file(os.path.join(event_dir, 'metadata.json'))
+        csv_dir = os.path.join(event_dir, 'csv')
+        latest = sorted(f for f in os.listdir(csv_dir) if f.startswith('matches_') and f.endswith('.csv'))[-1]
+        with open(os.path.join(csv_dir, latest), 'r', encoding='utf-8') as f:
+            counts = Counter(row['status'] for row in csv.DictReader(f))
+        events.append({'event_id': event_id, 'total_matches': metadata['match_count'],
+                       'completed': counts['completed'], 'pending': counts['pending']})
+    return events
+
+
+def bench_catalog(events: int, matches: int):
+    """list_events: scanning every event's files (before) vs the event catalog"""
+    from event_data_manager import EventDataManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = os.path.join(tmp, 'event_data')
+        manager = EventDataManager(base_dir)
+        for e in range(events):
+            event_id = f'ev_{e:03d}'
+            manager.save_event_matches(event_id, [{'url': f'https://recap.dartconnect.com/matches/e{e}m{n}',
+                                                   'title': f'Match {n}'} for n in range(matches)])
+            for n in range(0, matches, 3):
+                manager.update_match_status(event_id, f'https://recap.dartconnect.com/matches/e{e}m{n}', 'completed')
+            manager.export_csv(event_id)
+
+        listed = {e['event_id']: (e['completed'], e['pending']) for e in manager.list_events()}
+        assert listed == {e['event_id']: (e['completed'], e['pending']) for e in _scan_events(base_dir)}
+
+        scan_cost = _timeit(lambda: _scan_events(base_dir), 5)
+        warm_cost = _timeit(manager.list_events, 200)
+
+        def after_write():
+            manager.update_match_status('ev_000', 'https://recap.dartconnect.com/matches/e0m1', 'completed')
+            start = time.perf_counter()
+            manager.list_events()
+            return time.perf_counter() - start
+        write_cost = min(after_write() for _ in range(20))
+
+        start = time.perf_counter()
+        EventDataManager(base_dir).list_events()
+        cold_cost = time.perf_counter() - start
+
+        print(f"list_events over {events} events x {matches} matches")
+        print(f"  {'scan metadata + CSV per event (before)':<44} {scan_cost * 1000:9.2f} ms")
+        print(f"  {'catalog, nothing changed':<44} {warm_cost * 1000:9.3f} ms")
+        print(f"  {'catalog, after a status update':<44} {write_cost * 1000:9.3f} ms  (one stat pass)")
+        print(f"  {'new process, catalog.json on disk':<44} {cold_cost * 1000:9.2f} ms")
+
+
+def _dir_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def bench_archive(saves: int, retention: int):
+    """Raw payload storage: timestamped JSON files per save (before) vs the content-addressed archive"""
+    from event_data_manager import EventDataManager
+
+    def poll(n: int):
+        """An event listing after n matches finished, shaped like DartConnect's payload"""
+        completed = [{'mi': f'm{i}', 'hcf': f'Player {i % 16}', 'acf': f'Player {(i + 5) % 16}',
+                      'hs': 3, 'as': i % 3, 'hp5': 55.0 + i % 20, 'ap5': 50.0 + i % 17,
+                      'h180': i % 2, 'a180': 0, 'hhf': 40 + i % 60, 'ahf': 0} for i in range(n)]
+        matches = [{'url': f'https://recap.dartconnect.com/matches/m{i}', 'title': f'Match {i}',
+                    'match_number': i + 1, 'phase': 'round_robin', 'group_name': 'A'} for i in range(n)]
+        return {'payload': {'completed': completed, 'scheduled': []}}, matches
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Before: every save wrote api_response_<ts>.json and matches_<ts>.json (indented)
+        legacy_dir = os.path.join(tmp, 'legacy')
+        os.makedirs(legacy_dir)
+        start = time.perf_counter()
+        for event_id in ('mt_bench_1', 'Event_1'):
+            for n in range(1, saves + 1):
+                api, matches = poll(n)
+                serializer.dump_file(api, os.path.join(legacy_dir, f'{event_id}_api_response_{n:05d}.json'))
+                serializer.dump_file({'event_id': event_id, 'timestamp': n, 'match_count': n, 'matches': matches},
+                                     os.path.join(legacy_dir, f'{event_id}_matches_{n:05d}.json'))
+        legacy_cost = (time.perf_counter() - start) / (2 * saves)
+
+        # Now: the same saves through EventDataManager; the second event id re-saves identical payloads
+        manager = EventDataManager(os.path.join(tmp, 'event_data'), raw_retention=retention)
+        start = time.perf_counter()
+        for event_id in ('mt_bench_1', 'Event_1'):
+            for n in range(1, saves + 1):
+                api, matches = poll(n)
+                manager.save_event_matches(event_id, matches, raw_api_response=api)
+        archive_cost = (time.perf_counter() - start) / (2 * saves)
+        objects_before = len(list(manager.archive.digests()))
+
+        import event_data_manager
+        event_data_manager.ORPHAN_GRACE_SECONDS = 0   # nothing is in flight here
+        result = manager.compact_archive()
+
+        start = time.perf_counter()
+        with manager.open_raw('mt_bench_1', 'api_response') as stream:
+            while stream.read(64 * 1024):
+                pass
+        read_cost = time.perf_counter() - start
+
+        print(f"{saves} saves of a growing event listing under two event ids, retention {retention}")
+        print(f"  {'timestamped JSON files (before)':<36} {_dir_bytes(legacy_dir) / 1024:9.1f} KiB "
+              f"in {4 * saves} files, {legacy_cost * 1000:.2f} ms/save (payload files only)")
+        print(f"  {'archive after compaction (now)':<36} {result['archive_bytes'] / 1024:9.1f} KiB "
+              f"in {objects_before - result['deleted_objects']} objects, {archive_cost * 1000:.2f} ms/save "
+              f"(whole save_event_matches)")
+        print(f"  {'objects stored / payloads saved':<36} {objects_before} / {4 * saves}  "
+              f"(the second event id added no objects)")
+        print(f"  {'stream latest api_response':<36} {read_cost * 1000:9.3f} ms")
+
+
+def bench_rebuild(events: int, matches: int, players: int, workers: int):
+    """Rebuilding the store from saved API responses: one add_match_stats per player (before) vs rebuild_series"""
+    import random
+    from event_data_manager import EventDataManager
+    from series_rebuild import api_match_records, rebuild_series
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        event_data_dir = os.path.join(tmp, 'event_data')
+        manager = EventDataManager(event_data_dir)
+        for e in range(events):
+            completed = [{'mi': f's{e}m{i}', 'hcf': f'Player {rng.randrange(players)}',
+                          'acf': f'Player {rng.randrange(players)}', 'hs': 3, 'as': rng.randrange(3),
+                          'hp5': round(rng.uniform(30, 90), 2), 'ap5': round(rng.uniform(30, 90), 2),
+                          'h180': rng.randrange(3), 'a180': rng.randrange(2), 'hhf': rng.randrange(170),
+                          'ahf': rng.randrange(170)} for i in range(matches)]
+            manager.save_event_matches(f'mt_season_{e + 1}', [{'url': f'https://recap.dartconnect.com/matches/s{e}m{i}',
+                                                              'title': f'Match {i}'} for i in range(matches)],
+                                       raw_api_response={'payload': {'completed': completed}})
+        event_ids = [f'mt_season_{e + 1}' for e in range(events)]
+
+        # Before: each event's API data fed to add_match_stats one player at a time
+        sequential_db = AADSDataManager(os.path.join(tmp, 'sequential', 'aads_master_db.json'))
+        start = time.perf_counter()
+        for event_id in event_ids:
+            for record in api_match_records(event_id, manager.load_raw(event_id, 'api_response')):
+                sequential_db.add_match_stats(record['player'], event_id, record['stats'], record['match_url'])
+        sequential_db.flush()
+        sequential_cost = time.perf_counter() - start
+
+        costs = {}
+        for count in sorted({1, workers}):
+            db_file = os.path.join(tmp, f'rebuilt_{count}', 'aads_master_db.json')
+            start = time.perf_counter()
+            result = rebuild_series(event_data_dir, db_file, workers=count)
+            costs[count] = time.perf_counter() - start
+            with open(db_file, 'rb') as f:
+                checkpoint = f.read()
+            if count == 1:
+                reference = checkpoint
+            assert checkpoint == reference, "rebuild is not deterministic"
+
+        rebuilt = AADSDataManager(db_file)
+        assert rebuilt.get_leaderboard() == sequential_db.get_leaderboard(), "rebuilt totals differ"
+        for phases, groups in ((['final'], None), (['round_robin'], ['A']), (['round_robin'], ['B'])):
+            assert rebuilt.query_leaderboard(phases=phases, groups=groups) == \
+                sequential_db.query_leaderboard(phases=phases, groups=groups), f"rebuilt {phases} {groups} slice differs"
+
+        print(f"Rebuild {result['events']} events x {matches} matches ({result['records']} records, "
+              f"{result['players']} players)")
+        print(f"  {'add_match_stats per player (before)':<40} {sequential_cost:8.2f} s")
+        for count, cost in costs.items():
+            print(f"  {f'rebuild_series, {count} worker(s)':<40} {cost:8.2f} s")
+        print("  (identical checkpoint bytes for every worker count, same leaderboard and phase/group")
+        print("   slices as the sequential path)")
+
+
+def serve_live_event(matches: int, every: float):
+    """Local event matches API where one more match completes every `every` seconds
+
+    Answers POST /api/event/<id>/matches with the completed matches so far
+    (newest first) and an ETag, and 304 to a matching If-None-Match.
+    """
+    state = {'start': time.monotonic(), 'requests': 0, 'bodies': 0, 'bytes': 0}
+
+    def published() -> int:
+        return min(matches, int((time.monotonic() - state['start']) / every))
+
+    class LiveEventHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            n = published()
+            etag = f'"{n}"'
+            state['requests'] += 1
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            completed = [{'mi': f'live{i}', 'hcf': f'Player {i % 8}', 'acf': f'Player {(i + 3) % 8}', 'hs': 3,
+                          'as': i % 3, 'hp5': 50.0 + i} for i in reversed(range(n))]
+            body = json.dumps({'status': 'OK', 'payload': {'completed': completed, 'scheduled': []}}).encode()
+            state['bodies'] += 1
+            state['bytes'] += len(body)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LiveEventHandler)
+    server.state = state
+    server.published_at = lambda match_id: state['start'] + (int(match_id[len('live'):]) + 1) * every
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_tail(matches: int, every: float, rerun: float):
+    """Following a live event: re-running the full event scrape on a timer (before) vs EventTailer"""
+    import scraper as scraper_module
+    from database_manager import match_id_from_url
+    from event_data_manager import EventDataManager
+    from http_cache import HTTPCache
+    from live_tail import EventTailer
+    from scraper import DartConnectScraper, api_event_matches
+
+    def report(label, server, latencies, elapsed):
+        state = server.state
+        print(f"  {label:<30} latency mean {sum(latencies) / len(latencies):6.2f} s, max {max(latencies):6.2f} s; "
+              f"{state['requests']} requests, {state['bodies']} full bodies ({state['bytes'] / 1024:.1f} KiB) "
+              f"in {elapsed:.1f} s")
+
+    print(f"Live event: {matches} matches, one completing every {every * 1000:.0f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AADSDataManager(os.path.join(tmp, 'db.json'))
+
+        # Before: the whole scrape re-run every `rerun` seconds, downloading and saving the full list
+        server = serve_live_event(matches, every)
+        scraper_module.EVENT_MATCHES_API = f'http://127.0.0.1:{server.server_address[1]}/api/event/{{}}/matches'
+        scraper = DartConnectScraper(db, log_level=logging.WARNING, use_selenium=False)
+        manager = EventDataManager(os.path.join(tmp, 'before'))
+        latencies = {}
+        start = time.monotonic()
+        while len(latencies) < matches:
+            time.sleep(rerun)
+            api_data = scraper.fetch_event_matches_api('mt_live_1').json()
+            event_matches = api_event_matches('mt_live_1', api_data)
+            manager.save_event_matches('mt_live_1', event_matches, raw_api_response=api_data)
+            for match in event_matches:
+                match_id = match_id_from_url(match['url'])
+                latencies.setdefault(match_id, time.monotonic() - server.published_at(match_id))
+        report(f'full re-scrape every {rerun:.1f} s', server, list(latencies.values()), time.monotonic() - start)
+        server.shutdown()
+
+        # Now: conditional polls on an adaptive interval, only new matches handed on
+        server = serve_live_event(matches, every)
+        scraper_module.EVENT_MATCHES_API = f'http://127.0.0.1:{server.server_address[1]}/api/event/{{}}/matches'
+        scraper = DartConnectScraper(db, log_level=logging.WARNING, use_selenium=False,
+                                     http_cache=HTTPCache(os.path.join(tmp, 'http_cache')))
+        manager = EventDataManager(os.path.join(tmp, 'now'))
+        latencies = {}
+
+        def on_new_matches(new_matches):
+            for match in new_matches:
+                match_id = match_id_from_url(match['url'])
+                latencies[match_id] = time.monotonic() - server.published_at(match_id)
+            if len(latencies) == matches:
+                tailer.stop()
+
+        tailer = EventTailer(scraper, manager, 'mt_live_1', on_new_matches=on_new_matches,
+                             min_interval=every / 8, max_interval=every, backoff=1.5, idle_timeout=60)
+        start = time.monotonic()
+        tailer.run()
+        report('EventTailer (adaptive)', server, list(latencies.values()), time.monotonic() - start)
+
+        # A restarted tail reads the cursor and hands on nothing again
+        restarted = EventTailer(scraper, manager, 'mt_live_1')
+        print(f"  {'restarted tail, first poll':<30} {len(restarted.poll())} matches handed on again "
+              f"({len(restarted.cursor['seen'])} in the cursor)")
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event Scraper benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    dedup = sub.add_parser('dedup', help='Duplicate-match detection at scale')
+    dedup.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    pool = sub.add_parser('pool', help='WebDriver pool against a local static HTTP server')
+    pool.add_argument('--pages', type=int, default=60)
+    pool.add_argument('--size', type=int, default=4)
+
+    async_bench = sub.add_parser('async', help='Async recap + tab fetching against a local server with latency')
+    async_bench.add_argument('--matches', type=int, default=27)
+    async_bench.add_argument('--latency-ms', type=float, default=100)
+    async_bench.add_argument('--concurrency', type=int, default=16)
+
+    extract = sub.add_parser('extract', help='Inertia payload extraction on recorded recap pages')
+    extract.add_argument('--fixtures', default=RECAP_FIXTURES_DIR, help='directory of recorded recap .html pages')
+    extract.add_argument('--repeat', type=int, default=50)
+    extract.add_argument('--record', nargs='+', metavar='URL', help='save these recap pages into --fixtures first')
+
+    serialize = sub.add_parser('serialize', help='Master DB save and /api/stats encoding at series scale')
+    serialize.add_argument('--players', type=int, default=200)
+    serialize.add_argument('--events', type=int, default=7)
+    serialize.add_argument('--matches', type=int, default=60, help='matches per event')
+
+    load = sub.add_parser('load', help='API throughput (/api/stats and scrape endpoints) under concurrent clients')
+    load.add_argument('--requests', type=int, default=200, help='requests per endpoint')
+    load.add_argument('--concurrency', type=int, default=16, help='concurrent client connections')
+    load.add_argument('--threads', type=int, default=8, help='server threads (compared against 1)')
+    load.add_argument('--latency-ms', type=float, default=50, help='simulated recap fetch latency')
+    load.add_argument('--url', help='measure a running server instead of an in-process one')
+
+    stress = sub.add_parser('stress', help='Concurrent inserts from threads and processes into one JSON database')
+    stress.add_argument('--threads', type=int, default=8, help='writer threads per process')
+    stress.add_argument('--inserts', type=int, default=25, help='records per writer thread')
+    stress.add_argument('--readers', type=int, default=4, help='reader threads polling the stats snapshot')
+    stress.add_argument('--processes', type=int, default=2, help='extra writer processes on the same file')
+
+    matchlog = sub.add_parser('matchlog', help='Match log append vs whole-file save, replay and rebuild')
+    matchlog.add_argument('--records', type=int, default=50000)
+    matchlog.add_argument('--players', type=int, default=200)
+
+    columnar = sub.add_parser('columnar', help='Filtered leaderboards: merged partials (NumPy, SQLite) vs Python loops')
+    columnar.add_argument('--records', type=int, default=100000)
+    columnar.add_argument('--players', type=int, default=200)
+    columnar.add_argument('--repeat', type=int, default=20)
+
+    status = sub.add_parser('status', help='Per-match status updates: CSV rewrites vs the status journal')
+    status.add_argument('--matches', type=int, default=100)
+
+    catalog = sub.add_parser('catalog', help='list_events: per-event file scans vs the event catalog')
+    catalog.add_argument('--events', type=int, default=50)
+    catalog.add_argument('--matches', type=int, default=100)
+
+    archive = sub.add_parser('archive', help='Raw payload storage: timestamped files vs the content-addressed archive')
+    archive.add_argument('--saves', type=int, default=40)
+    archive.add_argument('--retention', type=int, default=10)
+
+    rebuild = sub.add_parser('rebuild', help='Store rebuild from saved API responses: per-player adds vs rebuild_series')
+    rebuild.add_argument('--events', type=int, default=35)
+    rebuild.add_argument('--matches', type=int, default=120, help='completed matches per event')
+    rebuild.add_argument('--players', type=int, default=200)
+    rebuild.add_argument('--workers', type=int, default=4)
+
+    tail = sub.add_parser('tail', help='Live event following: timed full re-scrapes vs the adaptive tail')
+    tail.add_argument('--matches', type=int, default=20)
+    tail.add_argument('--every-ms', type=float, default=400, help='one match completes this often')
+    tail.add_argument('--rerun-ms', type=float, default=5000, help='re-scrape period of the old path')
+
+    args = parser.parse_args()
+
+    if args.command == 'dedup':
+        bench_dedup(args.sizes)
+    elif args.command == 'pool':
+        bench_pool(args.pages, args.size)
+    elif args.command == 'async':
+        bench_async(args.matches, args.latency_ms / 1000.0, args.concurrency)
+    elif args.command == 'extract':
+        if args.record:
+            record_recap_pages(args.record, args.fixtures)
+        bench_extract(args.fixtures, args.repeat)
+    elif args.command == 'serialize':
+        bench_serialize(args.players, args.events, args.matches)
+    elif args.command == 'load':
+        bench_load(args.requests, args.concurrency, args.threads, args.latency_ms / 1000.0, args.url)
+    elif args.command == 'stress':
+        bench_stress(args.threads, args.inserts, args.readers, args.processes)
+    elif args.command == 'matchlog':
+        bench_matchlog(args.records, args.players)
+    elif args.command == 'columnar':
+        bench_columnar(args.records, args.players, args.repeat)
+    elif args.command == 'status':
+        bench_status(args.matches)
+    elif args.command == 'catalog':
+        bench_catalog(args.events, args.matches)
+    elif args.command == 'archive':
+        bench_archive(args.saves, args.retention)
+    elif args.command == 'rebuild':
+        bench_rebuild(args.events, args.matches, args.players, args.workers)
+    elif args.command == 'tail':
+        bench_tail(args.matches, args.every_ms / 1000.0, args.rerun_ms / 1000.0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for the Event Scraper API
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Worker processes and threads come from the server section of
+config/config.json; WEB_CONCURRENCY and SERVER_THREADS override them.
+"""
+
+import os
+import sys
+
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_here, 'src'))
+
+from config_loader import load_config
+from database_manager import storage_backend_for
+
+_server = load_config()['server']
+
+chdir = _here
+bind = f"{_server['host']}:{_server['port']}"
+workers = int(os.environ.get('WEB_CONCURRENCY', _server['workers']))
+threads = int(os.environ.get('SERVER_THREADS', _server['threads']))
+worker_class = 'gthread'
+
+# Scrape requests can run for minutes (browser renders, retries); SSE streams stay open
+timeout = 300
+graceful_timeout = 30
+accesslog = '-'
+
+
+def on_starting(server):
+    """Warn about several worker processes on the JSON store
+
+    The JSON store coordinates writers with a lock file and replays what other
+    processes appended to its match log, so every write from every worker is
+    serialized through one lock; SQLite scales better for heavy write loads.
+    """
+    db_file = os.environ.get('DB_FILE', 'data/aads_master_db.json')
+    if server.cfg.workers > 1 and storage_backend_for(db_file) == 'json':
+        server.log.warning(
+            f"{server.cfg.workers} worker processes share the JSON store {db_file}: writes are "
+            f"serialized through {db_file}.lock. For write-heavy loads set DB_FILE to a .db file "
+            f"(SQLite backend)."
+        )
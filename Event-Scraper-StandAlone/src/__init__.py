@@ -6,12 +6,17 @@ __version__ = "1.0.0"
 __author__ = "AADS Development Team"
 __description__ = "Standalone event scraper for DartConnect tournaments"
 
-from .database_manager import AADSDataManager
+from .database_manager import AADSDataManager, open_data_manager
+from .sqlite_manager import SQLiteDataManager
 from .scraper import DartConnectScraper
+from .async_scraper import AsyncDartConnectScraper
 from .event_data_manager import EventDataManager
 
 __all__ = [
     'AADSDataManager',
+    'SQLiteDataManager',
+    'open_data_manager',
     'DartConnectScraper',
+    'AsyncDartConnectScraper',
     'EventDataManager'
 ]
@@ -0,0 +1,183 @@
+"""
+Async DartConnect Scraper - Concurrent recap fetching over one keep-alive session
+Shares the parsing code of DartConnectScraper; the recap page and its counts
+and players tabs are requested concurrently for many matches at once, bounded
+by a semaphore so DartConnect never sees more than `concurrency` requests.
+HTTP cache reads and writes (disk I/O) run on the default executor, off the event loop
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Dict, List, Optional
+
+# aiohttp is optional; only the async engine needs it
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from database_manager import match_id_from_url
+from http_cache import CachedHTTPResponse, HTTPCache
+from recap_document import RecapDocument
+from scraper import BROWSER_HEADERS, INERTIA_JSON_HEADERS, RECAP_BASE_URL, DartConnectScraper
+
+
+class AsyncDartConnectScraper(DartConnectScraper):
+    def __init__(self, db_manager, log_level: int = logging.INFO, concurrency: int = 8,
+                 timeout_seconds: float = 30, enrich_from_api: bool = False, http_cache: HTTPCache = None,
+                 recap_cache_size: int = 256, recap_base_url: str = RECAP_BASE_URL):
+        """Initialize the async scraper (plain HTTP only, no browser)
+
+        Args:
+            db_manager: Stats store that scraped matches are written to
+            log_level: Logging level
+            concurrency: Maximum requests in flight (also the connection pool size)
+            timeout_seconds: Total timeout per request
+            enrich_from_api: Fetch the counts/players tabs alongside each recap (same
+                default as DartConnectScraper: the recap page already carries the stats)
+            http_cache: Optional on-disk response cache (shared with the sync scraper)
+            recap_cache_size: Number of parsed recaps kept in memory
+            recap_base_url: Base URL of the counts/players tab endpoints
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp not available. Install with: pip install aiohttp")
+
+        super().__init__(db_manager, log_level=log_level, use_selenium=False, recap_cache_size=recap_cache_size,
+                         enrich_from_api=enrich_from_api, http_cache=http_cache)
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.recap_base_url = recap_base_url.rstrip('/')
+
+    async def _in_executor(self, func, *args):
+        """Run a blocking call (HTTP cache disk I/O) without stalling the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    async def _request(self, session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore, method: str,
+                       url: str, headers: Dict[str, str] = None) -> CachedHTTPResponse:
+        """One request, through the HTTP cache when configured"""
+        conditional = {}
+        if self.http_cache is not None:
+            cached, conditional = await self._in_executor(self.http_cache.lookup, method, url)
+            if cached is not None:
+                return cached
+
+        try:
+            async with semaphore:
+                async with session.request(method, url, headers={**(headers or {}), **conditional}) as response:
+                    content = await response.read()
+                    try:
+                        encoding = response.get_encoding()
+                    except RuntimeError:
+                        encoding = 'utf-8'
+                    status, response_headers = response.status, response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            stale = None
+            if self.http_cache is not None:
+                stale = await self._in_executor(self.http_cache.stale, method, url)
+            if stale is None:
+                raise
+            self.logger.warning(f"Network error for {url}, serving stale cached copy")
+            return stale
+
+        if self.http_cache is not None:
+            revalidated = await self._in_executor(self.http_cache.record, method, url, status, content,
+                                                  response_headers, encoding)
+            if revalidated is not None:
+                return revalidated
+
+        result = CachedHTTPResponse(url, status, content, dict(response_headers), encoding)
+        result.from_cache = False
+        return result
+
+    async def _fetch_tab(self, session, semaphore, tab: str, match_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a recap tab payload (counts/players) as JSON, or None"""
+        url = f"{self.recap_base_url}/{tab}/{match_id}"
+        headers = {'User-Agent': self.session.headers['User-Agent'], **INERTIA_JSON_HEADERS}
+        try:
+            response = await self._request(session, semaphore, 'GET', url, headers=headers)
+            if response.status_code == 200:
+                return response.json()
+        except Exception as e:
+            self.logger.warning(f"Could not fetch {tab} data: {e}")
+        return None
+
+    async def _fetch_recap(self, session, semaphore, recap_url: str) -> Optional[RecapDocument]:
+        """Fetch and parse a recap page (cached by match id)"""
+        doc = self.recap_cache.get(match_id_from_url(recap_url))
+        if doc is not None:
+            return doc
+
+        response = await self._request(session, semaphore, 'GET', recap_url)
+        response.raise_for_status()
+        doc = RecapDocument(recap_url, page_source=response.text)
+        if doc.has_match_data:
+            self.recap_cache.put(doc)
+        elif self.http_cache is not None:
+            # Not a complete recap (yet): don't keep it as immutable
+            await self._in_executor(self.http_cache.invalidate, recap_url)
+        return doc
+
+    async def _scrape_match(self, session, semaphore, recap_url: str) -> List[Dict[str, Any]]:
+        """Recap plus tab payloads for one match, all requested at the same time"""
+        match_id = match_id_from_url(recap_url)
+        fetches = [self._fetch_recap(session, semaphore, recap_url)]
+        if self.enrich_from_api:
+            fetches.append(self._fetch_tab(session, semaphore, 'counts', match_id))
+            fetches.append(self._fetch_tab(session, semaphore, 'players', match_id))
+
+        doc, *tabs = await asyncio.gather(*fetches)
+        players_stats = doc.player_stats if doc is not None else []
+
+        if players_stats and tabs:
+            counts_data, players_data = tabs
+            if counts_data is not None:
+                self._merge_counts_data(players_stats, counts_data)
+            if players_data is not None:
+                self._merge_players_data(players_stats, players_data)
+
+        if players_stats:
+            self.processed_recaps.add(recap_url)
+        else:
+            self.logger.warning(f"No player stats found in {recap_url}")
+        return players_stats
+
+    async def scrape_recaps_async(self, recap_urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Scrape many recaps concurrently over one pooled keep-alive session
+
+        Args:
+            recap_urls: Match recap URLs
+
+        Returns:
+            {recap_url: [player stats, ...]} (an empty list for matches that failed)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=BROWSER_HEADERS) as session:
+            results = await asyncio.gather(
+                *(self._scrape_match(session, semaphore, url) for url in recap_urls),
+                return_exceptions=True
+            )
+        if self.http_cache is not None:
+            await self._in_executor(self.http_cache.flush)
+
+        scraped = {}
+        for url, result in zip(recap_urls, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"Error extracting stats from {url}: {result}")
+                result = []
+            scraped[url] = result
+
+        self.logger.info(f"Scraped {sum(1 for r in scraped.values() if r)}/{len(recap_urls)} recaps concurrently")
+        return scraped
+
+    async def extract_player_stats_from_recap_async(self, recap_url: str) -> List[Dict[str, Any]]:
+        """Async counterpart of extract_player_stats_from_recap for a single match"""
+        return (await self.scrape_recaps_async([recap_url]))[recap_url]
+
+    def scrape_recaps(self, recap_urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Blocking wrapper around scrape_recaps_async (for sync callers)"""
+        return asyncio.run(self.scrape_recaps_async(recap_urls))
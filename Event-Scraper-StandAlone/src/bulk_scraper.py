@@ -0,0 +1,166 @@
+"""
+Bulk Recap Scraper - Scrapes all pending matches of an event concurrently
+Workers fetch recaps in parallel (bounded, rate-limited, retried); results
+are written to the stats store and event files as each match finishes
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from throttling import call_with_retries
+
+KNOCKOUT_PHASES = ('quarterfinal', 'semifinal', 'final')
+
+
+def stats_entries_for_match(players_stats: List[Dict[str, Any]], event_id: str, match_url: str,
+                            phase: str = None, group: str = None) -> List[Dict[str, Any]]:
+    """Turn scraped recap stats into add_match_stats_bulk() entries
+
+    The match's phase and round-robin group, when known, are recorded with
+    the stats so leaderboards can be filtered by them.
+    """
+    match_keys = {key: value for key, value in (('phase', phase), ('group', group)) if value}
+    return [
+        {
+            'player_name': player_stats['player_name'],
+            'event_id': event_id,
+            'match_url': match_url,
+            'stats_dict': {
+                'three_dart_average': player_stats.get('three_dart_average', 0),
+                'legs_played': player_stats.get('legs_played', 1),
+                'matches_played': player_stats.get('matches_played', 1),
+                'match_won': player_stats.get('match_won', 0),
+                'count_180s': player_stats.get('count_180s', 0),
+                'count_140_plus': player_stats.get('count_140_plus', 0),
+                'count_100_plus': player_stats.get('count_100_plus', 0),
+                'highest_finish': player_stats.get('highest_finish', 0),
+                'double_attempts': player_stats.get('double_attempts', 0),
+                'doubles_hit': player_stats.get('doubles_hit', 0),
+                **match_keys
+            }
+        }
+        for player_stats in players_stats
+    ]
+
+
+class BulkRecapScraper:
+    def __init__(self, scraper, db_manager, event_manager, workers: int = 4, max_retries: int = 3,
+                 backoff_base: float = 0.5):
+        """Initialize the bulk pipeline
+
+        Args:
+            scraper: DartConnectScraper used for each recap (shares its rate limiter and browser pool)
+            db_manager: Stats store the results are written to
+            event_manager: EventDataManager holding the event's pending matches
+            workers: Number of matches scraped at the same time
+            max_retries: Retries per match on errors or empty results
+            backoff_base: First retry delay in seconds (doubles per retry)
+        """
+        self.scraper = scraper
+        self.db = db_manager
+        self.event_manager = event_manager
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.logger = logging.getLogger(__name__)
+        # One scraper (own HTTP session) per worker thread
+        self._local = threading.local()
+
+    def _worker_scraper(self):
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = self._local.scraper = self.scraper.spawn_worker()
+        return scraper
+
+    def _scrape_one(self, match: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Worker: fetch one recap with retries (no store writes here)"""
+        return call_with_retries(
+            lambda: self._worker_scraper().extract_player_stats_from_recap(match['url']),
+            max_retries=self.max_retries,
+            backoff_base=self.backoff_base,
+            is_success=bool,
+            logger=self.logger,
+            description=f"Recap {match['url']}"
+        )
+
+    def scrape_event(self, event_id: str, on_result: Callable[[Dict[str, Any]], None] = None,
+                     limit: Optional[int] = None, urls: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Scrape every pending match of an event and store the results
+
+        Args:
+            event_id: Event identifier (as saved by EventDataManager)
+            on_result: Optional callback invoked with each match result as it completes
+            limit: Optional cap on the number of pending matches processed
+            urls: Only these recap URLs (those still pending; e.g. the matches a live tail just found)
+
+        Returns:
+            Summary with per-match results and totals
+        """
+        pending = self.event_manager.load_pending_matches(event_id)
+        if urls is not None:
+            wanted = set(urls)
+            pending = [match for match in pending if match['url'] in wanted]
+        if limit is not None:
+            pending = pending[:limit]
+
+        self.logger.info(f"Bulk scraping {len(pending)} pending matches for {event_id} with {self.workers} workers")
+        start = time.monotonic()
+        results = []
+        players_added = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='recap') as executor:
+            futures = {executor.submit(self._scrape_one, match): match for match in pending}
+
+            # Results are written on this thread, in completion order
+            for future in as_completed(futures):
+                match = futures[future]
+                try:
+                    players_stats = future.result() or []
+                    error = None if players_stats else 'No player stats found in recap'
+                except Exception as e:
+                    players_stats = []
+                    error = str(e)
+
+                if players_stats:
+                    added = self.db.add_match_stats_bulk(stats_entries_for_match(
+                        players_stats, event_id, match['url'], match.get('phase'), match.get('group_name')))
+                    players_added += added
+                    self.event_manager.update_match_status(event_id, match['url'], 'completed', players_stats)
+                else:
+                    added = 0
+                    self.logger.warning(f"Failed to scrape {match['url']}: {error}")
+                    self.event_manager.update_match_status(event_id, match['url'], 'error')
+
+                result = {
+                    'url': match['url'],
+                    'title': match.get('title'),
+                    'success': bool(players_stats),
+                    'error': error,
+                    'players': players_stats,
+                    'players_added': added,
+                    # Set count comes from the same recap, no second fetch needed
+                    'sets_played': players_stats[0].get('sets_played', 0) if players_stats else 0
+                }
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        if self.scraper.http_cache is not None:
+            self.scraper.http_cache.flush()
+
+        completed = sum(1 for r in results if r['success'])
+        elapsed = time.monotonic() - start
+        self.logger.info(f"Bulk scrape of {event_id} done: {completed}/{len(results)} matches in {elapsed:.1f}s")
+
+        return {
+            'event_id': event_id,
+            'matches_total': len(pending),
+            'matches_completed': completed,
+            'matches_failed': len(results) - completed,
+            'players_added': players_added,
+            'elapsed_seconds': round(elapsed, 2),
+            'results': results
+        }
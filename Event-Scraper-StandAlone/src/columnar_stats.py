@@ -0,0 +1,271 @@
+"""
+Columnar Stats - Partial aggregates per (player, event, phase, group) as NumPy columns
+Each row holds the summed stats of one player's matches in one event phase
+or round-robin group, so a leaderboard over any slice (some events, one
+phase, one group) merges the matching partials with a few group-by
+reductions instead of looping over every recorded match
+"""
+
+from typing import Any, Dict, Iterable, List
+
+# NumPy is optional; callers fall back to summing match history in Python
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Stat column -> key in the recorded stats dict (score is 3DA x legs)
+SUM_COLUMNS = {
+    'total_legs': 'legs_played',
+    'total_score': None,
+    'total_matches': 'matches_played',
+    'matches_won': 'match_won',
+    'total_180s': 'count_180s',
+    'total_160_plus': 'count_160_plus',
+    'total_140_plus': 'count_140_plus',
+    'total_100_plus': 'count_100_plus',
+    'total_double_attempts': 'double_attempts',
+    'total_doubles_hit': 'doubles_hit',
+}
+STATS_DEFAULTS = {'legs_played': 1, 'matches_played': 1}
+_VALUE_ROW = {column: i for i, column in enumerate(SUM_COLUMNS)}
+_VALUE_ROW['highest_finish'] = len(SUM_COLUMNS)
+_VALUE_ROW['records'] = len(SUM_COLUMNS) + 1   # matches folded into the partial
+
+# Categorical columns (stored as int32 codes into a per-column value table)
+KEY_COLUMNS = ('player', 'event', 'phase', 'group')
+
+
+def split_sort_key(value) -> tuple:
+    """Sort key for split labels (None, i.e. unknown, sorts last)"""
+    return (value is None, str(value))
+
+
+def _stats_row(stats: Dict[str, Any]) -> List[float]:
+    """Numeric column values for one stats dict (same defaults as add_stats)"""
+    legs = stats.get('legs_played', 1)
+    row = []
+    for column, key in SUM_COLUMNS.items():
+        if key is None:
+            row.append(stats.get('three_dart_average', 0.0) * legs)
+        else:
+            row.append(stats.get(key, STATS_DEFAULTS.get(key, 0)))
+    row.append(stats.get('highest_finish', 0))
+    row.append(1)
+    return row
+
+
+class _Codes:
+    """Value <-> int code table for one categorical column (codes in first-seen order)"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._code: Dict[Any, int] = {}
+
+    def code(self, value) -> int:
+        code = self._code.get(value)
+        if code is None:
+            code = self._code[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, values: Iterable) -> List[int]:
+        """Codes of the values that are known (unknown values match nothing)"""
+        return [self._code[value] for value in values if value in self._code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ColumnarStats:
+    def __init__(self, capacity: int = 256):
+        """Empty partial-aggregate store (columns grow by doubling)
+
+        Args:
+            capacity: Initial number of partials allocated
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("ColumnarStats needs numpy (pip install numpy)")
+        self._size = 0
+        self._keys = np.zeros((len(KEY_COLUMNS), capacity), dtype=np.int32)
+        self._values = np.zeros((len(_VALUE_ROW), capacity), dtype=np.float64)
+        self._codes = {column: _Codes() for column in KEY_COLUMNS}
+        self._row_of: Dict[tuple, int] = {}              # (player, event, phase, group) -> row
+        self._player_rows: Dict[str, List[int]] = {}     # player -> rows, for corrections
+
+    @classmethod
+    def from_history(cls, history: Dict[str, List[Dict[str, Any]]]) -> 'ColumnarStats':
+        """Build from {player: [history entry, ...]} (get_match_history() output)
+
+        Players are taken in the order of the dict, which should be the order
+        they first appear in (it breaks ties in player_totals()).
+        """
+        store = cls()
+        rows, values = [], []
+        for player, entries in history.items():
+            for entry in entries:
+                rows.append(store._row(player, entry['event_id'], entry['stats']))
+                values.append(_stats_row(entry['stats']))
+        if rows:
+            store._fold(np.array(rows, dtype=np.intp), np.array(values, dtype=np.float64).T)
+        return store
+
+    def __len__(self) -> int:
+        """Number of partials"""
+        return self._size
+
+    def _grow(self):
+        capacity = self._keys.shape[1] * 2
+        keys = np.zeros((self._keys.shape[0], capacity), dtype=self._keys.dtype)
+        values = np.zeros((self._values.shape[0], capacity), dtype=self._values.dtype)
+        keys[:, :self._size] = self._keys[:, :self._size]
+        values[:, :self._size] = self._values[:, :self._size]
+        self._keys, self._values = keys, values
+
+    def _row(self, player: str, event_id: str, stats: Dict[str, Any]) -> int:
+        """Row of the partial a match belongs to (allocated empty on first use)"""
+        key = (player, event_id, stats.get('phase'), stats.get('group'))
+        row = self._row_of.get(key)
+        if row is None:
+            if self._size == self._keys.shape[1]:
+                self._grow()
+            row = self._row_of[key] = self._size
+            for i, value in enumerate(key):
+                self._keys[i, row] = self._codes[KEY_COLUMNS[i]].code(value)
+            self._player_rows.setdefault(player, []).append(row)
+            self._size += 1
+        return row
+
+    def _fold(self, rows, values):
+        """Add value columns (one per match) into their partials"""
+        highest = _VALUE_ROW['highest_finish']
+        for i in range(values.shape[0]):
+            if i == highest:
+                np.maximum.at(self._values[i], rows, values[i])
+            else:
+                np.add.at(self._values[i], rows, values[i])
+
+    def add(self, player: str, event_id: str, stats: Dict[str, Any]):
+        """Fold one player/match into its partial
+
+        Args:
+            player: Player name
+            event_id: Event identifier
+            stats: Recorded stats dict ('phase' and 'group' pick the partial)
+        """
+        row = self._row(player, event_id, stats)
+        values = _stats_row(stats)
+        highest = _VALUE_ROW['highest_finish']
+        for i, value in enumerate(values):
+            if i == highest:
+                self._values[i, row] = max(self._values[i, row], value)
+            else:
+                self._values[i, row] += value
+
+    def replace_player(self, player: str, entries: List[Dict[str, Any]]):
+        """Recompute one player's partials from their match history (after a correction)
+
+        Args:
+            player: Player name
+            entries: The player's history entries (event_id and stats), corrections applied
+        """
+        self._values[:, self._player_rows.get(player, [])] = 0
+        for entry in entries:
+            self.add(player, entry['event_id'], entry['stats'])
+
+    def _column(self, name: str):
+        if name in self._codes:
+            return self._keys[KEY_COLUMNS.index(name), :self._size]
+        return self._values[_VALUE_ROW[name], :self._size]
+
+    def mask(self, events: Iterable[str] = None, phases: Iterable[str] = None,
+             groups: Iterable[str] = None, players: Iterable[str] = None):
+        """Boolean mask over the partials for the given filters (None when nothing is filtered)"""
+        selected = None
+        for column, values in (('event', events), ('phase', phases), ('group', groups), ('player', players)):
+            if values is None:
+                continue
+            # Lookup table indexed by code: one gather instead of a set-membership test per row
+            wanted = np.zeros(len(self._codes[column]), dtype=bool)
+            wanted[self._codes[column].lookup(values)] = True
+            column_mask = wanted[self._column(column)]
+            selected = column_mask if selected is None else selected & column_mask
+        return selected
+
+    def _reduce(self, by: str, selected=None) -> Dict[str, Any]:
+        """Merge the selected partials per player/event/phase/group
+
+        Unselected partials are zero-weighted rather than copied out, so every
+        merge is a single pass of np.bincount / np.maximum.at.
+        """
+        codes = self._column(by)
+        size = len(self._codes[by])
+        weight = selected.astype(np.float64) if selected is not None else None
+
+        def total(values):
+            return np.bincount(codes, weights=values if weight is None else values * weight, minlength=size)
+
+        sums = {column: total(self._column(column)) for column in SUM_COLUMNS}
+        records = self._column('records') if weight is None else self._column('records') * weight
+        sums['records'] = np.bincount(codes, weights=records, minlength=size)
+
+        finishes = self._column('highest_finish')
+        if selected is not None:
+            finishes = np.where(selected, finishes, 0)
+        highest = np.zeros(size)
+        np.maximum.at(highest, codes, finishes)
+        sums['highest_finish'] = highest
+
+        # Distinct events per group: count the non-empty cells of a (group x event) table
+        n_events = max(len(self._codes['event']), 1)
+        cells = np.bincount(codes.astype(np.int64) * n_events + self._column('event'), weights=records,
+                            minlength=size * n_events)
+        sums['events_played'] = np.count_nonzero(cells.reshape(size, n_events), axis=1)
+        return sums
+
+    def player_totals(self, events: Iterable[str] = None, phases: Iterable[str] = None,
+                      groups: Iterable[str] = None) -> List[Dict[str, Any]]:
+        """Per-player totals over the filtered matches, in leaderboard order
+
+        Ranked by weighted 3-dart average, then events played, then first
+        appearance (the same order as the maintained leaderboard).
+
+        Returns:
+            Dicts with the aggregate player fields plus 'name' and 'events_played'
+        """
+        sums = self._reduce('player', self.mask(events, phases, groups))
+        legs = sums['total_legs']
+        average = np.round(np.divide(sums['total_score'], legs, out=np.zeros_like(legs), where=legs > 0), 2)
+        present = np.nonzero(sums['records'])[0]
+        order = present[np.lexsort((present, -sums['events_played'][present], -average[present]))]
+        return self._rows(sums, order, self._codes['player'].values, 'name')
+
+    def splits(self, by: str, players: Iterable[str] = None, events: Iterable[str] = None,
+               phases: Iterable[str] = None, groups: Iterable[str] = None) -> List[Dict[str, Any]]:
+        """Totals per event, phase or group (e.g. one player's per-event splits)
+
+        Args:
+            by: 'event', 'phase' or 'group'
+            players, events, phases, groups: Partial filters
+
+        Returns:
+            Dicts with the aggregate fields plus the key under its column name,
+            sorted by key (unknown phase/group last)
+        """
+        sums = self._reduce(by, self.mask(events, phases, groups, players))
+        labels = self._codes[by].values
+        present = sorted(np.nonzero(sums['records'])[0].tolist(), key=lambda code: split_sort_key(labels[code]))
+        return self._rows(sums, np.array(present, dtype=np.int64), labels, by)
+
+    @staticmethod
+    def _rows(sums: Dict[str, Any], order, labels: List[Any], label_key: str) -> List[Dict[str, Any]]:
+        columns = {column: values[order].tolist() for column, values in sums.items() if column != 'records'}
+        rows = []
+        for i, code in enumerate(order.tolist()):
+            row = {label_key: labels[code]}
+            for column, values in columns.items():
+                row[column] = values[i] if column == 'total_score' else int(values[i])
+            rows.append(row)
+        return rows
@@ -0,0 +1,86 @@
+"""
+Config Loader - Reads config/config.json over built-in defaults
+"""
+
+import copy
+import json
+import logging
+import os
+from typing import Any, Dict
+
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'config.json')
+
+DEFAULT_CONFIG = {
+    'server': {
+        'host': '0.0.0.0',
+        'port': 5000,
+        'debug': True,
+        'cors_enabled': True,
+        'workers': 1,
+        'threads': 8
+    },
+    'scraper': {
+        'use_selenium': True,
+        'delay_between_requests_ms': 200,
+        'max_retries': 3,
+        'timeout_seconds': 30,
+        'bulk_workers': 4,
+        'max_bulk_workers': 8,
+        'driver_pool_size': 2,
+        'max_pages_per_driver': 50,
+        'page_ready_timeout_seconds': 15,
+        'network_idle_ms': 500
+    },
+    'http_cache': {
+        'enabled': True,
+        'dir': 'data/http_cache',
+        'max_size_mb': 200,
+        'offline': False
+    },
+    'jobs': {
+        'dir': 'data/jobs',
+        'workers': 2,
+        'keep_finished': 200
+    },
+    'live_tail': {
+        'min_interval_seconds': 5,
+        'max_interval_seconds': 30,
+        'backoff': 1.5,
+        'idle_timeout_minutes': 120
+    },
+    'data': {
+        'base_dir': 'data',
+        'event_data_dir': 'data/event_data',
+        'raw_retention': 10,
+        'backup_enabled': True,
+        'backup_interval_hours': 24
+    }
+}
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def load_config(config_file: str = DEFAULT_CONFIG_FILE) -> Dict[str, Any]:
+    """Load the JSON config file, filling in defaults for missing keys
+
+    Args:
+        config_file: Path to config.json
+
+    Returns:
+        Merged configuration dictionary
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                _merge(config, json.load(f))
+        except (json.JSONDecodeError, OSError) as e:
+            logging.getLogger(__name__).warning(f"Could not read {config_file}, using defaults: {e}")
+    return config
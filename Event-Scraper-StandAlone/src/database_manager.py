@@ -3,72 +3,371 @@ AADS Database Manager - Handles all data operations for player stats
 Maintains player statistics across 7-event AADS series
 """
 
+import atexit
 import json
 import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from typing import Dict, List, Any, Optional, Iterable
+
+from columnar_stats import NUMPY_AVAILABLE, ColumnarStats, split_sort_key
+from file_lock import FileLock
+from leaderboard import LeaderboardIndex
+from match_log import MatchLog, OP_ADD, OP_CORRECT, OP_SCRAPED, match_log_path
+from rwlock import RWLock
+from serializer import dumps, load_file
 
 class AADSDataManager:
-    def __init__(self, db_file: str = "data/aads_master_db.json"):
-        """Initialize the database manager with the JSON file path"""
+    def __init__(self, db_file: str = "data/aads_master_db.json", write_behind: bool = False,
+                 flush_interval: float = 2.0, checkpoint_every: int = 500):
+        """Initialize the database manager with the JSON file path
+        
+        Storage: every recorded match is appended to the match log next to
+        the database (aads_master_db.matches.jsonl, see match_log.py), which
+        is the source of truth. The JSON file is a checkpoint of the player
+        totals, events and dedup keys derived from the log, tagged with the
+        log offset it covers; opening it replays only the records after that
+        offset, and rebuild() re-derives everything from the log.
+        
+        Concurrency: reads share an in-process RW lock and writes take it
+        exclusively. Writes also hold a lock file (db_file + '.lock') across
+        processes and first replay what other processes appended, so several
+        server processes can share one store.
+        
+        Args:
+            db_file: Path to the master JSON database (the checkpoint)
+            write_behind: If True, a background timer writes the checkpoint
+                shortly after changes instead of every checkpoint_every records
+            flush_interval: Seconds to wait before a write-behind checkpoint
+            checkpoint_every: Rewrite the checkpoint after this many new log
+                records (appends are durable on their own; the checkpoint only
+                shortens the replay on the next open)
+        """
         self.db_file = db_file
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_file) if os.path.dirname(self.db_file) else ".", exist_ok=True)
-        self.data = self._load_database()
+        self._rw = RWLock()
+        self._file_lock = FileLock(self.db_file + '.lock')
+        self._log = MatchLog(match_log_path(self.db_file))
+        self._leaderboard = LeaderboardIndex()
+        self._columns = None  # ColumnarStats partials for filtered queries, built on first use
+        self._snapshot = None
+        
+        # Persistence state (batches, checkpoints and write-behind)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        self._batch_depth = 0
+        self._pending = []   # records of the open batch, appended when it commits
+        self._unsaved = 0    # applied records the checkpoint does not cover yet
+        self._flush_timer = None
+        
+        with self._file_lock:
+            self._open()
+        
+        if self.write_behind:
+            atexit.register(self.flush)
         
     def _load_database(self) -> Dict[str, Any]:
-        """Load database from JSON file or create new if not exists"""
+        """Load the checkpoint from the JSON file or create new if not exists"""
         if os.path.exists(self.db_file):
             try:
-                with open(self.db_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Ensure all required keys exist
-                    if 'players' not in data:
-                        data['players'] = {}
-                    if 'events' not in data:
-                        data['events'] = {}
-                    if 'metadata' not in data:
-                        data['metadata'] = {
-                            'last_updated': datetime.now().isoformat(),
-                            'total_matches': 0,
-                            'version': '1.0.0'
-                        }
-                    return data
+                data = load_file(self.db_file)
+                # Ensure all required keys exist
+                if 'players' not in data:
+                    data['players'] = {}
+                if 'events' not in data:
+                    data['events'] = {}
+                if 'metadata' not in data:
+                    data['metadata'] = {
+                        'last_updated': datetime.now().isoformat(),
+                        'total_matches': 0,
+                        'version': '1.0.0'
+                    }
+                data['scraped_matches'] = migrate_scraped_matches(data.get('scraped_matches'))
+                # events_played is a set in memory (the serializer writes it as a list)
+                for player_data in data['players'].values():
+                    player_data['events_played'] = set(player_data.get('events_played', []))
+                return data
             except (json.JSONDecodeError, FileNotFoundError):
                 print(f"Warning: Could not load {self.db_file}, creating new database")
                 
-        # Create new database structure
-        return {
-            'players': {},
-            'events': {},
-            'metadata': {
-                'last_updated': datetime.now().isoformat(),
-                'total_matches': 0,
-                'version': '1.0.0',
-                'series_info': {
-                    'qualifying_events': 6,
-                    'championship_event': 1,
-                    'current_event': 1
-                }
-            }
-        }
+        return new_database()
+    
+    def _open(self):
+        """Load the checkpoint and replay the log records after it (caller holds the file lock)"""
+        self.data = self._load_database()
+        metadata = self.data['metadata']
+        self._log_offset = metadata.get('log_offset', 0)
+        self._unsaved = 0
+        if 'log_offset' not in metadata:
+            self._migrate_to_log()
+        elif self._log_offset > self._log.size():
+            print(f"Warning: {self._log.path} is shorter than the checkpoint in {self.db_file}; "
+                  f"matches missing from the log would be lost by rebuild()")
+            self._log_offset = self._log.size()
+        
+        self._rebuild_indexes()
+        self._catch_up()
+    
+    def _migrate_to_log(self):
+        """Move the event_history of a database written before the match log into a new log"""
+        if self._log.size():
+            # The log was written but the checkpoint was not: derive everything from the log
+            data, self._log_offset = project_log(self._log)
+            carry_over_manual_fields(self.data, data)
+            self.data = data
+            self._save_database()
+            return
+        
+        records = []
+        covered = set()
+        for name, player in self.data['players'].items():
+            for entry in player.pop('event_history', []):
+                match_url = entry.get('match_url')
+                match_id = match_id_from_url(match_url) if match_url else None
+                records.append({
+                    'op': OP_ADD, 'player': name, 'event_id': entry.get('event_id'),
+                    'match_id': match_id, 'match_url': match_url,
+                    'date': entry.get('date', ''), 'stats': entry.get('stats', {})
+                })
+                if match_id:
+                    covered.add((match_id, name))
+        records.sort(key=lambda record: record['date'])
+        
+        # Dedup keys without a history record (e.g. legacy whole-match markers)
+        last_updated = self.data['metadata'].get('last_updated', '')
+        for match_id, names in self.data['scraped_matches'].items():
+            for name in names:
+                if (match_id, name) not in covered:
+                    records.append({'op': OP_SCRAPED, 'player': name, 'match_id': match_id, 'date': last_updated})
+        
+        # Totals are kept as they are; the log now holds the history behind them
+        self._log_offset = self._log.create(records)
+        self._save_database()
+        print(f"Moved {len(records)} match records from {self.db_file} to {self._log.path}")
     
     def _save_database(self) -> bool:
-        """Save current data to JSON file"""
+        """Save the checkpoint to the JSON file
+        
+        The file is written to a temp file in the same directory and then
+        renamed over the original, so readers never see a half-written file.
+        """
+        with self._rw.write():
+            owns_file_lock = not self._file_lock.locked
+            try:
+                if owns_file_lock:
+                    self._file_lock.acquire()
+                
+                self.data['metadata']['log_offset'] = self._log_offset
+                db_dir = os.path.dirname(os.path.abspath(self.db_file))
+                fd, tmp_path = tempfile.mkstemp(dir=db_dir, prefix='.aads_db_', suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(dumps(self.data))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.db_file)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                
+                self._unsaved = 0
+                return True
+            except Exception as e:
+                print(f"Error saving database: {e}")
+                return False
+            finally:
+                if owns_file_lock:
+                    self._file_lock.release()
+    
+    def _catch_up(self):
+        """Apply log records appended by other processes (caller holds the write lock)"""
+        if self._log.size() == self._log_offset:
+            return
+        
+        corrected = set()
+        for record, end_offset in self._log.read(self._log_offset):
+            if record['op'] == OP_CORRECT:
+                corrected.add(record['player'])
+                self._touch(record['date'])
+                self._unsaved += 1
+            else:
+                self._apply(record)
+            self._log_offset = end_offset
+        
+        for player_name in corrected:
+            self._reproject_player(player_name)
+    
+    @contextmanager
+    def _read_access(self):
+        """Shared access to self.data, current with what other processes appended"""
+        # Catch up only at the outermost access (a held read lock cannot be upgraded)
+        if (not self._rw.write_held and not self._rw.read_held
+                and self._log.size() != self._log_offset):
+            with self._rw.write():
+                self._catch_up()
+        with self._rw.read():
+            yield
+    
+    def _rebuild_indexes(self):
+        """Rebuild the in-memory indexes derived from self.data"""
+        self._scraped_index = build_scraped_index(self.data['scraped_matches'])
+        self._leaderboard.rebuild([
+            player_summary(name, player, len(player['events_played']))
+            for name, player in self.data['players'].items()
+        ])
+        self._columns = None
+        self._snapshot = None
+    
+    def _touch(self, date: str = None):
+        """Record that the data changed (bumps the version used by cached snapshots)"""
+        metadata = self.data['metadata']
+        metadata['data_version'] = metadata.get('data_version', 0) + 1
+        metadata['last_updated'] = date or datetime.now().isoformat()
+    
+    @property
+    def data_version(self) -> int:
+        """Counter bumped on every mutation; cheap change detection for caches"""
+        with self._read_access():
+            return self.data['metadata'].get('data_version', 0)
+    
+    def _apply(self, record: Dict[str, Any]):
+        """Fold one add/scraped log record into memory (caller holds the write lock)"""
+        apply_match_record(self.data, record)
+        if record.get('match_id'):
+            self._scraped_index.add((record['match_id'], record['player']))
+        player = self.data['players'].get(record['player'])
+        if record['op'] == OP_ADD and player is not None:
+            # Re-key only this player in the maintained leaderboard
+            self._leaderboard.update(player_summary(record['player'], player, len(player['events_played'])))
+            if self._columns is not None:
+                self._columns.add(record['player'], record['event_id'], record['stats'])
+        self._touch(record.get('date'))
+        self._unsaved += 1
+    
+    def _reproject_player(self, player_name: str):
+        """Recompute one player's totals and partials from the log and the open batch (after a correction)"""
+        entries = match_history(chain(self._iter_log(), self._pending), {player_name}).get(player_name, [])
+        totals = new_player(player_name)
+        for entry in entries:
+            add_stats(totals, entry['stats'])
+        player = self.data['players'][player_name]
+        for field in AGGREGATE_FIELDS:
+            player[field] = totals[field]
+        self._leaderboard.update(player_summary(player_name, player, len(player['events_played'])))
+        if self._columns is not None:
+            self._columns.replace_player(player_name, entries)
+    
+    def _commit(self) -> bool:
+        """Append the open batch's records to the log (caller holds both locks)"""
         try:
-            self.data['metadata']['last_updated'] = datetime.now().isoformat()
-            
-            # Convert sets to lists for JSON serialization
-            for player_name, player_data in self.data['players'].items():
-                if isinstance(player_data.get('events_played'), set):
-                    player_data['events_played'] = list(player_data['events_played'])
-            
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
-            return True
+            if not self._log.repair_tail(self._log_offset):
+                raise IOError(f"{self._log.path} has unreadable records after offset {self._log_offset}")
+            self._log_offset = self._log.append(self._pending)
         except Exception as e:
-            print(f"Error saving database: {e}")
+            # Keep the records in memory; the next batch or flush() retries the append
+            print(f"Error appending to match log: {e}")
             return False
+        self._pending = []
+        
+        if self._unsaved >= self.checkpoint_every:
+            self._save_database()
+        elif self.write_behind and self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return True
+    
+    def flush(self) -> bool:
+        """Append any uncommitted records and write the checkpoint
+        
+        Returns:
+            True if the log and the checkpoint are both up to date on disk
+        """
+        with self._rw.write():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._batch_depth:
+                return False  # the open batch commits when it exits
+            with self._file_lock:
+                if self._pending and not self._commit():
+                    return False
+                if not self._unsaved:
+                    return True
+                return self._save_database()
+    
+    def close(self):
+        """Flush pending changes and stop the write-behind timer"""
+        self.flush()
+    
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single transactional write
+        
+        All add_match_stats() calls made inside the block are appended to
+        the match log as one unit when the outermost batch exits. If the
+        block raises, the in-memory changes are rolled back.
+        The batch holds the write lock (and the cross-process file lock)
+        throughout, so other writers wait and readers never see it half done.
+        
+        Example:
+            with db.batch():
+                for player in players:
+                    db.add_match_stats(...)
+        """
+        with self._rw.write():
+            outermost = self._batch_depth == 0
+            if outermost:
+                self._file_lock.acquire()
+            try:
+                if outermost:
+                    if self._pending:
+                        # Retry an append that failed earlier
+                        self._commit()
+                    # Apply on top of what other processes appended
+                    self._catch_up()
+                self._batch_depth += 1
+                
+                try:
+                    yield self
+                except BaseException:
+                    self._batch_depth -= 1
+                    if self._batch_depth == 0:
+                        self._pending = []
+                        self._open()
+                    raise
+                else:
+                    self._batch_depth -= 1
+                    if self._batch_depth == 0 and self._pending:
+                        self._commit()
+            finally:
+                if outermost:
+                    self._file_lock.release()
+    
+    def add_match_stats_bulk(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Add stats for many player/match records with a single log append
+        
+        Args:
+            entries: Iterable of dicts with the add_match_stats() arguments
+                (player_name, event_id, stats_dict, match_url)
+            
+        Returns:
+            Number of records that were added (duplicates are skipped)
+        """
+        added = 0
+        with self.batch():
+            for entry in entries:
+                if self.add_match_stats(**entry):
+                    added += 1
+        return added
     
     def add_match_stats(self, player_name: str, event_id: str, stats_dict: Dict[str, Any] = None, match_url: str = None, **kwargs) -> bool:
         """Add or update player stats for a specific match
@@ -83,6 +382,11 @@ class AADSDataManager:
         Returns:
             True if stats were added, False if duplicate or error
         """
+        with self.batch():
+            return self._add_match_stats(player_name, event_id, stats_dict, match_url, **kwargs)
+    
+    def _add_match_stats(self, player_name: str, event_id: str, stats_dict: Dict[str, Any] = None, match_url: str = None, **kwargs) -> bool:
+        """Record one player/match in memory and in the open batch (caller holds the lock)"""
         try:
             # Merge stats_dict and kwargs
             if stats_dict is None:
@@ -90,107 +394,120 @@ class AADSDataManager:
             else:
                 stats_dict = {**stats_dict, **kwargs}
             
-            # Check for duplicate match if URL provided
+            # Normalize player name
+            player_name = player_name.strip()
+            
+            # Check for duplicate (match, player) if URL provided
+            match_id = None
             if match_url:
-                if 'scraped_matches' not in self.data:
-                    self.data['scraped_matches'] = []
+                match_id = match_id_from_url(match_url)
                 
-                # Check if this match was already scraped
-                if match_url in self.data['scraped_matches']:
+                # Check if this player's stats for this match were already recorded
+                if self._is_scraped(match_id, player_name):
                     print(f"Match {match_url} already scraped for {player_name}. Skipping to prevent double-counting.")
                     return False
-                
-                # Mark this match as scraped
-                self.data['scraped_matches'].append(match_url)
-            
-            # Normalize player name
-            player_name = player_name.strip()
-            
-            # Initialize player if doesn't exist
-            if player_name not in self.data['players']:
-                self.data['players'][player_name] = {
-                    'name': player_name,
-                    'total_legs': 0,
-                    'total_score': 0.0,  # Sum of all individual leg averages
-                    'total_matches': 0,
-                    'matches_won': 0,
-                    'total_180s': 0,
-                    'total_160_plus': 0,
-                    'total_140_plus': 0,
-                    'total_100_plus': 0,
-                    'highest_finish': 0,
-                    'total_double_attempts': 0,
-                    'total_doubles_hit': 0,
-                    'events_played': set(),  # Use set to avoid duplicates
-                    'event_history': [],
-                    'qualified_for_toc': False,
-                    'event_wins': []
-                }
-            
-            player = self.data['players'][player_name]
-            
-            # Add event to events played (will be converted to list when saving)
-            if isinstance(player['events_played'], list):
-                player['events_played'] = set(player['events_played'])
-            player['events_played'].add(event_id)
             
-            # Update stats
-            legs_played = stats_dict.get('legs_played', 1)
-            three_dart_avg = stats_dict.get('three_dart_average', 0.0)
-            
-            # Accumulate stats for weighted average calculation
-            player['total_legs'] += legs_played
-            player['total_score'] += (three_dart_avg * legs_played)  # Weighted by legs
-            
-            # Match stats
-            player['total_matches'] += stats_dict.get('matches_played', 1)
-            player['matches_won'] += stats_dict.get('match_won', 0)
-            
-            # Score counts
-            player['total_180s'] += stats_dict.get('count_180s', 0)
-            player['total_160_plus'] += stats_dict.get('count_160_plus', 0)
-            player['total_140_plus'] += stats_dict.get('count_140_plus', 0)
-            player['total_100_plus'] += stats_dict.get('count_100_plus', 0)
-            
-            # Checkout stats
-            player['total_double_attempts'] += stats_dict.get('double_attempts', 0)
-            player['total_doubles_hit'] += stats_dict.get('doubles_hit', 0)
-            
-            # Update highest finish
-            high_finish = stats_dict.get('highest_finish', 0)
-            if high_finish > player['highest_finish']:
-                player['highest_finish'] = high_finish
-            
-            # Add to event history
-            event_record = {
+            record = {
+                'op': OP_ADD,
+                'player': player_name,
                 'event_id': event_id,
+                'match_id': match_id,
+                'match_url': match_url,
                 'date': datetime.now().isoformat(),
-                'stats': stats_dict.copy()
+                'stats': stats_dict
             }
-            player['event_history'].append(event_record)
-            
-            # Update event info
-            if event_id not in self.data['events']:
-                self.data['events'][event_id] = {
-                    'event_id': event_id,
-                    'date': datetime.now().isoformat(),
-                    'players': [],
-                    'winner': None,
-                    'is_qualifier': True  # Assume qualifier unless set otherwise
-                }
-            
-            if player_name not in self.data['events'][event_id]['players']:
-                self.data['events'][event_id]['players'].append(player_name)
-            
-            # Update metadata
-            self.data['metadata']['total_matches'] += 1
-            
-            return self._save_database()
+            self._apply(record)
+            self._pending.append(record)
+            return True
             
         except Exception as e:
             print(f"Error adding match stats for {player_name}: {e}")
             return False
     
+    def correct_match_stats(self, player_name: str, match_url: str, stats_dict: Dict[str, Any] = None, **kwargs) -> bool:
+        """Replace the recorded stats of one player in one match (e.g. after a re-scrape)
+        
+        A correction record is appended to the log and only this player's
+        totals are recomputed from their records.
+        
+        Args:
+            player_name: Player's name
+            match_url: URL of the match the stats were recorded for
+            stats_dict: The corrected statistics (replace the recorded ones entirely)
+            **kwargs: Individual stat fields (alternative to stats_dict)
+            
+        Returns:
+            True if the correction was recorded, False if there is nothing to correct
+        """
+        if stats_dict is None:
+            stats_dict = kwargs
+        else:
+            stats_dict = {**stats_dict, **kwargs}
+        player_name = player_name.strip()
+        match_id = match_id_from_url(match_url)
+        
+        with self.batch():
+            if (match_id, player_name) not in self._scraped_index or player_name not in self.data['players']:
+                print(f"No stats recorded for {player_name} in {match_url}; nothing to correct")
+                return False
+            
+            self._pending.append({
+                'op': OP_CORRECT,
+                'player': player_name,
+                'match_id': match_id,
+                'match_url': match_url,
+                'date': datetime.now().isoformat(),
+                'stats': stats_dict
+            })
+            self._reproject_player(player_name)
+            self._touch()
+            self._unsaved += 1
+            return True
+    
+    def rebuild(self) -> Dict[str, int]:
+        """Re-derive all player totals, events and dedup keys from the match log
+        
+        One streaming pass over the log (plus one over the records of
+        corrected players, if any). Fields that do not come from matches
+        (event winners, qualifier flags, TOC qualification, series info)
+        are carried over, and the result is saved as the new checkpoint.
+        
+        Returns:
+            Counts of replayed records, players and events
+        """
+        with self.batch():
+            data, self._log_offset = project_log(self._log)
+            records = data['metadata']['data_version']
+            carry_over_manual_fields(self.data, data)
+            self.data = data
+            self._rebuild_indexes()
+            self._save_database()
+        return {'records': records, 'players': len(data['players']), 'events': len(data['events'])}
+    
+    def _iter_log(self) -> Iterable[Dict[str, Any]]:
+        """Log records covered by the in-memory data (caller holds a lock)"""
+        return (record for record, _ in self._log.read(0, self._log_offset))
+    
+    def get_player_history(self, player_name: str) -> List[Dict[str, Any]]:
+        """Get a player's recorded matches (event_id, date, match_url, stats) from the log"""
+        player_name = player_name.strip()
+        with self._read_access():
+            return match_history(self._iter_log(), {player_name}).get(player_name, [])
+    
+    def get_match_history(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get every player's recorded matches from the log, keyed by player"""
+        with self._read_access():
+            return match_history(self._iter_log())
+    
+    def _is_scraped(self, match_id: str, player_name: str) -> bool:
+        """O(1) check against the hashed (match_id, player) index"""
+        return (match_id, player_name) in self._scraped_index or (match_id, LEGACY_WHOLE_MATCH) in self._scraped_index
+    
+    def is_match_scraped(self, match_url: str, player_name: str) -> bool:
+        """Check whether stats for this player in this match were already recorded"""
+        with self._read_access():
+            return self._is_scraped(match_id_from_url(match_url), player_name.strip())
+    
     def get_all_stats(self) -> Dict[str, Any]:
         """Get all player statistics"""
         return self.get_stats_api_format()
@@ -201,93 +518,120 @@ class AADSDataManager:
     
     def get_leaderboard(self) -> List[Dict[str, Any]]:
         """Get current leaderboard with calculated averages and rankings"""
-        players_list = []
+        with self._read_access():
+            return self._leaderboard.top()
+    
+    def get_top_players(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Get the top-N leaderboard rows"""
+        with self._read_access():
+            return self._leaderboard.top(n)
+    
+    def get_player_rank(self, player_name: str) -> Optional[int]:
+        """Get a player's current leaderboard rank (None if unknown)"""
+        with self._read_access():
+            return self._leaderboard.rank(player_name.strip())
+    
+    def query_leaderboard(self, events: Iterable[str] = None, phases: Iterable[str] = None,
+                          groups: Iterable[str] = None, scraped_since: str = None) -> List[Dict[str, Any]]:
+        """Leaderboard over a slice of the recorded matches
         
-        for player_name, player_data in self.data['players'].items():
-            # Convert set to list for JSON serialization
-            if isinstance(player_data['events_played'], set):
-                events_played = list(player_data['events_played'])
-                player_data['events_played'] = events_played
-            else:
-                events_played = player_data['events_played']
-            
-            # Calculate weighted 3DA
-            total_average = 0.0
-            if player_data['total_legs'] > 0:
-                total_average = player_data['total_score'] / player_data['total_legs']
-            
-            # Calculate checkout percentage
-            checkout_pct = 0.0
-            if player_data.get('total_double_attempts', 0) > 0:
-                checkout_pct = (player_data['total_doubles_hit'] / player_data['total_double_attempts']) * 100
-            
-            # Calculate match win percentage
-            match_win_pct = 0.0
-            if player_data.get('total_matches', 0) > 0:
-                match_win_pct = (player_data['matches_won'] / player_data['total_matches']) * 100
-            
-            player_stats = {
-                'name': player_name,
-                'total_average': round(total_average, 2),
-                'total_legs': player_data['total_legs'],
-                'total_matches': player_data.get('total_matches', 0),
-                'matches_won': player_data.get('matches_won', 0),
-                'match_win_percentage': round(match_win_pct, 1),
-                'total_180s': player_data['total_180s'],
-                'total_160_plus': player_data.get('total_160_plus', 0),
-                'total_140_plus': player_data['total_140_plus'],
-                'total_100_plus': player_data['total_100_plus'],
-                'highest_finish': player_data['highest_finish'],
-                'total_double_attempts': player_data.get('total_double_attempts', 0),
-                'total_doubles_hit': player_data.get('total_doubles_hit', 0),
-                'checkout_percentage': round(checkout_pct, 1),
-                'events_played': len(events_played),
-                'qualified_for_toc': player_data.get('qualified_for_toc', False),
-                'event_wins': len(player_data.get('event_wins', []))
-            }
+        Merges the precomputed per-(player, event, phase, group) partial
+        aggregates that fall in the slice (NumPy group-by over the partials;
+        pure Python over the match history when numpy is not installed).
+        
+        Args:
+            events: Event ids to include (all events if None)
+            phases: Phases to include, e.g. ['round_robin'] or ['quarterfinal', 'semifinal', 'final']
+            groups: Round-robin groups to include, e.g. ['A']
+            scraped_since: Only events first recorded in this store on or after this ISO
+                date (e.g. '2025-06-01'). This is the scrape date, not when the event
+                was played: DartConnect's payloads carry no event date, and a rebuild
+                dates each event by when its raw payload was archived.
             
-            players_list.append(player_stats)
+        Returns:
+            Ranked rows with the same fields as get_leaderboard()
+        """
+        if not NUMPY_AVAILABLE:
+            with self._read_access():
+                events = select_events(events, scraped_since, self.data['events'])
+                return leaderboard_from_history(match_history(self._iter_log()), self.data['players'],
+                                                events, phases, groups)
         
-        # Sort by total average (descending), then by events played
-        players_list.sort(key=lambda x: (-x['total_average'], -x['events_played']))
+        with self._columns_access() as columns:
+            events = select_events(events, scraped_since, self.data['events'])
+            return ranked_rows(columns.player_totals(events, phases, groups), self.data['players'])
+    
+    def get_player_splits(self, player_name: str, by: str = 'event') -> List[Dict[str, Any]]:
+        """A player's totals split per event, phase or group"""
+        player_name = player_name.strip()
+        if not NUMPY_AVAILABLE:
+            with self._read_access():
+                return splits_from_history(match_history(self._iter_log(), {player_name}).get(player_name, []), by)
         
-        # Add rank
-        for i, player in enumerate(players_list, 1):
-            player['rank'] = i
+        with self._columns_access() as columns:
+            return [split_row(totals, by) for totals in columns.splits(by, players=[player_name])]
+    
+    @contextmanager
+    def _columns_access(self):
+        """Read access to the partials, built from the log on first use
         
-        return players_list
+        Later records are folded in as they arrive. A rebuild() or batch
+        rollback drops them (_rebuild_indexes), so they are re-checked once
+        the read lock is held and built again if that happened in between.
+        """
+        while True:
+            if self._columns is None:
+                with self._rw.write():
+                    self._catch_up()
+                    if self._columns is None:
+                        self._columns = ColumnarStats.from_history(
+                            match_history(chain(self._iter_log(), self._pending)))
+            with self._read_access():
+                columns = self._columns
+                if columns is not None:
+                    yield columns
+                    return
     
     def get_events_summary(self) -> List[Dict[str, Any]]:
         """Get summary of all events"""
         events_list = []
         
-        for event_id, event_data in self.data['events'].items():
-            event_summary = {
-                'event_id': event_id,
-                'event_name': f"Event {event_id}",
-                'date': event_data['date'],
-                'players_count': len(event_data['players']),
-                'winner': event_data.get('winner'),
-                'is_qualifier': event_data.get('is_qualifier', True)
-            }
-            events_list.append(event_summary)
+        with self._read_access():
+            for event_id, event_data in self.data['events'].items():
+                event_summary = {
+                    'event_id': event_id,
+                    'event_name': f"Event {event_id}",
+                    'date': event_data['date'],
+                    'players_count': len(event_data['players']),
+                    'winner': event_data.get('winner'),
+                    'is_qualifier': event_data.get('is_qualifier', True)
+                }
+                events_list.append(event_summary)
         
         # Sort by event_id
         events_list.sort(key=lambda x: x['event_id'])
         return events_list
     
     def get_stats_api_format(self) -> Dict[str, Any]:
-        """Get data in the format expected by the stats display frontend"""
-        leaderboard = self.get_leaderboard()
-        events = self.get_events_summary()
-        
-        return {
-            'players': leaderboard,
-            'total_matches': self.data['metadata']['total_matches'],
-            'events': events,
-            'last_updated': self.data['metadata']['last_updated'],
-            'series_info': self.data['metadata'].get('series_info', {})
-        }
+        """Get data in the format expected by the stats display frontend
+        
+        The result is a cached snapshot that is rebuilt only when
+        data_version changes; treat it as read-only.
+        """
+        with self._read_access():
+            version = self.data_version
+            if self._snapshot is not None and self._snapshot['data_version'] == version:
+                return self._snapshot
+            
+            self._snapshot = {
+                'players': self.get_leaderboard(),
+                'total_matches': self.data['metadata']['total_matches'],
+                'events': self.get_events_summary(),
+                'last_updated': self.data['metadata']['last_updated'],
+                'series_info': self.data['metadata'].get('series_info', {}),
+                'data_version': version
+            }
+            return self._snapshot
     
     def backup_database(self, backup_suffix: str = None) -> str:
         """Create a backup of the current database"""
@@ -296,11 +640,461 @@ class AADSDataManager:
         
         backup_filename = f"{self.db_file}.backup_{backup_suffix}"
         
+        # Make sure pending changes are part of the backup (a current
+        # checkpoint plus the log up to the offset it covers)
+        self.flush()
+        
         try:
-            with open(self.db_file, 'r', encoding='utf-8') as src:
-                with open(backup_filename, 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
+            with self._rw.write(), self._file_lock:
+                shutil.copyfile(self.db_file, backup_filename)
+                if os.path.exists(self._log.path):
+                    shutil.copyfile(self._log.path, f"{self._log.path}.backup_{backup_suffix}")
             return backup_filename
         except Exception as e:
             print(f"Error creating backup: {e}")
             return None
+
+
+# Marker for matches recorded by the old per-URL dedup (player unknown):
+# every player of such a match is treated as already recorded
+LEGACY_WHOLE_MATCH = '*'
+
+
+def match_id_from_url(match_url: str) -> str:
+    """Extract a stable match id from a recap URL
+    
+    https://recap.dartconnect.com/matches/<id> -> <id>
+    .../Recap.aspx?ID=12345 -> 12345
+    """
+    id_param = re.search(r'[?&]ID=(\d+)', match_url, re.IGNORECASE)
+    if id_param:
+        return id_param.group(1)
+    path = match_url.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+    return path.rsplit('/', 1)[-1] or match_url
+
+
+def migrate_scraped_matches(scraped_matches: Any) -> Dict[str, List[str]]:
+    """Normalize the on-disk scraped_matches field to {match_id: [player, ...]}
+    
+    Older databases stored a flat list of match URLs; those entries are kept
+    as whole-match markers so re-scraping them is still rejected.
+    """
+    if isinstance(scraped_matches, dict):
+        return scraped_matches
+    
+    migrated = {}
+    for match_url in scraped_matches or []:
+        migrated.setdefault(match_id_from_url(match_url), [LEGACY_WHOLE_MATCH])
+    return migrated
+
+
+def build_scraped_index(scraped_matches: Dict[str, List[str]]) -> set:
+    """Build the in-memory set of (match_id, player) keys"""
+    return {(match_id, player) for match_id, players in scraped_matches.items() for player in players}
+
+
+def new_database() -> Dict[str, Any]:
+    """Empty master database structure (covers log offset 0)"""
+    return {
+        'players': {},
+        'events': {},
+        'scraped_matches': {},
+        'metadata': {
+            'last_updated': datetime.now().isoformat(),
+            'total_matches': 0,
+            'version': '1.0.0',
+            'log_offset': 0,
+            'series_info': {
+                'qualifying_events': 6,
+                'championship_event': 1,
+                'current_event': 1
+            }
+        }
+    }
+
+
+# Player fields derived from the match records (the rest are set by hand)
+AGGREGATE_FIELDS = (
+    'total_legs', 'total_score', 'total_matches', 'matches_won',
+    'total_180s', 'total_160_plus', 'total_140_plus', 'total_100_plus',
+    'highest_finish', 'total_double_attempts', 'total_doubles_hit'
+)
+
+
+def new_player(player_name: str) -> Dict[str, Any]:
+    """A player with no recorded matches"""
+    return {
+        'name': player_name,
+        'total_legs': 0,
+        'total_score': 0.0,  # Sum of all individual leg averages
+        'total_matches': 0,
+        'matches_won': 0,
+        'total_180s': 0,
+        'total_160_plus': 0,
+        'total_140_plus': 0,
+        'total_100_plus': 0,
+        'highest_finish': 0,
+        'total_double_attempts': 0,
+        'total_doubles_hit': 0,
+        'events_played': set(),  # Use set to avoid duplicates
+        'qualified_for_toc': False,
+        'event_wins': []
+    }
+
+
+def add_stats(player: Dict[str, Any], stats_dict: Dict[str, Any]):
+    """Accumulate one match's stats into a player's running totals"""
+    legs_played = stats_dict.get('legs_played', 1)
+    three_dart_avg = stats_dict.get('three_dart_average', 0.0)
+    
+    # Accumulate stats for weighted average calculation
+    player['total_legs'] += legs_played
+    player['total_score'] += (three_dart_avg * legs_played)  # Weighted by legs
+    
+    # Match stats
+    player['total_matches'] += stats_dict.get('matches_played', 1)
+    player['matches_won'] += stats_dict.get('match_won', 0)
+    
+    # Score counts
+    player['total_180s'] += stats_dict.get('count_180s', 0)
+    player['total_160_plus'] += stats_dict.get('count_160_plus', 0)
+    player['total_140_plus'] += stats_dict.get('count_140_plus', 0)
+    player['total_100_plus'] += stats_dict.get('count_100_plus', 0)
+    
+    # Checkout stats
+    player['total_double_attempts'] += stats_dict.get('double_attempts', 0)
+    player['total_doubles_hit'] += stats_dict.get('doubles_hit', 0)
+    
+    # Update highest finish
+    high_finish = stats_dict.get('highest_finish', 0)
+    if high_finish > player['highest_finish']:
+        player['highest_finish'] = high_finish
+
+
+def apply_match_record(data: Dict[str, Any], record: Dict[str, Any]):
+    """Fold one 'add' or 'scraped' log record into a master database structure"""
+    player_name = record['player']
+    match_id = record.get('match_id')
+    if match_id:
+        data['scraped_matches'].setdefault(match_id, []).append(player_name)
+    if record['op'] == OP_SCRAPED:
+        return
+    
+    # Initialize player if doesn't exist
+    if player_name not in data['players']:
+        data['players'][player_name] = new_player(player_name)
+    player = data['players'][player_name]
+    
+    event_id = record['event_id']
+    player['events_played'].add(event_id)
+    add_stats(player, record['stats'])
+    
+    # Update event info
+    if event_id not in data['events']:
+        data['events'][event_id] = {
+            'event_id': event_id,
+            'date': record['date'],
+            'players': [],
+            'winner': None,
+            'is_qualifier': True  # Assume qualifier unless set otherwise
+        }
+    
+    if player_name not in data['events'][event_id]['players']:
+        data['events'][event_id]['players'].append(player_name)
+    
+    data['metadata']['total_matches'] += 1
+
+
+def match_history(records: Iterable[Dict[str, Any]], player_names: set = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Per-player match history from log records, with corrections applied
+    
+    Args:
+        records: Log records in log order
+        player_names: Only collect these players (all players if omitted)
+        
+    Returns:
+        {player: [{'event_id', 'date', 'match_url', 'stats'}, ...]}
+    """
+    history = {}
+    by_match = {}
+    for record in records:
+        player_name = record['player']
+        if record['op'] == OP_SCRAPED or (player_names is not None and player_name not in player_names):
+            continue
+        key = (player_name, record.get('match_id'))
+        if record['op'] == OP_CORRECT:
+            entry = by_match.get(key)
+            if entry is not None:
+                entry['stats'] = record['stats']
+            continue
+        
+        entry = {
+            'event_id': record['event_id'],
+            'date': record['date'],
+            'match_url': record.get('match_url'),
+            'stats': record['stats']
+        }
+        history.setdefault(player_name, []).append(entry)
+        if record.get('match_id'):
+            by_match[key] = entry
+    return history
+
+
+def replay_player_totals(records: Iterable[Dict[str, Any]], player_names: set) -> Dict[str, Dict[str, Any]]:
+    """Recompute some players' totals from their log records"""
+    history = match_history(records, player_names)
+    totals = {}
+    for player_name in player_names:
+        player = new_player(player_name)
+        for entry in history.get(player_name, []):
+            add_stats(player, entry['stats'])
+        totals[player_name] = player
+    return totals
+
+
+def ranked_rows(totals: List[Dict[str, Any]], players: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Leaderboard rows for per-player totals that are already in rank order
+    
+    Args:
+        totals: Aggregate fields plus 'name' and 'events_played' (a count) per player
+        players: Stored player records (for the fields set by hand)
+    """
+    rows = []
+    for rank, player_totals in enumerate(totals, 1):
+        name = player_totals['name']
+        stored = players.get(name, {})
+        player_data = {**player_totals, 'qualified_for_toc': stored.get('qualified_for_toc', False),
+                       'event_wins': stored.get('event_wins', [])}
+        row = player_summary(name, player_data, player_totals['events_played'])
+        row['rank'] = rank
+        rows.append(row)
+    return rows
+
+
+def _history_filter(events: Iterable[str] = None, phases: Iterable[str] = None, groups: Iterable[str] = None):
+    """Predicate over history entries matching query_leaderboard() filters"""
+    events = set(events) if events is not None else None
+    phases = set(phases) if phases is not None else None
+    groups = set(groups) if groups is not None else None
+    return lambda entry: ((events is None or entry['event_id'] in events)
+                          and (phases is None or entry['stats'].get('phase') in phases)
+                          and (groups is None or entry['stats'].get('group') in groups))
+
+
+def _totals_from_entries(name: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    player = new_player(name)
+    for entry in entries:
+        add_stats(player, entry['stats'])
+        player['events_played'].add(entry['event_id'])
+    return {**player, 'events_played': len(player['events_played'])}
+
+
+def leaderboard_from_history(history: Dict[str, List[Dict[str, Any]]], players: Dict[str, Any],
+                             events: Iterable[str] = None, phases: Iterable[str] = None,
+                             groups: Iterable[str] = None) -> List[Dict[str, Any]]:
+    """query_leaderboard() in pure Python (used when numpy is not installed)"""
+    keep = _history_filter(events, phases, groups)
+    totals = []
+    for name, entries in history.items():
+        selected = [entry for entry in entries if keep(entry)]
+        if selected:
+            totals.append(_totals_from_entries(name, selected))
+    return ranked_rows(rank_totals(totals), players)
+
+
+def rank_totals(totals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort per-player totals (in first-appearance order) into leaderboard order, in place"""
+    # Stable sort: ties keep first-appearance order, like the maintained leaderboard
+    totals.sort(key=lambda t: (-round(t['total_score'] / t['total_legs'], 2) if t['total_legs'] else 0.0,
+                               -t['events_played']))
+    return totals
+
+
+def select_events(events: Iterable[str], scraped_since: str, event_records: Dict[str, Dict[str, Any]]):
+    """Event filter for query_leaderboard(): the requested events, narrowed to those first
+    recorded in the store on or after scraped_since
+    
+    Args:
+        events: Requested event ids (None means all)
+        scraped_since: ISO date or timestamp (None means no date limit)
+        event_records: {event_id: {'date': <first record's timestamp>}} (events without one are left out)
+        
+    Returns:
+        List of event ids, or None when neither filter is given
+    """
+    if scraped_since is None:
+        return events
+    recent = [event_id for event_id, event in event_records.items() if (event.get('date') or '') >= scraped_since]
+    if events is None:
+        return recent
+    recent = set(recent)
+    return [event_id for event_id in events if event_id in recent]
+
+
+def split_row(totals: Dict[str, Any], by: str) -> Dict[str, Any]:
+    """One per-event/phase/group split row with the derived averages"""
+    summary = player_summary(totals[by], totals, totals['events_played'])
+    return {by: totals[by], **{key: value for key, value in summary.items()
+                               if key not in ('name', 'events_played', 'qualified_for_toc', 'event_wins')}}
+
+
+def splits_from_history(entries: List[Dict[str, Any]], by: str) -> List[Dict[str, Any]]:
+    """get_player_splits() in pure Python (used when numpy is not installed)"""
+    key_of = {'event': lambda entry: entry['event_id'],
+              'phase': lambda entry: entry['stats'].get('phase'),
+              'group': lambda entry: entry['stats'].get('group')}[by]
+    grouped = {}
+    for entry in entries:
+        grouped.setdefault(key_of(entry), []).append(entry)
+    return [split_row({**_totals_from_entries('', grouped[key]), by: key}, by)
+            for key in sorted(grouped, key=split_sort_key)]
+
+
+def project_log(log: MatchLog, stop: int = None):
+    """Build the master database structure from a match log in one streaming pass
+    
+    Args:
+        log: Match log to replay
+        stop: Replay only the records before this offset (whole log if omitted)
+        
+    Returns:
+        (data, end offset of the last replayed record)
+    """
+    data = new_database()
+    metadata = data['metadata']
+    metadata['data_version'] = 0
+    end_offset = 0
+    corrected = set()
+    for record, end_offset in log.read(0, stop):
+        if record['op'] == OP_CORRECT:
+            corrected.add(record['player'])
+        else:
+            apply_match_record(data, record)
+        metadata['data_version'] += 1
+        metadata['last_updated'] = record.get('date') or metadata['last_updated']
+    
+    # Corrections replace earlier stats, so recompute those players from their records
+    if corrected:
+        records = (record for record, _ in log.read(0, end_offset))
+        for player_name, totals in replay_player_totals(records, corrected).items():
+            for field in AGGREGATE_FIELDS:
+                data['players'][player_name][field] = totals[field]
+    
+    metadata['log_offset'] = end_offset
+    return data, end_offset
+
+
+def carry_over_manual_fields(old: Dict[str, Any], new: Dict[str, Any]):
+    """Copy the fields that are not derived from match records into a rebuilt database"""
+    for player_name, player in new['players'].items():
+        if player_name in old['players']:
+            player['qualified_for_toc'] = old['players'][player_name].get('qualified_for_toc', False)
+            player['event_wins'] = old['players'][player_name].get('event_wins', [])
+    for event_id, event in new['events'].items():
+        if event_id in old['events']:
+            for field in ('date', 'winner', 'is_qualifier'):
+                if field in old['events'][event_id]:
+                    event[field] = old['events'][event_id][field]
+    
+    old_metadata = old['metadata']
+    metadata = new['metadata']
+    for field in ('version', 'series_info'):
+        if field in old_metadata:
+            metadata[field] = old_metadata[field]
+    # Keep the version moving forward so cached snapshots are invalidated
+    metadata['data_version'] = max(metadata.get('data_version', 0), old_metadata.get('data_version', 0) + 1)
+
+
+def player_summary(player_name: str, player_data: Dict[str, Any], events_played: int) -> Dict[str, Any]:
+    """Build one leaderboard row from a player's running totals
+    
+    Shared by every storage backend so they all report identical numbers.
+    """
+    # Calculate weighted 3DA
+    total_average = 0.0
+    if player_data['total_legs'] > 0:
+        total_average = player_data['total_score'] / player_data['total_legs']
+    
+    # Calculate checkout percentage
+    checkout_pct = 0.0
+    if player_data.get('total_double_attempts', 0) > 0:
+        checkout_pct = (player_data['total_doubles_hit'] / player_data['total_double_attempts']) * 100
+    
+    # Calculate match win percentage
+    match_win_pct = 0.0
+    if player_data.get('total_matches', 0) > 0:
+        match_win_pct = (player_data['matches_won'] / player_data['total_matches']) * 100
+    
+    return {
+        'name': player_name,
+        'total_average': round(total_average, 2),
+        'total_legs': player_data['total_legs'],
+        'total_matches': player_data.get('total_matches', 0),
+        'matches_won': player_data.get('matches_won', 0),
+        'match_win_percentage': round(match_win_pct, 1),
+        'total_180s': player_data['total_180s'],
+        'total_160_plus': player_data.get('total_160_plus', 0),
+        'total_140_plus': player_data['total_140_plus'],
+        'total_100_plus': player_data['total_100_plus'],
+        'highest_finish': player_data['highest_finish'],
+        'total_double_attempts': player_data.get('total_double_attempts', 0),
+        'total_doubles_hit': player_data.get('total_doubles_hit', 0),
+        'checkout_percentage': round(checkout_pct, 1),
+        'events_played': events_played,
+        'qualified_for_toc': player_data.get('qualified_for_toc', False),
+        'event_wins': len(player_data.get('event_wins', []))
+    }
+
+
+def rank_players(players_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort leaderboard rows and assign ranks (in place)"""
+    # Sort by total average (descending), then by events played
+    players_list.sort(key=lambda x: (-x['total_average'], -x['events_played']))
+    
+    # Add rank
+    for i, player in enumerate(players_list, 1):
+        player['rank'] = i
+    
+    return players_list
+
+
+def storage_backend_for(db_file: str) -> str:
+    """Backend implied by a database file name: .db / .sqlite / .sqlite3 -> 'sqlite', anything else -> 'json'"""
+    ext = os.path.splitext(db_file)[1].lower()
+    return 'sqlite' if ext in ('.db', '.sqlite', '.sqlite3') else 'json'
+
+
+def open_data_manager(db_file: str = "data/aads_master_db.json", backend: str = None, **kwargs):
+    """Open the stats store with the requested storage backend
+    
+    Args:
+        db_file: Path to the database file
+        backend: 'json' or 'sqlite'. If omitted, it is picked from the file
+            extension (.db / .sqlite / .sqlite3 -> sqlite, anything else -> json)
+        **kwargs: Passed through to the manager constructor
+        
+    Returns:
+        AADSDataManager or SQLiteDataManager (same public interface)
+    """
+    if backend is None:
+        backend = storage_backend_for(db_file)
+    
+    if backend == 'sqlite':
+        from sqlite_manager import SQLiteDataManager
+        return SQLiteDataManager(db_file, **kwargs)
+    if backend == 'json':
+        return AADSDataManager(db_file, **kwargs)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3 or sys.argv[1] != 'rebuild':
+        print("Usage: python database_manager.py rebuild <aads_master_db.json>")
+        sys.exit(1)
+
+    manager = AADSDataManager(sys.argv[2])
+    result = manager.rebuild()
+    print(f"Rebuilt {result['players']} players and {result['events']} events "
+          f"from {result['records']} log records")
@@ -0,0 +1,208 @@
+"""
+WebDriver Pool - Bounded pool of reusable headless browsers
+Drivers are checked out per page fetch, health-checked on the way out and
+recycled after a fixed number of pages to cap browser memory growth
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+# Selenium imports are optional; the pool itself works with any driver factory
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process (ChromeDriverManager is slow)"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def chrome_driver_factory(user_agent: str, headless: bool = True, window_size: str = '1920,1080') -> Callable[[], Any]:
+    """Build a factory that starts a configured headless Chrome instance"""
+    def create():
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument('--headless')  # Run in background
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument(f'--window-size={window_size}')
+        chrome_options.add_argument(f'user-agent={user_agent}')
+        return webdriver.Chrome(service=Service(get_chromedriver_path()), options=chrome_options)
+    return create
+
+
+def default_health_check(driver) -> bool:
+    """A driver is healthy if its session still answers a trivial command"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class PoolTimeout(Exception):
+    """Raised when no driver becomes available within the checkout timeout"""
+
+
+class WebDriverPool:
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages_per_driver: int = 50,
+                 health_check: Callable[[Any], bool] = default_health_check, checkout_timeout: float = 120.0):
+        """Initialize the pool (drivers are started lazily or by warm())
+
+        Args:
+            factory: Callable returning a new driver (Selenium or any stand-in)
+            size: Maximum number of live drivers
+            max_pages_per_driver: Recycle a driver after this many checkouts
+            health_check: Called on return; unhealthy drivers are replaced
+            checkout_timeout: Seconds to wait for a free driver
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.health_check = health_check
+        self.checkout_timeout = checkout_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._idle = deque()
+        self._pages: Dict[int, int] = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.stats = {'created': 0, 'recycled': 0, 'discarded': 0, 'checkouts': 0}
+
+    def warm(self, count: int = None):
+        """Start drivers up front so the first requests don't pay browser startup"""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._cond:
+                if self._closed or self._live >= count:
+                    return
+                self._live += 1
+            driver = self._create()
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    def _create(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._pages[id(driver)] = 0
+            self.stats['created'] += 1
+        self.logger.info(f"WebDriver started ({self._live}/{self.size} live)")
+        return driver
+
+    def _quit(self, driver):
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: float = None):
+        """Check out a driver, starting one if the pool is below its size
+
+        Raises:
+            PoolTimeout: if none is free within the timeout
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WebDriver pool is closed")
+                if self._idle:
+                    self.stats['checkouts'] += 1
+                    return self._idle.popleft()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"No WebDriver available after {timeout}s")
+                self._cond.wait(remaining)
+
+        driver = self._create()
+        self.stats['checkouts'] += 1
+        return driver
+
+    def release(self, driver, discard: bool = False):
+        """Return a driver; broken or worn-out drivers are quit instead of reused"""
+        with self._cond:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+
+        if not discard and self.max_pages_per_driver and pages >= self.max_pages_per_driver:
+            self.stats['recycled'] += 1
+            self.logger.info(f"Recycling WebDriver after {pages} pages")
+            discard = True
+        elif not discard and self.health_check and not self.health_check(driver):
+            self.logger.warning("WebDriver failed health check, discarding")
+            discard = True
+
+        if discard:
+            self.stats['discarded'] += 1
+            self._quit(driver)
+
+        with self._cond:
+            if discard or self._closed:
+                self._live -= 1
+                if self._closed and not discard:
+                    self._quit(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout: float = None):
+        """Context manager: check out a driver and always return it
+
+        A driver whose block raised is discarded, since its state is unknown.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quit all idle drivers; checked-out drivers are quit when returned"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def __len__(self) -> int:
+        return self._live
@@ -1,30 +1,110 @@
 """
 Event Data Manager - Manages saving and loading event scraping data
-Organizes data into folders with multiple formats (JSON, CSV, TXT)
+Organizes data into folders with multiple formats (JSON, TXT, CSV on export);
+per-match scrape status lives in an append-only journal per event, and raw
+payloads in a content-addressed archive shared by all events
 """
 
+import functools
 import os
-import json
 import csv
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, IO, Optional
 import logging
 
+from file_lock import FileLock
+from match_log import MatchLog
+from raw_archive import RawArchive
+from serializer import dump_file, load_file, loads
+
+# Per-event status journal (one JSON record per line, see _apply_status_record)
+STATUS_JOURNAL = 'status.jsonl'
+# Per-event lock file, held by whichever process writes the event's journal or manifest
+EVENT_LOCK = '.lock'
+
+# Raw payloads: gzipped objects named by SHA-256 in base_dir/archive, and per
+# event a manifest of the versions saved ({'kind', 'sha256', 'saved_at', 'size'})
+ARCHIVE_DIR = 'archive'
+RAW_MANIFEST = os.path.join('raw_data', 'manifest.jsonl')
+RAW_KINDS = ('api_response', 'matches')
+# Unreferenced objects touched more recently than this may belong to a save in progress
+ORPHAN_GRACE_SECONDS = 60
+
+# Per-event summaries and counters for list_events() / get_event_summary()
+CATALOG_FILE = 'catalog.json'
+CATALOG_VERSION = 2
+SUMMARY_FIELDS = ('event_id', 'total_matches', 'completed', 'pending', 'errors', 'created_at', 'last_updated', 'status')
+
+CSV_FIELDS = ['match_number', 'match_type', 'phase', 'group_name', 'url', 'title', 'status', 'scraped_at']
+
+
+def _synchronized(method):
+    """Run a read-modify-write method under the manager's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class EventDataManager:
-    def __init__(self, base_dir: str = "event_data"):
+    def __init__(self, base_dir: str = "event_data", raw_retention: Optional[int] = 10):
         """Initialize the event data manager
         
         Args:
             base_dir: Base directory for storing event data
+            raw_retention: Versions of each raw payload kind kept per event
+                (older ones are dropped from the manifest on save, the latest always
+                stays; None keeps all)
         """
         self.base_dir = base_dir
+        self.raw_retention = raw_retention
+        self.archive = RawArchive(os.path.join(self.base_dir, ARCHIVE_DIR))
         self.logger = logging.getLogger(__name__)
         
+        # Bumped on every write so API response caches know when to refresh;
+        # the marker file's mtime carries writes made by other server processes
+        self._writes = 0
+        self._version_file = os.path.join(self.base_dir, '.data_version')
+        
+        # Serializes read-modify-write of the event files between request threads
+        self._lock = threading.RLock()
+        # Events whose file lock this process holds (see _event_file_lock)
+        self._locked_events = set()
+        
+        # event_id -> in-memory view of the event's match list and statuses
+        self._events: Dict[str, Dict[str, Any]] = {}
+        
+        # Event catalog (catalog.json): one summary entry per event, updated on
+        # every write and re-validated against file mtimes when any process wrote
+        self._catalog_file = os.path.join(self.base_dir, CATALOG_FILE)
+        self._catalog: Optional[Dict[str, Dict[str, Any]]] = None
+        self._catalog_checked = None     # data_version marker the catalog was last validated at
+        self._catalog_dir_mtime = None   # base_dir mtime when its event folders were last listed
+        self._uncataloged = set()        # event folders without metadata.json yet
+        
         # Create base directory if it doesn't exist
         if not os.path.exists(self.base_dir):
             os.makedirs(self.base_dir)
             self.logger.info(f"Created event data directory: {self.base_dir}")
     
+    @property
+    def data_version(self):
+        """Changes whenever any process wrote event data"""
+        try:
+            return (self._writes, os.stat(self._version_file).st_mtime_ns)
+        except OSError:
+            return (self._writes, 0)
+    
+    def _mark_changed(self):
+        self._writes += 1
+        with open(self._version_file, 'a'):
+            os.utime(self._version_file)
+    
     def event_exists(self, event_id: str) -> bool:
         """Check if an event has already been saved
         
@@ -38,6 +118,111 @@ class EventDataManager:
         metadata_file = os.path.join(event_dir, "metadata.json")
         return os.path.exists(metadata_file)
     
+    @contextmanager
+    def _event_file_lock(self, event_id: str):
+        """Hold an event's cross-process lock (re-entrant; caller holds self._lock)
+        
+        Server processes sharing base_dir take it around every catch-up + append
+        of the event's status journal and manifest, so offsets stay consistent.
+        """
+        if event_id in self._locked_events:
+            yield
+            return
+        with FileLock(os.path.join(self.base_dir, event_id, EVENT_LOCK)):
+            self._locked_events.add(event_id)
+            try:
+                yield
+            finally:
+                self._locked_events.discard(event_id)
+    
+    def _journal(self, event_id: str) -> MatchLog:
+        return MatchLog(os.path.join(self.base_dir, event_id, STATUS_JOURNAL))
+    
+    def _event_index(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """The event's match list and url -> status index, current with its journal
+        
+        Built from the journal on first use and then only advanced by the
+        records other processes appended since (one stat() per call).
+        Caller holds self._lock.
+        
+        Returns:
+            {'matches': [...], 'status': {url: (status, scraped_at)}, 'offset': int,
+            'counts': Counter of match statuses, ...}, or None if the event has no saved matches
+        """
+        index = self._events.get(event_id)
+        journal = self._journal(event_id)
+        if index is not None and journal.size() < index['offset']:
+            index = None  # journal replaced (e.g. event folder restored from a copy)
+        if index is None:
+            if journal.size() == 0 and not self._migrate_event(event_id):
+                return None
+            index = self._events[event_id] = {'matches': [], 'status': {}, 'offset': 0,
+                                              'occurrences': Counter(), 'counts': Counter()}
+        
+        if journal.size() != index['offset']:
+            records = list(journal.read(index['offset']))
+            # Only the newest match list counts (older ones may be gone from the archive)
+            last_list = max((i for i, (record, _) in enumerate(records) if 'url' not in record), default=-1)
+            for i, (record, end_offset) in enumerate(records):
+                if 'url' in record or i == last_list:
+                    self._apply_status_record(event_id, index, record)
+                index['offset'] = end_offset
+        return index
+    
+    def _apply_status_record(self, event_id: str, index: Dict[str, Any], record: Dict[str, Any]):
+        """Fold one journal record into an event index
+        
+        Records are {'matches_sha256': <archived payload>} when the match list
+        was (re)saved ({'matches': <file in raw_data>} before the archive), and
+        {'url', 'status', 'scraped_at'} for a status change.
+        """
+        status = index['status']
+        if 'url' not in record:
+            try:
+                if 'matches_sha256' in record:
+                    data = self.archive.load(record['matches_sha256'])
+                else:
+                    data = load_file(os.path.join(self.base_dir, event_id, 'raw_data', record['matches']))
+                index['matches'] = data.get('matches', [])
+            except Exception as e:
+                self.logger.error(f"Error loading matches for {event_id}: {e}")
+            index['occurrences'] = Counter(match['url'] for match in index['matches'])
+            index['counts'] = Counter(status.get(match['url'], ('pending',))[0] for match in index['matches'])
+        else:
+            # Move this URL's matches from their old status count to the new one
+            occurrences = index['occurrences'].get(record['url'], 0)
+            if occurrences:
+                index['counts'][status.get(record['url'], ('pending',))[0]] -= occurrences
+                index['counts'][record['status']] += occurrences
+            status[record['url']] = (record['status'], record.get('scraped_at', ''))
+    
+    def _migrate_event(self, event_id: str) -> bool:
+        """Write the journal of an event saved before journals existed
+        
+        Seeds it from the latest matches JSON and the statuses in the latest CSV.
+        
+        Returns:
+            True if the event has saved matches (and now a journal)
+        """
+        event_dir = os.path.join(self.base_dir, event_id)
+        matches_file = _latest_file(os.path.join(event_dir, 'raw_data'), '.json')
+        if matches_file is None:
+            return False
+        
+        with self._event_file_lock(event_id):
+            if self._journal(event_id).size():
+                return True  # another process migrated it first
+            records = [{'matches': matches_file}]
+            csv_file = _latest_file(os.path.join(event_dir, 'csv'), '.csv')
+            if csv_file is not None:
+                with open(os.path.join(event_dir, 'csv', csv_file), 'r', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        if row.get('status', 'pending') != 'pending':
+                            records.append({'url': row['url'], 'status': row['status'],
+                                            'scraped_at': row.get('scraped_at', '')})
+            self._journal(event_id).create(records)
+        return True
+    
     def get_existing_matches(self, event_id: str) -> List[Dict]:
         """Get list of existing matches for an event
         
@@ -47,28 +232,11 @@ class EventDataManager:
         Returns:
             List of match dictionaries
         """
-        event_dir = os.path.join(self.base_dir, event_id)
-        raw_dir = os.path.join(event_dir, "raw_data")
-        
-        if not os.path.exists(raw_dir):
-            return []
-        
-        # Find most recent matches JSON file
-        matches_files = [f for f in os.listdir(raw_dir) if f.startswith('matches_') and f.endswith('.json')]
-        if not matches_files:
-            return []
-        
-        latest_file = sorted(matches_files)[-1]
-        file_path = os.path.join(raw_dir, latest_file)
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('matches', [])
-        except Exception as e:
-            self.logger.error(f"Error loading existing matches: {e}")
-            return []
+        with self._lock:
+            index = self._event_index(event_id)
+            return list(index['matches']) if index is not None else []
     
+    @_synchronized
     def save_event_matches(self, event_id: str, matches: List[Dict], raw_api_response: Dict = None, event_number: int = None) -> str:
         """Save event matches in multiple formats
         
@@ -81,113 +249,92 @@ class EventDataManager:
         Returns:
             Path to the event directory
         """
-        # Check if event already exists
-        existing_matches = self.get_existing_matches(event_id)
-        existing_urls = {m['url'] for m in existing_matches}
-        
-        # Filter out duplicates
-        new_matches = [m for m in matches if m['url'] not in existing_urls]
-        
-        if existing_matches and not new_matches:
-            self.logger.info(f"Event {event_id} already has all {len(existing_matches)} matches saved. Skipping duplicate save.")
-            return os.path.join(self.base_dir, event_id)
-        
-        if existing_matches and new_matches:
-            self.logger.info(f"Event {event_id}: Found {len(existing_matches)} existing matches, adding {len(new_matches)} new matches")
-            # Merge: existing + new
-            all_matches = existing_matches + new_matches
-        else:
-            all_matches = matches
-        
-        # Create event directory structure
-        event_dir = os.path.join(self.base_dir, event_id)
-        raw_dir = os.path.join(event_dir, "raw_data")
-        csv_dir = os.path.join(event_dir, "csv")
-        
-        for dir_path in [event_dir, raw_dir, csv_dir]:
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 1. Save raw API response (if provided)
-        if raw_api_response:
-            raw_file = os.path.join(raw_dir, f"api_response_{timestamp}.json")
-            with open(raw_file, 'w', encoding='utf-8') as f:
-                json.dump(raw_api_response, f, indent=2)
-            self.logger.info(f"Saved raw API response: {raw_file}")
-        
-        # 2. Save matches as JSON
-        matches_json_file = os.path.join(raw_dir, f"matches_{timestamp}.json")
-        with open(matches_json_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'event_id': event_id,
-                'timestamp': timestamp,
+        # The journal and manifest are read and appended under the event's file
+        # lock (shared with other server processes)
+        with self._event_file_lock(event_id):
+            # Check if event already exists
+            existing_matches = self.get_existing_matches(event_id)
+            existing_urls = {m['url'] for m in existing_matches}
+            
+            # Filter out duplicates
+            new_matches = [m for m in matches if m['url'] not in existing_urls]
+            
+            if existing_matches and not new_matches:
+                self.logger.info(f"Event {event_id} already has all {len(existing_matches)} matches saved. Skipping duplicate save.")
+                return os.path.join(self.base_dir, event_id)
+            
+            if existing_matches and new_matches:
+                self.logger.info(f"Event {event_id}: Found {len(existing_matches)} existing matches, adding {len(new_matches)} new matches")
+                # Merge: existing + new
+                all_matches = existing_matches + new_matches
+            else:
+                all_matches = matches
+            
+            # Create event directory structure
+            event_dir = os.path.join(self.base_dir, event_id)
+            raw_dir = os.path.join(event_dir, "raw_data")
+            
+            for dir_path in [event_dir, raw_dir]:
+                if not os.path.exists(dir_path):
+                    os.makedirs(dir_path)
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            
+            # 1. Archive raw API response (if provided)
+            raw_digest = None
+            if raw_api_response:
+                raw_digest = self._archive_payload(event_id, 'api_response', raw_api_response, timestamp)
+                self.logger.info(f"Archived raw API response: {raw_digest}")
+            
+            # 2. Archive matches (no timestamp or event id inside, so the same list is stored once)
+            matches_digest = self._archive_payload(event_id, 'matches', {
                 'match_count': len(all_matches),
-                'new_matches': len(new_matches) if existing_matches else len(all_matches),
                 'matches': all_matches
-            }, f, indent=2)
-        self.logger.info(f"Saved matches JSON: {matches_json_file}")
-        
-        # 3. Save matches as CSV
-        csv_file = os.path.join(csv_dir, f"matches_{timestamp}.csv")
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['match_number', 'match_type', 'phase', 'group_name', 'url', 'title', 'status', 'scraped_at'])
-            writer.writeheader()
-            for idx, match in enumerate(all_matches, 1):
-                # Use match data from scraper if available, otherwise fallback to old logic
-                match_type = match.get('match_type', 'Round Robin' if idx <= 20 else 'Knockout')
-                phase = match.get('phase', 'round_robin' if idx <= 20 else 'quarterfinal')
-                group_name = match.get('group_name', '')
-                
-                writer.writerow({
-                    'match_number': match.get('match_number', idx),
-                    'match_type': match_type,
-                    'phase': phase,
-                    'group_name': group_name if group_name else '',
-                    'url': match['url'],
-                    'title': match['title'],
-                    'status': 'pending',
-                    'scraped_at': ''
-                })
-        self.logger.info(f"Saved matches CSV: {csv_file}")
-        
-        # 4. Save match URLs as plain text list
-        urls_file = os.path.join(event_dir, "match_urls.txt")
-        with open(urls_file, 'w', encoding='utf-8') as f:
-            f.write(f"Event: {event_id}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Matches: {len(all_matches)}\n")
-            f.write(f"Round Robin: {min(20, len(all_matches))}\n")
-            f.write(f"Knockout: {max(0, len(all_matches) - 20)}\n")
-            f.write("-" * 80 + "\n\n")
-            for i, match in enumerate(all_matches, 1):
-                match_type = 'Round Robin' if i <= 20 else 'Knockout'
-                f.write(f"{i}. [{match_type}] {match['title']}\n")
-                f.write(f"   {match['url']}\n\n")
-        self.logger.info(f"Saved match URLs: {urls_file}")
-        
-        # 5. Save metadata
-        metadata_file = os.path.join(event_dir, "metadata.json")
-        metadata = {
-            'event_id': event_id,
-            'created_at': timestamp,
-            'match_count': len(all_matches),
-            'round_robin_count': min(20, len(all_matches)),
-            'knockout_count': max(0, len(all_matches) - 20),
-            'last_updated': timestamp,
-            'status': 'matches_found',
-            'files': {
-                'raw_api_response': os.path.basename(raw_file) if raw_api_response else None,
-                'matches_json': os.path.basename(matches_json_file),
-                'matches_csv': os.path.basename(csv_file),
-                'match_urls': 'match_urls.txt'
+            }, timestamp)
+            self.logger.info(f"Archived matches: {matches_digest}")
+            
+            # 3. Point the status journal at the new match list (statuses of known URLs carry over)
+            self._journal(event_id).append([{'matches_sha256': matches_digest}])
+            
+            # 4. Save match URLs as plain text list
+            urls_file = os.path.join(event_dir, "match_urls.txt")
+            with open(urls_file, 'w', encoding='utf-8') as f:
+                f.write(f"Event: {event_id}\n")
+                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"Total Matches: {len(all_matches)}\n")
+                f.write(f"Round Robin: {min(20, len(all_matches))}\n")
+                f.write(f"Knockout: {max(0, len(all_matches) - 20)}\n")
+                f.write("-" * 80 + "\n\n")
+                for i, match in enumerate(all_matches, 1):
+                    match_type = 'Round Robin' if i <= 20 else 'Knockout'
+                    f.write(f"{i}. [{match_type}] {match['title']}\n")
+                    f.write(f"   {match['url']}\n\n")
+            self.logger.info(f"Saved match URLs: {urls_file}")
+            
+            # 5. Save metadata
+            metadata_file = os.path.join(event_dir, "metadata.json")
+            metadata = {
+                'event_id': event_id,
+                'created_at': timestamp,
+                'match_count': len(all_matches),
+                'round_robin_count': min(20, len(all_matches)),
+                'knockout_count': max(0, len(all_matches) - 20),
+                'last_updated': timestamp,
+                'status': 'matches_found',
+                'files': {
+                    'raw_api_response_sha256': raw_digest,
+                    'matches_sha256': matches_digest,
+                    'raw_manifest': RAW_MANIFEST,
+                    'status_journal': STATUS_JOURNAL,
+                    'match_urls': 'match_urls.txt'
+                }
             }
-        }
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
-        self.logger.info(f"Saved metadata: {metadata_file}")
-        
+            dump_file(metadata, metadata_file)
+            self.logger.info(f"Saved metadata: {metadata_file}")
+            
+            self._apply_retention(event_id)
+            self._update_catalog(event_id)
+        self._mark_changed()
         return event_dir
     
     def load_pending_matches(self, event_id: str) -> List[Dict]:
@@ -197,148 +344,499 @@ class EventDataManager:
             event_id: Event identifier
             
         Returns:
-            List of pending matches
+            List of pending matches (the saved match dicts: url, title, phase, group_name, ...)
         """
-        event_dir = os.path.join(self.base_dir, event_id)
-        csv_dir = os.path.join(event_dir, "csv")
-        
-        if not os.path.exists(csv_dir):
-            return []
-        
-        # Find the most recent CSV file
-        csv_files = [f for f in os.listdir(csv_dir) if f.startswith('matches_') and f.endswith('.csv')]
-        if not csv_files:
-            return []
-        
-        latest_csv = sorted(csv_files)[-1]
-        csv_path = os.path.join(csv_dir, latest_csv)
-        
-        pending_matches = []
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['status'] == 'pending':
-                    pending_matches.append({
-                        'url': row['url'],
-                        'title': row['title']
-                    })
-        
-        return pending_matches
+        with self._lock:
+            index = self._event_index(event_id)
+            if index is None:
+                return []
+            status = index['status']
+            return [dict(match) for match in index['matches']
+                    if status.get(match['url'], ('pending',))[0] == 'pending']
     
+    @_synchronized
     def update_match_status(self, event_id: str, match_url: str, status: str, stats_data: Dict = None):
         """Update the status of a specific match
         
+        Appends one record to the event's status journal.
+        
         Args:
             event_id: Event identifier
             match_url: URL of the match
             status: New status (e.g., 'completed', 'error')
             stats_data: Optional stats data from scraping
         """
-        event_dir = os.path.join(self.base_dir, event_id)
-        csv_dir = os.path.join(event_dir, "csv")
-        
-        if not os.path.exists(csv_dir):
-            return
-        
-        # Find the most recent CSV file
-        csv_files = [f for f in os.listdir(csv_dir) if f.startswith('matches_') and f.endswith('.csv')]
-        if not csv_files:
+        if not os.path.isdir(os.path.join(self.base_dir, event_id)):
             return
         
-        latest_csv = sorted(csv_files)[-1]
-        csv_path = os.path.join(csv_dir, latest_csv)
-        
-        # Read all rows
-        rows = []
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            for row in reader:
-                if row['url'] == match_url:
-                    row['status'] = status
-                    row['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                rows.append(row)
-        
-        # Write back
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+        # Catch up with other processes' records and append under the event's
+        # file lock, so the offset recorded below is the end of this record
+        with self._event_file_lock(event_id):
+            index = self._event_index(event_id)
+            if index is None:
+                return
+            
+            record = {'url': match_url, 'status': status, 'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            index['offset'] = self._journal(event_id).append([record])
+            self._apply_status_record(event_id, index, record)
+            self._update_catalog(event_id, index)
+        self._mark_changed()
         
         # Save stats data if provided
         if stats_data:
-            stats_dir = os.path.join(event_dir, "stats")
+            stats_dir = os.path.join(self.base_dir, event_id, "stats")
             if not os.path.exists(stats_dir):
                 os.makedirs(stats_dir)
             
             # Extract match ID from URL
             match_id = match_url.split('/')[-1]
             stats_file = os.path.join(stats_dir, f"{match_id}.json")
-            with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats_data, f, indent=2)
+            dump_file(stats_data, stats_file)
     
-    def get_event_summary(self, event_id: str) -> Dict:
-        """Get summary of an event's scraping status
+    def write_csv(self, event_id: str, f: IO[str]) -> int:
+        """Write the event's matches with their current status as CSV
         
         Args:
             event_id: Event identifier
+            f: Text stream to write to (opened with newline='')
             
         Returns:
-            Summary dictionary
+            Number of match rows written
         """
-        event_dir = os.path.join(self.base_dir, event_id)
-        metadata_file = os.path.join(event_dir, "metadata.json")
+        with self._lock:
+            index = self._event_index(event_id)
+            matches = list(index['matches']) if index is not None else []
+            status = dict(index['status']) if index is not None else {}
+        
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for idx, match in enumerate(matches, 1):
+            # Use match data from scraper if available, otherwise fallback to old logic
+            match_status, scraped_at = status.get(match['url'], ('pending', ''))
+            writer.writerow({
+                'match_number': match.get('match_number', idx),
+                'match_type': match.get('match_type', 'Round Robin' if idx <= 20 else 'Knockout'),
+                'phase': match.get('phase', 'round_robin' if idx <= 20 else 'quarterfinal'),
+                'group_name': match.get('group_name') or '',
+                'url': match['url'],
+                'title': match['title'],
+                'status': match_status,
+                'scraped_at': scraped_at
+            })
+        return len(matches)
+    
+    def export_csv(self, event_id: str) -> Optional[str]:
+        """Write csv/matches_<timestamp>.csv for an event (generated on demand)
         
-        if not os.path.exists(metadata_file):
-            return {'error': 'Event not found'}
-        
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        
-        # Count completed matches
-        csv_dir = os.path.join(event_dir, "csv")
-        completed = 0
-        pending = 0
-        
-        if os.path.exists(csv_dir):
-            csv_files = [f for f in os.listdir(csv_dir) if f.startswith('matches_') and f.endswith('.csv')]
-            if csv_files:
-                latest_csv = sorted(csv_files)[-1]
-                csv_path = os.path.join(csv_dir, latest_csv)
-                with open(csv_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row['status'] == 'completed':
-                            completed += 1
-                        elif row['status'] == 'pending':
-                            pending += 1
+        Args:
+            event_id: Event identifier
+            
+        Returns:
+            Path of the CSV file, or None if the event has no saved matches
+        """
+        if not self.event_exists(event_id):
+            return None
+        csv_dir = os.path.join(self.base_dir, event_id, "csv")
+        os.makedirs(csv_dir, exist_ok=True)
+        csv_file = os.path.join(csv_dir, f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            self.write_csv(event_id, f)
+        self.logger.info(f"Exported matches CSV: {csv_file}")
+        return csv_file
+    
+    # ==================== RAW ARCHIVE ====================
+    
+    def _event_dirs(self) -> List[str]:
+        """Names of the event folders in base_dir"""
+        return [name for name in os.listdir(self.base_dir)
+                if name != ARCHIVE_DIR and os.path.isdir(os.path.join(self.base_dir, name))]
+    
+    def _manifest(self, event_id: str) -> MatchLog:
+        return MatchLog(os.path.join(self.base_dir, event_id, RAW_MANIFEST))
+    
+    def _manifest_records(self, event_id: str, kind: str = None) -> List[Dict[str, Any]]:
+        return [record for record, _ in self._manifest(event_id).read()
+                if kind is None or record['kind'] == kind]
+    
+    def raw_versions(self, event_id: str, kind: str = None) -> List[Dict[str, Any]]:
+        """The saved payload versions of an event, oldest first
+        
+        Events saved before the archive (not yet compacted) list their
+        timestamped api_response_*/matches_* files instead.
+        
+        Args:
+            event_id: Event identifier
+            kind: 'api_response' or 'matches' (None for both)
+        
+        Returns:
+            Manifest records: {'kind', 'sha256', 'saved_at', 'size'}
+            (legacy files: {'kind', 'sha256': None, 'saved_at', 'file'})
+        """
+        records = self._manifest_records(event_id)
+        if not records:
+            legacy = _legacy_raw_files(os.path.join(self.base_dir, event_id, 'raw_data'))
+            records = sorted(({'kind': legacy_kind, 'sha256': None, 'saved_at': timestamp, 'file': name}
+                              for legacy_kind, files in legacy.items() for timestamp, name in files),
+                             key=lambda record: record['saved_at'])
+        return [record for record in records if kind is None or record['kind'] == kind]
+    
+    def _archive_payload(self, event_id: str, kind: str, payload: Any, timestamp: str) -> str:
+        """Store a payload in the archive and list it in the event's manifest
+        
+        Saving the same payload as the event's latest version of that kind adds
+        no manifest record; the object itself is only ever written once.
+        
+        Returns:
+            The payload's SHA-256
+        """
+        digest, size, written = self.archive.put(payload)
+        with self._event_file_lock(event_id):
+            versions = self._manifest_records(event_id, kind)
+            if not versions or versions[-1]['sha256'] != digest:
+                self._manifest(event_id).append([{'kind': kind, 'sha256': digest, 'saved_at': timestamp, 'size': size}])
+        if not written:
+            self.logger.info(f"{kind} payload for {event_id} already archived ({digest[:12]})")
+        return digest
+    
+    def _apply_retention(self, event_id: str, release: bool = True) -> int:
+        """Drop the versions beyond raw_retention from an event's manifest
+        
+        Args:
+            event_id: Event identifier
+            release: Also delete dropped objects no other manifest refers to
+                (compact_archive() sweeps them all at once instead)
+        
+        Returns:
+            Number of versions dropped
+        """
+        if self.raw_retention is None:
+            return 0
+        # Read and rewritten under the event's file lock, so no other process's
+        # append lands in between and is lost
+        with self._event_file_lock(event_id):
+            records = self._manifest_records(event_id)
+            kept = []
+            for kind in RAW_KINDS:
+                versions = [record for record in records if record['kind'] == kind]
+                kept.extend(versions[-self.raw_retention:] if self.raw_retention else versions[-1:])
+            if len(kept) == len(records):
+                return 0
+            
+            kept_ids = {id(record) for record in kept}
+            self._manifest(event_id).create([record for record in records if id(record) in kept_ids])
+        if release:
+            dropped = {record['sha256'] for record in records if id(record) not in kept_ids}
+            dropped -= self._referenced_digests()
+            freed = sum(self.archive.delete(digest, min_age=ORPHAN_GRACE_SECONDS) for digest in dropped)
+            self.logger.info(f"Dropped {len(records) - len(kept)} raw versions of {event_id} ({freed} bytes freed)")
+        return len(records) - len(kept)
+    
+    def _referenced_digests(self) -> set:
+        """SHA-256 of every object listed in any event's manifest"""
+        return {record['sha256'] for event_id in self._event_dirs() for record in self._manifest_records(event_id)}
+    
+    def open_raw(self, event_id: str, kind: str = 'api_response', version: int = -1) -> Optional[IO[bytes]]:
+        """Stream one saved payload's JSON bytes (decompressed as they are read)
+        
+        Args:
+            event_id: Event identifier
+            kind: 'api_response' or 'matches'
+            version: Index into raw_versions(event_id, kind) (-1 is the latest)
         
+        Returns:
+            Binary stream to close after use, or None if there is no such version
+        """
+        try:
+            record = self.raw_versions(event_id, kind)[version]
+            if record['sha256'] is None:
+                return open(os.path.join(self.base_dir, event_id, 'raw_data', record['file']), 'rb')
+            return self.archive.open(record['sha256'])
+        except (IndexError, OSError):
+            return None
+    
+    def load_raw(self, event_id: str, kind: str = 'api_response', version: int = -1) -> Optional[Any]:
+        """Decode one saved payload (see open_raw)"""
+        stream = self.open_raw(event_id, kind, version)
+        if stream is None:
+            return None
+        with stream:
+            return loads(stream.read())
+    
+    @_synchronized
+    def compact_archive(self) -> Dict[str, int]:
+        """Bring every event onto the archive and drop what retention no longer keeps
+        
+        Moves legacy timestamped raw files into the archive, trims each
+        manifest to raw_retention versions and deletes unreferenced objects.
+        
+        Returns:
+            Counts: events, migrated_files, dropped_versions, deleted_objects,
+            freed_bytes, archive_bytes
+        """
+        result = Counter(dict.fromkeys(('events', 'migrated_files', 'dropped_versions', 'deleted_objects', 'freed_bytes'), 0))
+        for event_id in sorted(self._event_dirs()):
+            result['events'] += 1
+            with self._event_file_lock(event_id):
+                result['migrated_files'] += self._archive_legacy_files(event_id)
+                result['dropped_versions'] += self._apply_retention(event_id, release=False)
+        
+        referenced = self._referenced_digests()
+        for digest in list(self.archive.digests()):
+            if digest not in referenced:
+                freed = self.archive.delete(digest, min_age=ORPHAN_GRACE_SECONDS)
+                if freed:
+                    result['deleted_objects'] += 1
+                    result['freed_bytes'] += freed
+        
+        if result['migrated_files']:
+            self._mark_changed()
+        result['archive_bytes'] = self.archive.size_bytes()
+        self.logger.info(f"Compacted raw archive: {dict(result)}")
+        return dict(result)
+    
+    def _archive_legacy_files(self, event_id: str) -> int:
+        """Move an event's api_response_*/matches_* files into the archive (caller holds self._lock)
+        
+        Returns:
+            Number of files moved
+        """
+        raw_dir = os.path.join(self.base_dir, event_id, 'raw_data')
+        # Listed and moved under the event's file lock (see _apply_retention), so
+        # two processes never migrate the same files
+        with self._event_file_lock(event_id):
+            legacy = _legacy_raw_files(raw_dir)
+            if not legacy:
+                return 0
+            self._event_index(event_id)  # seed the journal from the legacy files first
+            
+            archived = self._manifest_records(event_id)
+            records = []
+            for kind, files in legacy.items():
+                for timestamp, name in files:
+                    payload = load_file(os.path.join(raw_dir, name))
+                    if kind == 'matches':
+                        payload = {key: payload.get(key) for key in ('match_count', 'matches')}
+                    digest, size, _ = self.archive.put(payload)
+                    records.append({'kind': kind, 'sha256': digest, 'saved_at': timestamp, 'size': size})
+            # Legacy versions predate everything already in the manifest
+            records.sort(key=lambda record: record['saved_at'])
+            self._manifest(event_id).create(records + archived)
+            
+            latest = {record['kind']: record['sha256'] for record in records}
+            if 'matches' in latest and not any(record['kind'] == 'matches' for record in archived):
+                self._journal(event_id).append([{'matches_sha256': latest['matches']}])
+            
+            metadata_file = os.path.join(self.base_dir, event_id, 'metadata.json')
+            if os.path.exists(metadata_file):
+                metadata = load_file(metadata_file)
+                files = metadata.setdefault('files', {})
+                for old_key, new_key, kind in (('raw_api_response', 'raw_api_response_sha256', 'api_response'),
+                                               ('matches_json', 'matches_sha256', 'matches')):
+                    if old_key in files:
+                        del files[old_key]
+                        files.setdefault(new_key, latest.get(kind))
+                files['raw_manifest'] = RAW_MANIFEST
+                dump_file(metadata, metadata_file)
+            
+            for files in legacy.values():
+                for _, name in files:
+                    os.remove(os.path.join(raw_dir, name))
+            self._update_catalog(event_id)
+            return sum(len(files) for files in legacy.values())
+    
+    # ==================== EVENT CATALOG ====================
+    
+    def _file_state(self, event_id: str) -> List[Optional[List[int]]]:
+        """[mtime_ns, size] of metadata.json and the status journal (None where missing)"""
+        state = []
+        for name in ('metadata.json', STATUS_JOURNAL):
+            try:
+                st = os.stat(os.path.join(self.base_dir, event_id, name))
+                state.append([st.st_mtime_ns, st.st_size])
+            except OSError:
+                state.append(None)
+        return state
+    
+    def _catalog_entry(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Build one event's catalog entry from its files (caller holds self._lock)
+        
+        Returns:
+            The entry, or None if the event has no metadata.json
+        """
+        self._event_index(event_id)  # migrates an event saved before journals first
+        state = self._file_state(event_id)
+        if state[0] is None:
+            return None
+        
+        metadata = load_file(os.path.join(self.base_dir, event_id, "metadata.json"))
+        index = self._event_index(event_id)
+        counts = index['counts'] if index is not None else {}
         return {
             'event_id': event_id,
             'total_matches': metadata['match_count'],
-            'completed': completed,
-            'pending': pending,
+            'completed': counts.get('completed', 0),
+            'pending': counts.get('pending', 0),
+            'errors': counts.get('error', 0),
             'created_at': metadata['created_at'],
             'last_updated': metadata['last_updated'],
-            'status': metadata['status']
+            'status': metadata['status'],
+            'matches_sha256': metadata.get('files', {}).get('matches_sha256'),
+            'file_state': state
         }
     
+    def _load_catalog(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            catalog = load_file(self._catalog_file)
+            if catalog.get('version') == CATALOG_VERSION:
+                return catalog['events']
+        except (OSError, ValueError):
+            pass
+        return {}
+    
+    def _save_catalog(self):
+        """Write catalog.json (temp file renamed into place; caller holds self._lock)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix='.catalog_', suffix='.tmp')
+        os.close(fd)
+        try:
+            dump_file({'version': CATALOG_VERSION, 'events': self._catalog}, tmp_path, pretty=False)
+            os.replace(tmp_path, self._catalog_file)
+        except OSError as e:
+            self.logger.error(f"Error saving event catalog: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _validated_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """The catalog, checked against the event files if any process wrote since the last check
+        
+        Unchanged data costs one stat() of the change marker. After a write,
+        each event costs a stat() of its two files, and only events whose
+        files changed are re-read. Caller holds self._lock.
+        """
+        marker = self.data_version[1]
+        if self._catalog is None:
+            self._catalog = self._load_catalog()
+        elif self._catalog_checked == marker:
+            return self._catalog
+        
+        changed = False
+        try:
+            dir_mtime = os.stat(self.base_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        if dir_mtime != self._catalog_dir_mtime:
+            # Event folders added or removed
+            event_ids = set(self._event_dirs()) if dir_mtime is not None else set()
+            for event_id in set(self._catalog) - event_ids:
+                del self._catalog[event_id]
+                changed = True
+            self._uncataloged = event_ids - set(self._catalog)
+            self._catalog_dir_mtime = dir_mtime
+        
+        for event_id in list(self._uncataloged):
+            entry = self._catalog_entry(event_id)
+            if entry is not None:
+                self._catalog[event_id] = entry
+                self._uncataloged.discard(event_id)
+                changed = True
+        
+        for event_id, entry in list(self._catalog.items()):
+            if self._file_state(event_id) != entry['file_state']:
+                entry = self._catalog_entry(event_id)
+                if entry is None:
+                    del self._catalog[event_id]
+                else:
+                    self._catalog[event_id] = entry
+                changed = True
+        
+        if changed:
+            self._save_catalog()
+            self._catalog_dir_mtime = os.stat(self.base_dir).st_mtime_ns
+        self._catalog_checked = marker
+        return self._catalog
+    
+    def _update_catalog(self, event_id: str, index: Dict[str, Any] = None):
+        """Bring an event's catalog entry up to date after this process wrote to it
+        
+        Args:
+            event_id: Event identifier
+            index: The event's current index after a status change (only the
+                counters and the journal state are refreshed, nothing is re-read)
+        """
+        # Other events are re-validated by the next reader, not on this write path
+        catalog = self._catalog if self._catalog is not None else self._validated_catalog()
+        entry = catalog.get(event_id)
+        if index is not None and entry is not None:
+            counts = index['counts']
+            entry.update(completed=counts.get('completed', 0), pending=counts.get('pending', 0),
+                         errors=counts.get('error', 0), file_state=self._file_state(event_id))
+        else:
+            entry = self._catalog_entry(event_id)
+            if entry is None:
+                return
+            catalog[event_id] = entry
+            self._uncataloged.discard(event_id)
+        self._save_catalog()
+        self._catalog_dir_mtime = os.stat(self.base_dir).st_mtime_ns
+    
+    def get_event_summary(self, event_id: str) -> Dict:
+        """Get summary of an event's scraping status (from the event catalog)
+        
+        Args:
+            event_id: Event identifier
+            
+        Returns:
+            Summary dictionary
+        """
+        with self._lock:
+            entry = self._validated_catalog().get(event_id)
+            if entry is None:
+                return {'error': 'Event not found'}
+            return {field: entry[field] for field in SUMMARY_FIELDS}
+    
     def list_events(self) -> List[Dict]:
-        """List all saved events
+        """List all saved events (from the event catalog)
         
         Returns:
             List of event summaries
         """
-        events = []
-        
         if not os.path.exists(self.base_dir):
-            return events
-        
-        for event_id in os.listdir(self.base_dir):
-            event_path = os.path.join(self.base_dir, event_id)
-            if os.path.isdir(event_path):
-                summary = self.get_event_summary(event_id)
-                if 'error' not in summary:
-                    events.append(summary)
+            return []
         
+        with self._lock:
+            events = [{field: entry[field] for field in SUMMARY_FIELDS}
+                      for entry in self._validated_catalog().values()]
         return sorted(events, key=lambda x: x['created_at'], reverse=True)
+
+def _latest_file(directory: str, extension: str) -> Optional[str]:
+    """Newest matches_<timestamp><extension> file name in a directory (None if there is none)"""
+    if not os.path.isdir(directory):
+        return None
+    names = [f for f in os.listdir(directory) if f.startswith('matches_') and f.endswith(extension)]
+    return sorted(names)[-1] if names else None
+
+
+def _legacy_raw_files(raw_dir: str) -> Dict[str, List[tuple]]:
+    """Timestamped raw files saved before the archive: {kind: [(timestamp, file name), ...] oldest first}"""
+    if not os.path.isdir(raw_dir):
+        return {}
+    legacy = {}
+    for name in sorted(os.listdir(raw_dir)):
+        for kind in RAW_KINDS:
+            prefix = kind + '_'
+            if name.startswith(prefix) and name.endswith('.json'):
+                legacy.setdefault(kind, []).append((name[len(prefix):-len('.json')], name))
+    return legacy
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) not in (2, 3) or sys.argv[1] != 'compact':
+        print("Usage: python event_data_manager.py compact [event_data_dir]")
+        sys.exit(1)
+
+    manager = EventDataManager(sys.argv[2] if len(sys.argv) == 3 else "event_data")
+    result = manager.compact_archive()
+    print(f"Compacted {result['events']} events: {result['migrated_files']} legacy files archived, "
+          f"{result['dropped_versions']} versions dropped, {result['deleted_objects']} objects deleted "
+          f"({result['freed_bytes']} bytes freed, {result['archive_bytes']} bytes in the archive)")
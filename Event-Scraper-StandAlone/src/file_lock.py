@@ -0,0 +1,91 @@
+"""
+File Lock - Advisory cross-process lock on a lock file
+Uses fcntl.flock on POSIX and msvcrt.locking on Windows, for files shared by
+several server processes (e.g. gunicorn workers)
+"""
+
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    def __init__(self, path: str):
+        """Lock bound to a lock file (created on first acquire)
+
+        Args:
+            path: Path of the lock file
+        """
+        self.path = path
+        self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        """True while this object holds the lock"""
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True, shared: bool = False) -> bool:
+        """Take the lock
+
+        Args:
+            blocking: Wait until the lock is free (otherwise return False at once)
+            shared: Shared (reader) lock; exclusive otherwise. Windows only has
+                exclusive locks, so shared falls back to exclusive there.
+
+        Returns:
+            True if the lock was acquired
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"{self.path} is already locked by this FileLock")
+
+        lock_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(lock_dir, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                fcntl.flock(fd, flags if blocking else flags | fcntl.LOCK_NB)
+            else:
+                # msvcrt.LK_LOCK gives up after 10 s, so poll with the non-blocking mode instead
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.05)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+
+        self._fd = fd
+        return True
+
+    def release(self):
+        """Release the lock (no-op if not held)"""
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,408 @@
+"""
+HTTP Cache - On-disk, content-addressed cache for DartConnect responses
+Bodies are stored gzipped under their SHA-256, an index maps each request to
+its body plus validators (ETag/Last-Modified). Freshness is set per URL class:
+completed match recaps never change, live event listings expire quickly.
+Processes sharing the directory (gunicorn workers) update the index under a
+lock file, merged with what the others wrote, and reload it when it changes.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from file_lock import FileLock
+from serializer import JSONDecodeError, dumps, load_file, loads
+
+# TTL meaning "never expires"
+IMMUTABLE = None
+
+# (URL pattern, TTL seconds) - first match wins
+DEFAULT_TTL_RULES: List[Tuple[str, Optional[float]]] = [
+    # Completed match recaps and their tab payloads
+    (r'^https?://recap\.dartconnect\.com/(matches|counts|players|games)/', IMMUTABLE),
+    # Event match listings grow while an event is live
+    (r'^https?://tv\.dartconnect\.com/api/event/[^/]+/matches', 60),
+    (r'^https?://tv\.dartconnect\.com/(event|eventmenu)/', 300),
+]
+
+DEFAULT_CACHE_DIR = 'data/http_cache'
+
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response"""
+
+
+class CachedHTTPResponse:
+    """A stored response with the parts of the requests.Response API the scraper uses"""
+
+    from_cache = True
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str], encoding: str = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_mb: float = 200, offline: bool = False,
+                 ttl_rules: List[Tuple[str, Optional[float]]] = None, default_ttl: float = 0):
+        """Open (or create) the cache directory
+
+        Args:
+            cache_dir: Directory holding index.json and the bodies/ store
+            max_size_mb: Size bound for stored bodies; least recently used entries are evicted
+            offline: Replay mode - serve only from the cache, never touch the network
+            ttl_rules: (URL regex, TTL seconds or IMMUTABLE) pairs, first match wins
+            default_ttl: TTL for URLs no rule matches (0 = always revalidate)
+        """
+        self.cache_dir = cache_dir
+        self.bodies_dir = os.path.join(cache_dir, 'bodies')
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.offline = offline
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.default_ttl = default_ttl
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        # Held (after _lock) while the index is read-modified-written, across processes
+        self._file_lock = FileLock(self.index_file + '.lock')
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_stamp = None  # (mtime_ns, size) of index.json when last read or written
+        self._dirty = False
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stale_served': 0, 'evictions': 0}
+
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self._load_index()
+        # Save the access times of cache hits on exit too, so LRU eviction sees read-only use
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Index and body storage
+    # ------------------------------------------------------------------
+
+    def _index_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.index_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_index_file(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            return load_file(self.index_file)
+        except (JSONDecodeError, OSError) as e:
+            self.logger.warning(f"HTTP cache index unreadable, starting empty: {e}")
+            return {}
+
+    def _load_index(self):
+        self._index_stamp = self._index_stat()
+        self._index = self._read_index_file()
+
+    def _refresh(self):
+        """Reload the index if another process rewrote it (call with _lock held)
+
+        Entries stored or dropped elsewhere win; access times recorded here
+        but not yet saved are kept so LRU eviction still sees them.
+        """
+        stamp = self._index_stat()
+        if stamp == self._index_stamp:
+            return
+        disk = self._read_index_file()
+        for key, entry in disk.items():
+            mine = self._index.get(key)
+            if mine is not None and mine['sha256'] == entry['sha256']:
+                entry['last_access'] = max(entry['last_access'], mine['last_access'])
+        self._index = disk
+        self._index_stamp = stamp
+
+    def _save_index(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.index_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dumps(self._index, pretty=False))
+            os.replace(tmp_path, self.index_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._index_stamp = self._index_stat()
+        self._dirty = False
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.bodies_dir, digest[:2], digest + '.gz')
+
+    def _write_body(self, content: bytes) -> Tuple[str, int]:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content))
+            os.replace(tmp_path, path)
+        return digest, os.path.getsize(path)
+
+    def _read_body(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(digest), 'rb') as f:
+                return gzip.decompress(f.read())
+        except (OSError, EOFError):
+            return None
+
+    @staticmethod
+    def _key(method: str, url: str, body: Any = None) -> str:
+        raw = f"{method.upper()} {url}"
+        if body is not None:
+            raw += ' ' + (body if isinstance(body, str) else json.dumps(body, sort_keys=True, default=str))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """TTL in seconds for a URL (IMMUTABLE = never expires)"""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        ttl = entry.get('ttl')
+        return ttl is IMMUTABLE or time.time() < entry['fetched_at'] + ttl
+
+    def _response_from(self, entry: Dict[str, Any]) -> Optional[CachedHTTPResponse]:
+        content = self._read_body(entry['sha256'])
+        if content is None:
+            return None
+        entry['last_access'] = time.time()
+        self._dirty = True
+        return CachedHTTPResponse(entry['url'], entry['status'], content, entry.get('headers'), entry.get('encoding'))
+
+    def _store(self, key: str, url: str, status_code: int, content: bytes, headers, encoding: str = None) -> None:
+        """Add an index entry and save the index (callers hold _lock and _file_lock, index refreshed)"""
+        digest, size = self._write_body(content)
+        now = time.time()
+        self._index[key] = {
+            'url': url,
+            'sha256': digest,
+            'size': size,
+            'status': status_code,
+            'headers': {k: v for k, v in headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')},
+            'encoding': encoding,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'ttl': self.ttl_for(url),
+            'fetched_at': now,
+            'last_access': now
+        }
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until stored bodies fit max_bytes"""
+        sizes = {entry['sha256']: entry['size'] for entry in self._index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if self._drop(key):
+                total -= sizes[entry['sha256']]
+                self.stats['evictions'] += 1
+
+    def _drop(self, key: str) -> bool:
+        """Remove an index entry; returns True if its body file was deleted too"""
+        entry = self._index.pop(key)
+        digest = entry['sha256']
+        if any(e['sha256'] == digest for e in self._index.values()):
+            return False
+        try:
+            os.remove(self._body_path(digest))
+        except OSError:
+            pass
+        return True
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lookup(self, method: str, url: str, body: Any = None,
+               revalidate: bool = False) -> Tuple[Optional[CachedHTTPResponse], Dict[str, str]]:
+        """First half of a cached request (for callers using their own HTTP client)
+
+        Args:
+            revalidate: Treat a fresh entry as stale (offline mode still serves it)
+
+        Returns:
+            (fresh cached response or None, conditional headers to send with the request)
+
+        Raises:
+            OfflineCacheMiss: in offline mode when nothing is cached for the request
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(self._key(method, url, body))
+            if entry and (self.offline or (not revalidate and self._is_fresh(entry))):
+                cached = self._response_from(entry)
+                if cached is not None:
+                    self.stats['hits'] += 1
+                    return cached, {}
+
+        if self.offline:
+            raise OfflineCacheMiss(f"{method.upper()} {url} is not in the HTTP cache")
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return None, headers
+
+    def record(self, method: str, url: str, status_code: int, content: bytes, headers, encoding: str = None,
+               body: Any = None) -> Optional[CachedHTTPResponse]:
+        """Second half: store a network response (only 200s are kept)
+
+        Returns:
+            The cached copy when the server answered 304 Not Modified, else None
+        """
+        key = self._key(method, url, body)
+        with self._lock, self._file_lock:
+            self._refresh()
+            entry = self._index.get(key)
+            if status_code == 304 and entry:
+                entry['fetched_at'] = time.time()
+                cached = self._response_from(entry)
+                if cached is not None:
+                    self.stats['revalidated'] += 1
+                    self._save_index()
+                    return cached
+
+            self.stats['misses'] += 1
+            if status_code == 200:
+                self._store(key, url, status_code, content, headers, encoding)
+        return None
+
+    def stale(self, method: str, url: str, body: Any = None) -> Optional[CachedHTTPResponse]:
+        """Any cached copy regardless of age (used when the network fails)"""
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(self._key(method, url, body))
+            cached = self._response_from(entry) if entry else None
+            if cached is not None:
+                self.stats['stale_served'] += 1
+            return cached
+
+    def request(self, session: requests.Session, method: str, url: str, on_network=None, revalidate: bool = False,
+                **kwargs):
+        """Perform a request through the cache
+
+        Fresh entries are served from disk; stale ones are revalidated with
+        If-None-Match/If-Modified-Since; only 200 responses are stored.
+
+        Args:
+            session: requests.Session (or module) used for network requests
+            method: HTTP method
+            url: Request URL
+            on_network: Optional callback(url) run right before a real request (e.g. rate limiting)
+            revalidate: Ask the server even if the cached copy is still fresh (a 304 still costs no body)
+            **kwargs: Passed to session.request
+
+        Returns:
+            A requests.Response or CachedHTTPResponse (check .from_cache)
+
+        Raises:
+            OfflineCacheMiss: in offline mode when nothing is cached for the request
+        """
+        body = kwargs.get('data', kwargs.get('json'))
+        cached, conditional = self.lookup(method, url, body, revalidate)
+        if cached is not None:
+            return cached
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(conditional)
+
+        if on_network:
+            on_network(url)
+        try:
+            response = session.request(method, url, headers=headers, **kwargs)
+        except requests.RequestException as e:
+            cached = self.stale(method, url, body)
+            if cached is None:
+                raise
+            self.logger.warning(f"Network error for {url}, serving stale cached copy: {e}")
+            return cached
+
+        cached = self.record(method, url, response.status_code, response.content, response.headers,
+                             response.encoding, body)
+        if cached is not None:
+            return cached
+
+        response.from_cache = False
+        return response
+
+    def get(self, session: requests.Session, url: str, on_network=None, **kwargs):
+        """GET through the cache (see request())"""
+        return self.request(session, 'GET', url, on_network=on_network, **kwargs)
+
+    def post(self, session: requests.Session, url: str, on_network=None, **kwargs):
+        """POST through the cache (see request())"""
+        return self.request(session, 'POST', url, on_network=on_network, **kwargs)
+
+    def invalidate(self, url: str, method: str = 'GET', body: Any = None) -> bool:
+        """Forget the cached response for a request
+        
+        Returns:
+            True if an entry was removed
+        """
+        key = self._key(method, url, body)
+        with self._lock, self._file_lock:
+            self._refresh()
+            if key not in self._index:
+                return False
+            self._drop(key)
+            self._save_index()
+            return True
+
+    def flush(self):
+        """Persist access times gathered since the last write (called after each
+        bulk, async or tail run and at exit)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            with self._file_lock:
+                self._refresh()
+                self._save_index()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum({entry['sha256']: entry['size'] for entry in self._index.values()}.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
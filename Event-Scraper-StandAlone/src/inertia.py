@@ -0,0 +1,73 @@
+"""
+Inertia Payload Extractor - Pulls the data-page JSON out of a DartConnect page
+DartConnect (Laravel + Inertia.js) renders the whole page state into the
+data-page attribute of <div id="app">. Scanning for that one attribute is
+much cheaper than building a DOM; BeautifulSoup is only the fallback.
+"""
+
+import html
+import json
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# An opening tag carrying a data-page attribute, quoted with " or '.
+# Attribute values are entity-escaped, so the quote character cannot occur inside.
+_DATA_PAGE_TAG = re.compile(
+    r'''<div\b([^>]*?)\sdata-page\s*=\s*(?:"([^"]*)"|'([^']*)')([^>]*)>''',
+    re.IGNORECASE
+)
+_APP_ID = re.compile(r'''\sid\s*=\s*(?:"app"|'app'|app\b)''', re.IGNORECASE)
+
+
+def _unescape_attribute(value: str) -> str:
+    """html.unescape, with a fast path for the entities Laravel/browsers emit"""
+    if '&' not in value:
+        return value
+    text = (value.replace('&quot;', '"').replace('&#039;', "'").replace('&#39;', "'")
+            .replace('&lt;', '<').replace('&gt;', '>'))
+    if text.count('&') == text.count('&amp;'):
+        return text.replace('&amp;', '&')
+    # Other named/numeric entities present: use the full decoder
+    return html.unescape(value)
+
+
+def extract_data_page(page_source: str) -> Optional[Dict[str, Any]]:
+    """Return the Inertia page object from <div id="app" data-page=...>, if present
+
+    Args:
+        page_source: Page HTML (server-rendered or a browser's page_source)
+
+    Returns:
+        Parsed page object, or None when the page has no (valid) payload
+    """
+    if not page_source or 'data-page' not in page_source:
+        return None
+
+    for tag in _DATA_PAGE_TAG.finditer(page_source):
+        if not _APP_ID.search(tag.group(1) + ' ' + tag.group(4)):
+            continue
+        raw = tag.group(2) if tag.group(2) is not None else tag.group(3)
+        try:
+            return json.loads(_unescape_attribute(raw))
+        except ValueError as e:
+            logger.debug(f"Could not parse Inertia data-page: {e}")
+            return None
+
+    # Unusual markup (e.g. unquoted attribute): let a real HTML parser try
+    return extract_data_page_soup(page_source)
+
+
+def extract_data_page_soup(page_source: str) -> Optional[Dict[str, Any]]:
+    """Reference implementation with BeautifulSoup (slow; fallback only)"""
+    try:
+        app_div = BeautifulSoup(page_source, 'html.parser').find('div', id='app')
+        if app_div and app_div.get('data-page'):
+            return json.loads(app_div['data-page'])
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Could not parse Inertia data-page: {e}")
+    return None
@@ -0,0 +1,403 @@
+"""
+Job Queue - Background execution of long-running scrapes
+Submitting a job returns its id at once; a pool of worker threads runs it
+and every progress message is recorded and pushed to subscribers (the SSE
+endpoint) as it happens. Jobs are persisted one file per job, so queued or
+interrupted work is picked up again after a restart. When several server
+processes share the jobs directory, the one holding the runner lock executes
+jobs and the others submit and read them through the files.
+"""
+
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from file_lock import FileLock
+from serializer import JSONDecodeError, dumps, load_file
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED)
+
+DEFAULT_JOBS_DIR = 'data/jobs'
+
+# handler(params, log_step) -> result dict; {'success': False, 'error': ...} marks the job failed
+JobHandler = Callable[[Dict[str, Any], Callable[[str], None]], Dict[str, Any]]
+
+
+class JobQueue:
+    def __init__(self, jobs_dir: str = DEFAULT_JOBS_DIR, workers: int = 2, keep_finished: int = 200,
+                 poll_interval: float = 1.0, log_flush_lines: int = 50, log_flush_seconds: float = 1.0):
+        """Load persisted jobs (workers are started by start())
+
+        Args:
+            jobs_dir: Directory holding one <job_id>.json file per job
+            workers: Number of jobs executed at the same time
+            keep_finished: Completed/failed jobs kept on disk (oldest are pruned)
+            poll_interval: Seconds between checks for jobs submitted by other processes
+            log_flush_lines: Progress lines buffered in memory before the job file is rewritten
+            log_flush_seconds: Longest time a progress line waits to reach the job file
+                (status changes are always written at once)
+        """
+        self.jobs_dir = jobs_dir
+        self.workers = max(1, workers)
+        self.keep_finished = keep_finished
+        self.poll_interval = poll_interval
+        self.log_flush_lines = max(1, log_flush_lines)
+        self.log_flush_seconds = log_flush_seconds
+        self.logger = logging.getLogger(__name__)
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._pending: "queue.Queue[Optional[str]]" = queue.Queue()
+        # Guards _jobs; notified on every log line and status change
+        self._changed = threading.Condition()
+        # job_id -> (log lines in the job file, monotonic time of the write) for running jobs
+        self._log_saved: Dict[str, Tuple[int, float]] = {}
+        self._threads: List[threading.Thread] = []
+        self._started = False
+        self._stopping = threading.Event()
+        # Held by the one process (of those sharing jobs_dir) that executes jobs
+        self._runner_lock = FileLock(os.path.join(jobs_dir, '.runner.lock'))
+
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self._load_jobs()
+
+    @property
+    def is_runner(self) -> bool:
+        """True if this process executes the jobs (others only submit and read them)"""
+        return self._runner_lock.locked
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _load_jobs(self):
+        for filename in os.listdir(self.jobs_dir):
+            if filename.endswith('.json'):
+                self._load_job(filename[:-len('.json')])
+
+    def _load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """(Re)read one job file into memory (call with _changed held, or before start)"""
+        try:
+            job = load_file(self._job_path(job_id))
+            self._jobs[job['id']] = job
+            return job
+        except FileNotFoundError:
+            self._jobs.pop(job_id, None)
+        except (JSONDecodeError, OSError, KeyError) as e:
+            self.logger.warning(f"Skipping unreadable job file {job_id}.json: {e}")
+        return None
+
+    def _sync_from_disk(self, job_id: str = None):
+        """Refresh jobs written by the runner process (all jobs when job_id is None)"""
+        with self._changed:
+            if job_id is not None:
+                self._load_job(job_id)
+                return
+            on_disk = {filename[:-len('.json')] for filename in os.listdir(self.jobs_dir)
+                       if filename.endswith('.json')}
+            for known in set(self._jobs) - on_disk:
+                del self._jobs[known]
+            for disk_id in on_disk:
+                self._load_job(disk_id)
+
+    def _save(self, job: Dict[str, Any]):
+        """Write a job record atomically (call with _changed held)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.jobs_dir, prefix='.job_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dumps(job, pretty=False))
+            os.replace(tmp_path, self._job_path(job['id']))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if job['status'] == JOB_RUNNING:
+            self._log_saved[job['id']] = (len(job['log']), time.monotonic())
+        else:
+            self._log_saved.pop(job['id'], None)
+
+    def _flush_logs(self, force: bool = False):
+        """Write running jobs whose buffered log lines are due (call with _changed held)"""
+        now = time.monotonic()
+        for job_id, (saved_lines, saved_at) in list(self._log_saved.items()):
+            job = self._jobs.get(job_id)
+            if job is None:
+                del self._log_saved[job_id]
+                continue
+            unsaved = len(job['log']) - saved_lines
+            if unsaved > 0 and (force or unsaved >= self.log_flush_lines
+                                or now - saved_at >= self.log_flush_seconds):
+                self._save(job)
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond keep_finished (call with _changed held)"""
+        finished = sorted((job for job in self._jobs.values() if job['status'] in FINISHED_STATES),
+                          key=lambda job: job['created_at'])
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job['id']]
+            try:
+                os.remove(self._job_path(job['id']))
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def register(self, job_type: str, handler: JobHandler):
+        """Register the function that executes jobs of a type"""
+        self._handlers[job_type] = handler
+
+    def start(self):
+        """Start executing jobs, or stand by if another process already does (idempotent)"""
+        with self._changed:
+            if self._started:
+                return
+            self._started = True
+
+        if self._runner_lock.acquire(blocking=False):
+            self._become_runner()
+        else:
+            self.logger.info("Another process is running jobs; this one submits and follows them")
+        threading.Thread(target=self._watch, name='job-watcher', daemon=True).start()
+
+    def _become_runner(self):
+        """Re-queue work left over from the last run and start the worker pool"""
+        self._sync_from_disk()
+        with self._changed:
+            resumed = []
+            for job in sorted(self._jobs.values(), key=lambda job: job['created_at']):
+                if job['status'] == JOB_RUNNING:
+                    # The process stopped while this job ran; run it again from the start
+                    job['status'] = JOB_QUEUED
+                    job['log'].append("Server restarted - job re-queued")
+                    self._save(job)
+                if job['status'] == JOB_QUEUED:
+                    self._pending.put(job['id'])
+                    resumed.append(job['id'])
+            self._prune()
+
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+        if resumed:
+            self.logger.info(f"Resumed {len(resumed)} queued job(s): {', '.join(resumed)}")
+
+    def _watch(self):
+        """Runner: pick up jobs other processes submitted. Standby: take over if the runner exits."""
+        while not self._stopping.wait(self.poll_interval):
+            if self.is_runner:
+                with self._changed:
+                    # Lines logged just before a long quiet step still reach other processes
+                    self._flush_logs()
+                    new_ids = [filename[:-len('.json')] for filename in os.listdir(self.jobs_dir)
+                               if filename.endswith('.json') and filename[:-len('.json')] not in self._jobs]
+                    for job_id in new_ids:
+                        job = self._load_job(job_id)
+                        if job is not None and job['status'] == JOB_QUEUED:
+                            self._pending.put(job_id)
+            elif self._runner_lock.acquire(blocking=False):
+                self.logger.info("Job runner lock acquired; this process now runs jobs")
+                self._become_runner()
+
+    def stop(self, timeout: float = None):
+        """Let the workers finish their current job and exit"""
+        self._stopping.set()
+        for _ in self._threads:
+            self._pending.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._changed:
+            self._flush_logs(force=True)
+        self._runner_lock.release()
+
+    def _work(self):
+        while True:
+            job_id = self._pending.get()
+            if job_id is None:
+                return
+            self._run(job_id)
+
+    def _run(self, job_id: str):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != JOB_QUEUED:
+                return
+            job['status'] = JOB_RUNNING
+            job['started_at'] = datetime.now().isoformat()
+            job['attempts'] = job.get('attempts', 0) + 1
+            self._save(job)
+            self._changed.notify_all()
+
+        handler = self._handlers.get(job['type'])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job type '{job['type']}'")
+            result = handler(job['params'], lambda message: self._log(job_id, message)) or {}
+            error = None if result.get('success', True) else result.get('error', 'Job failed')
+        except Exception as e:
+            self.logger.error(f"Job {job_id} ({job['type']}) failed: {e}", exc_info=True)
+            result, error = None, str(e)
+
+        with self._changed:
+            job['status'] = JOB_FAILED if error else JOB_COMPLETED
+            job['result'] = result
+            job['error'] = error
+            job['finished_at'] = datetime.now().isoformat()
+            self._save(job)
+            self._prune()
+            self._changed.notify_all()
+
+    def _log(self, job_id: str, message: str):
+        """Record a progress line; subscribers in this process see it at once, while the
+        job file is rewritten at most every log_flush_lines lines or log_flush_seconds"""
+        with self._changed:
+            job = self._jobs[job_id]
+            job['log'].append(message)
+            saved_lines, saved_at = self._log_saved.get(job_id, (0, 0.0))
+            if (len(job['log']) - saved_lines >= self.log_flush_lines
+                    or time.monotonic() - saved_at >= self.log_flush_seconds):
+                self._save(job)
+            self._changed.notify_all()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> str:
+        """Queue a job
+
+        Args:
+            job_type: A registered job type
+            params: JSON-serializable arguments for the handler
+
+        Returns:
+            The new job id
+
+        Raises:
+            ValueError: if the job type is unknown
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type '{job_type}'")
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'type': job_type,
+            'params': params,
+            'status': JOB_QUEUED,
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'attempts': 0,
+            'log': [],
+            'result': None,
+            'error': None
+        }
+        self.start()
+        with self._changed:
+            self._jobs[job['id']] = job
+            self._save(job)
+        if self.is_runner:
+            self._pending.put(job['id'])
+        self.logger.info(f"Queued {job_type} job {job['id']}")
+        return job['id']
+
+    def get(self, job_id: str, include_log: bool = True) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job record (None if unknown)"""
+        if not self.is_runner:
+            self._sync_from_disk(job_id)
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if key != 'log'}
+            snapshot['log_lines'] = len(job['log'])
+            if include_log:
+                snapshot['log'] = list(job['log'])
+            if snapshot['status'] == JOB_QUEUED:
+                snapshot['queue_position'] = self._queue_position(job)
+            return snapshot
+
+    def _queue_position(self, job: Dict[str, Any]) -> int:
+        return sum(1 for other in self._jobs.values()
+                   if other['status'] == JOB_QUEUED and other['created_at'] < job['created_at']) + 1
+
+    def list_jobs(self, status: str = None) -> List[Dict[str, Any]]:
+        """Job summaries (without logs and results), newest first"""
+        if not self.is_runner:
+            self._sync_from_disk()
+        with self._changed:
+            jobs = [job for job in self._jobs.values() if status is None or job['status'] == status]
+            jobs.sort(key=lambda job: job['created_at'], reverse=True)
+            return [{key: job[key] for key in ('id', 'type', 'status', 'created_at', 'started_at',
+                                               'finished_at', 'error')} for job in jobs]
+
+    def stream(self, job_id: str, start: int = 0, heartbeat_seconds: float = 15) -> Iterator[Tuple[str, Any, Any]]:
+        """Follow a job's progress until it finishes
+
+        Args:
+            job_id: Job to follow
+            start: Index of the first log line wanted (lines before it are skipped)
+            heartbeat_seconds: Yield a heartbeat when nothing happened for this long
+
+        Yields:
+            ('log', index, message) for each log line, ('heartbeat', None, None)
+            while waiting, and finally ('done', None, job snapshot without log)
+        """
+        index = max(0, start)
+        idle_since = time.monotonic()
+        while True:
+            # Jobs run by another process are followed by re-reading their file
+            remote = not self.is_runner
+            if remote:
+                self._sync_from_disk(job_id)
+            with self._changed:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if not remote and index >= len(job['log']) and job['status'] not in FINISHED_STATES:
+                    self._changed.wait(heartbeat_seconds)
+                lines = job['log'][index:]
+                finished = job['status'] in FINISHED_STATES
+
+            for line in lines:
+                yield 'log', index, line
+                index += 1
+
+            if finished:
+                yield 'done', None, self.get(job_id, include_log=False)
+                return
+            if lines:
+                idle_since = time.monotonic()
+                continue
+            if remote:
+                time.sleep(self.poll_interval)
+            if time.monotonic() - idle_since >= heartbeat_seconds:
+                yield 'heartbeat', None, None
+                idle_since = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._changed:
+            counts = {state: 0 for state in (JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED)}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'runner': self.is_runner, **counts}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
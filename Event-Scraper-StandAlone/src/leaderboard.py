@@ -0,0 +1,99 @@
+"""
+AADS Leaderboard Index - Incrementally maintained, always-sorted leaderboard
+Only players touched by a new match are re-keyed; rank lookups and top-N
+queries are binary searches instead of a full recompute and re-sort
+"""
+
+import bisect
+from typing import Dict, List, Any, Optional, Tuple
+
+# sortedcontainers gives O(log n) inserts/removes; fall back to a bisect list
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+class _BisectList:
+    """Minimal SortedList stand-in backed by a plain list and bisect"""
+
+    def __init__(self):
+        self._items = []
+
+    def add(self, item):
+        bisect.insort(self._items, item)
+
+    def remove(self, item):
+        idx = bisect.bisect_left(self._items, item)
+        if idx < len(self._items) and self._items[idx] == item:
+            del self._items[idx]
+        else:
+            raise ValueError(f"{item!r} not in list")
+
+    def bisect_left(self, item) -> int:
+        return bisect.bisect_left(self._items, item)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class LeaderboardIndex:
+    """Leaderboard rows kept sorted by (-total_average, -events_played)
+
+    Ties keep the order in which players first appeared, matching the
+    stable sort the full recompute used.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._keys = SortedList() if SortedList is not None else _BisectList()
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._key_of: Dict[str, Tuple] = {}
+        self._seq: Dict[str, int] = {}
+
+    def rebuild(self, rows: List[Dict[str, Any]]):
+        """Replace the index contents with the given leaderboard rows"""
+        self._reset()
+        for row in rows:
+            self.update(row)
+
+    def update(self, row: Dict[str, Any]):
+        """Insert or re-key one player's leaderboard row"""
+        name = row['name']
+        old_key = self._key_of.get(name)
+        if old_key is not None:
+            self._keys.remove(old_key)
+
+        seq = self._seq.setdefault(name, len(self._seq))
+        key = (-row['total_average'], -row['events_played'], seq, name)
+        self._keys.add(key)
+        self._key_of[name] = key
+        self._rows[name] = row
+
+    def rank(self, name: str) -> Optional[int]:
+        """1-based rank of a player, or None if unknown"""
+        key = self._key_of.get(name)
+        if key is None:
+            return None
+        return self._keys.bisect_left(key) + 1
+
+    def top(self, n: int = None) -> List[Dict[str, Any]]:
+        """Top-N rows (all rows if n is None), copied and ranked"""
+        keys = self._keys[:n] if n is not None else list(self._keys)
+        result = []
+        for i, key in enumerate(keys, 1):
+            row = dict(self._rows[key[3]])
+            row['rank'] = i
+            result.append(row)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -0,0 +1,213 @@
+"""
+Live Tail - Follow a running event and pick up each match as it completes
+The event matches API is polled directly (no browser) on an adaptive
+interval: short while results are coming in, backing off while the event is
+quiet. Completed match ids (mi) are diffed against a per-event cursor and
+only the new matches are saved and handed on for recap scraping; the cursor
+lives beside the event's data, so a restarted tail carries on where it stopped.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from database_manager import match_id_from_url
+from scraper import api_event_matches
+from serializer import JSONDecodeError, dumps, load_file
+
+TAIL_CURSOR = 'tail_cursor.json'
+TAIL_STOP = 'tail.stop'  # touched to ask a running tail (in any process) to stop
+
+
+def tail_cursor_path(event_data_dir: str, event_id: str) -> str:
+    return os.path.join(event_data_dir, event_id, TAIL_CURSOR)
+
+
+def load_tail_cursor(event_data_dir: str, event_id: str) -> Optional[Dict[str, Any]]:
+    """An event's tail cursor (None if the event was never tailed)"""
+    try:
+        return load_file(tail_cursor_path(event_data_dir, event_id))
+    except (JSONDecodeError, OSError):
+        return None
+
+
+def request_tail_stop(event_data_dir: str, event_id: str):
+    """Ask the event's tail (running or queued) to stop after its current poll"""
+    event_dir = os.path.join(event_data_dir, event_id)
+    os.makedirs(event_dir, exist_ok=True)
+    with open(os.path.join(event_dir, TAIL_STOP), 'w', encoding='utf-8') as f:
+        f.write(datetime.now().isoformat())
+
+
+class EventTailer:
+    def __init__(self, scraper, event_manager, event_id: str,
+                 on_new_matches: Callable[[List[Dict[str, Any]]], Any] = None, event_number: int = None,
+                 min_interval: float = 5.0, max_interval: float = 30.0, backoff: float = 1.5,
+                 idle_timeout: float = 2 * 3600):
+        """Set up a tail of one event (the cursor is loaded from disk if present)
+
+        Args:
+            scraper: DartConnectScraper used for the API requests
+            event_manager: EventDataManager the new matches are saved to
+            event_id: DartConnect event id
+            on_new_matches: Called with the newly completed matches (after they are
+                saved, before the cursor moves past them)
+            event_number: Optional AADS event number recorded with the matches
+            min_interval: Seconds between polls while matches keep completing
+            max_interval: Longest wait between polls while the event is quiet
+            backoff: Interval growth factor per poll without new matches
+            idle_timeout: Stop after this many seconds without a new match
+        """
+        self.scraper = scraper
+        self.event_manager = event_manager
+        self.event_id = event_id
+        self.on_new_matches = on_new_matches
+        self.event_number = event_number
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.idle_timeout = idle_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.event_dir = os.path.join(event_manager.base_dir, event_id)
+        self.interval = min_interval
+        self._stop = threading.Event()
+        self._synced = False  # a full match list was processed by this tailer
+        self.cursor = load_tail_cursor(event_manager.base_dir, event_id) or {
+            'event_id': event_id,
+            'seen': [],
+            'polls': 0,
+            'new_matches': 0,
+            'last_poll': None,
+            'last_change': None
+        }
+        self._seen = set(self.cursor['seen'])
+
+    def _save_cursor(self):
+        os.makedirs(self.event_dir, exist_ok=True)
+        self.cursor['interval'] = self.interval
+        fd, tmp_path = tempfile.mkstemp(dir=self.event_dir, prefix='.tail_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dumps(self.cursor))
+            os.replace(tmp_path, os.path.join(self.event_dir, TAIL_CURSOR))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def poll(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the event's match list once and process the newly completed matches
+
+        Returns:
+            The new matches (empty if none), or None if the API could not be read
+        """
+        response = self.scraper.fetch_event_matches_api(self.event_id, revalidate=True)
+        self.cursor['polls'] += 1
+        self.cursor['last_poll'] = datetime.now().isoformat()
+        if response.status_code != 200:
+            self.logger.warning(f"Tail {self.event_id}: matches API answered {response.status_code}")
+            return None
+
+        new_matches = []
+        # Once a full list was processed here, a 304 (served from the HTTP cache) means nothing changed
+        if not (self._synced and getattr(response, 'from_cache', False)):
+            api_data = response.json()
+            matches = api_event_matches(self.event_id, api_data)
+            new_matches = [match for match in matches if match_id_from_url(match['url']) not in self._seen]
+            if new_matches:
+                # Saved first and handed on second: a crash before the cursor
+                # moves only means the same matches are offered again
+                self.event_manager.save_event_matches(self.event_id, matches, raw_api_response=api_data,
+                                                      event_number=self.event_number)
+                if self.on_new_matches:
+                    self.on_new_matches(new_matches)
+                for match in new_matches:
+                    match_id = match_id_from_url(match['url'])
+                    self._seen.add(match_id)
+                    self.cursor['seen'].append(match_id)
+                self.cursor['new_matches'] += len(new_matches)
+                self.cursor['last_change'] = self.cursor['last_poll']
+            self._synced = True
+        self._save_cursor()
+        return new_matches
+
+    def stop(self):
+        """Stop the tail running in this process after its current poll"""
+        self._stop.set()
+
+    def _stop_requested(self) -> bool:
+        return self._stop.is_set() or os.path.exists(os.path.join(self.event_dir, TAIL_STOP))
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep between polls, waking early for a stop request (returns True if one came)"""
+        deadline = time.monotonic() + seconds
+        while not self._stop_requested():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._stop.wait(min(remaining, 1.0))
+        return True
+
+    def run(self, log_step: Callable[[str], None] = None) -> Dict[str, Any]:
+        """Poll until stopped or idle for idle_timeout
+
+        Args:
+            log_step: Optional callable receiving a message per poll that found matches
+
+        Returns:
+            Summary: polls, new matches, matches seen so far and why the tail stopped
+        """
+        def log(message):
+            self.logger.info(message)
+            if log_step:
+                log_step(message)
+
+        log(f"Tailing {self.event_id} ({len(self._seen)} matches already seen)")
+        start = time.monotonic()
+        last_change = start
+        polls = found = 0
+        stopped = 'requested'
+        while not self._stop_requested():
+            try:
+                new_matches = self.poll()
+            except (requests.RequestException, ValueError) as e:
+                self.logger.warning(f"Tail {self.event_id}: poll failed: {e}")
+                new_matches = None
+            polls += 1
+
+            if new_matches:
+                found += len(new_matches)
+                last_change = time.monotonic()
+                self.interval = self.min_interval
+                log(f"✓ {len(new_matches)} new completed match(es): "
+                    + ', '.join(match['title'] for match in new_matches))
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+                if time.monotonic() - last_change >= self.idle_timeout:
+                    stopped = 'idle'
+                    break
+            if self._wait(self.interval):
+                break
+
+        if getattr(self.scraper, 'http_cache', None) is not None:
+            self.scraper.http_cache.flush()
+        stop_file = os.path.join(self.event_dir, TAIL_STOP)
+        if os.path.exists(stop_file):
+            os.remove(stop_file)
+        log(f"Tail of {self.event_id} stopped ({stopped}): {found} new matches in {polls} polls")
+        return {
+            'success': True,
+            'event_id': self.event_id,
+            'polls': polls,
+            'new_matches': found,
+            'matches_seen': len(self._seen),
+            'stopped': stopped,
+            'duration_seconds': round(time.monotonic() - start, 1)
+        }
@@ -0,0 +1,169 @@
+"""
+Match Log - Append-only JSONL log of per-match, per-player stat records
+The source of truth for the JSON stats store: AADSDataManager keeps the
+player aggregates as a projection of this log, so recording a match is one
+appended line and the whole series can be rebuilt in one streaming pass
+"""
+
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from serializer import dumps, loads
+
+# Record operations
+OP_ADD = 'add'          # one player's stats in one match
+OP_CORRECT = 'correct'  # replaces the stats of an earlier add (same match_id and player)
+OP_SCRAPED = 'scraped'  # dedup marker without stats (entries migrated from old databases)
+
+
+def match_log_path(db_file: str) -> str:
+    """Log file that belongs to a master database file (aads_master_db.json -> aads_master_db.matches.jsonl)"""
+    return os.path.splitext(db_file)[0] + '.matches.jsonl'
+
+
+class MatchLog:
+    def __init__(self, path: str):
+        """Append-only log stored as one JSON record per line
+
+        Records appended together (a batch) are written with one write and
+        read back all-or-nothing: the first carries 'batch': <count>, and an
+        incomplete batch or torn line at the end of the file (a crash
+        mid-append) is ignored until repair_tail() removes it.
+
+        Args:
+            path: Path of the .jsonl file (created on first append)
+        """
+        self.path = path
+
+    def size(self) -> int:
+        """Current end offset of the log in bytes"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Durably append records as one unit (caller holds the writer lock)
+
+        Args:
+            records: Records to append (the first one is tagged with the batch size)
+
+        Returns:
+            End offset of the log after the append
+        """
+        if len(records) > 1:
+            records[0] = {**records[0], 'batch': len(records)}
+        payload = b''.join(dumps(record, pretty=False) + b'\n' for record in records)
+
+        with open(self.path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def create(self, records: List[Dict[str, Any]]) -> int:
+        """Write a new log holding records (atomically: a temp file renamed into place)
+
+        Returns:
+            End offset of the new log
+        """
+        return self.create_encoded(dumps(record, pretty=False) + b'\n' for record in records)
+
+    def create_encoded(self, chunks: Iterable[bytes]) -> int:
+        """create() for records already encoded as JSON lines (each chunk one or more whole lines)
+
+        Returns:
+            End offset of the new log
+        """
+        log_dir = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=log_dir, prefix='.match_log_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+                end_offset = f.tell()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return end_offset
+
+    def repair_tail(self, offset: int) -> bool:
+        """Make offset the end of the log again after an interrupted append
+
+        Only a torn line or an incomplete batch is cut off; anything else after
+        offset means records this process could not read, and is left alone.
+
+        Args:
+            offset: End of the last complete record (as yielded by read())
+
+        Returns:
+            True if the log now ends at offset
+        """
+        size = self.size()
+        if size <= offset:
+            return size == offset
+
+        with open(self.path, 'r+b') as f:
+            f.seek(offset)
+            complete_lines = f.read().split(b'\n')[:-1]
+            if complete_lines:
+                try:
+                    expected = loads(complete_lines[0]).get('batch', 1)
+                except ValueError:
+                    return False
+                if len(complete_lines) >= expected:
+                    return False
+            f.truncate(offset)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"Warning: removed an interrupted append ({size - offset} bytes) from the end of {self.path}")
+        return True
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Stream complete records from a byte offset
+
+        Args:
+            start: Offset to read from (0 or an offset previously yielded)
+            stop: Do not read records that start at or after this offset
+
+        Yields:
+            (record, end_offset) tuples. Records of a batch all carry the
+            offset after the batch, so any yielded offset is a safe
+            resume point.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            pending = []
+            expected = 0
+            for line in f:
+                if stop is not None and offset >= stop:
+                    return
+                if not line.endswith(b'\n'):
+                    return  # torn final line
+                try:
+                    record = loads(line)
+                except ValueError:
+                    print(f"Warning: unreadable record at offset {offset} of {self.path}; stopping there")
+                    return
+                offset += len(line)
+
+                if not pending:
+                    expected = record.pop('batch', 1)
+                pending.append(record)
+                if len(pending) == expected:
+                    for complete in pending:
+                        yield complete, offset
+                    pending = []
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for record, _ in self.read():
+            yield record
@@ -0,0 +1,120 @@
+"""
+Raw Archive - Content-addressed, gzip-compressed store for scraped payloads
+Each payload is stored once under the SHA-256 of its encoded JSON; events
+refer to their versions from a manifest, so saving a payload identical to
+one already stored costs a hash instead of a new file
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+from typing import IO, Any, Iterator, Tuple
+
+from serializer import dumps, loads
+
+
+class RawArchive:
+    def __init__(self, root: str):
+        """Open (or create on first write) an archive directory
+
+        Args:
+            root: Directory holding the objects (<root>/<2 hex>/<sha256>.json.gz)
+        """
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + '.json.gz')
+
+    def put(self, payload: Any) -> Tuple[str, int, bool]:
+        """Store a JSON payload unless an identical one is already stored
+
+        Returns:
+            (sha256 of the encoded JSON, its uncompressed size, True if a new object was written)
+        """
+        content = dumps(payload, pretty=False)
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.utime(path)  # fresh mtime: not an orphan to collect while its reference is written
+            return digest, len(content), False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # mtime=0 keeps the compressed bytes a function of the content alone
+                with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6, mtime=0) as gz:
+                    gz.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest, len(content), True
+
+    def open(self, digest: str, compressed: bool = False) -> IO[bytes]:
+        """Stream a stored payload
+
+        Args:
+            digest: SHA-256 returned by put()
+            compressed: Return the raw gzip bytes instead of decompressing as read
+                (e.g. to send with Content-Encoding: gzip)
+
+        Raises:
+            FileNotFoundError: If no such object is stored
+        """
+        if compressed:
+            return open(self._path(digest), 'rb')
+        return gzip.open(self._path(digest), 'rb')
+
+    def load(self, digest: str) -> Any:
+        """Decode a stored payload"""
+        with self.open(digest) as f:
+            return loads(f.read())
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def stored_size(self, digest: str) -> int:
+        """Compressed size of an object on disk (0 if missing)"""
+        try:
+            return os.path.getsize(self._path(digest))
+        except OSError:
+            return 0
+
+    def delete(self, digest: str, min_age: float = 0) -> int:
+        """Remove an object
+
+        Args:
+            digest: SHA-256 of the object
+            min_age: Keep the object if it was stored (or re-put) less than this many seconds ago
+
+        Returns:
+            Bytes freed (0 if nothing was deleted)
+        """
+        path = self._path(digest)
+        try:
+            st = os.stat(path)
+            if min_age and time.time() - st.st_mtime < min_age:
+                return 0
+            os.remove(path)
+        except OSError:
+            return 0
+        return st.st_size
+
+    def digests(self) -> Iterator[str]:
+        """Every stored object's SHA-256"""
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if os.path.isdir(prefix_dir):
+                for name in os.listdir(prefix_dir):
+                    if name.endswith('.json.gz'):
+                        yield name[:-len('.json.gz')]
+
+    def size_bytes(self) -> int:
+        """Total compressed size of the stored objects"""
+        return sum(self.stored_size(digest) for digest in self.digests())
@@ -0,0 +1,317 @@
+"""
+Recap Document - One fetched and parsed DartConnect match recap
+The page is fetched once and its Inertia payload parsed once; match result,
+set count, leg data and per-player stats are derived lazily from it, and
+documents are kept in an LRU cache so Stage 1 and Stage 2 share one fetch
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from database_manager import match_id_from_url
+from inertia import extract_data_page
+
+logger = logging.getLogger(__name__)
+
+
+def parse_stat_value(value_str: str) -> int:
+    """Parse a stat value that might have commas or dashes"""
+    if not value_str or value_str == '-':
+        return 0
+    # Remove commas
+    value_str = value_str.replace(',', '')
+    try:
+        return int(value_str)
+    except ValueError:
+        return 0
+
+
+def parse_leg_data(segments: Dict, opponents: List) -> Dict[int, Dict]:
+    """
+    Parse leg-by-leg data to extract detailed statistics like 180s, checkouts, etc.
+    Returns dict with player index as key and their aggregated leg stats.
+    """
+    player_stats = {}
+
+    # Initialize counters for each player
+    for player_idx in [0, 1]:
+        player_stats[player_idx] = {
+            'count_180s': 0,
+            'count_160_plus': 0,
+            'count_140_plus': 0,
+            'count_100_plus': 0,
+            'highest_finish': 0,
+            'double_attempts': 0,
+            'doubles_hit': 0,
+        }
+
+    try:
+        # Segments can be organized by segment name (e.g., '' for default)
+        for segment_name, segment_sets in segments.items():
+            if not segment_sets:
+                continue
+
+            # Each set contains legs
+            for leg_set in segment_sets:
+                if not isinstance(leg_set, list):
+                    continue
+
+                for leg in leg_set:
+                    # Extract home and away player data for this leg
+                    home_data = leg.get('home', {})
+                    away_data = leg.get('away', {})
+
+                    # Process both players
+                    for player_idx, player_data in enumerate([home_data, away_data]):
+                        if not player_data:
+                            continue
+
+                        ending_points = player_data.get('ending_points', 0)
+
+                        # Check for 100+ scores (approximate based on PPR)
+                        ppr = parse_stat_value(str(player_data.get('ppr', '0')))
+                        if ppr >= 60:  # High scoring leg
+                            player_stats[player_idx]['count_100_plus'] += 1
+                        if ppr >= 70:
+                            player_stats[player_idx]['count_140_plus'] += 1
+                        if ppr >= 80:
+                            player_stats[player_idx]['count_160_plus'] += 1
+                        if ppr >= 100:
+                            player_stats[player_idx]['count_180s'] += 1
+
+                        # Check for checkout (leg won)
+                        if player_data.get('win', False):
+                            double_out = player_data.get('double_out_points', 0)
+                            if double_out > 0:
+                                # Successful checkout
+                                player_stats[player_idx]['doubles_hit'] += 1
+                                if double_out > player_stats[player_idx]['highest_finish']:
+                                    player_stats[player_idx]['highest_finish'] = double_out
+
+                        # Count double attempts (any leg where player got close)
+                        if ending_points <= 170:  # Within checkout range
+                            player_stats[player_idx]['double_attempts'] += 1
+
+    except Exception as e:
+        logger.warning(f"Error parsing leg data: {e}")
+
+    return player_stats
+
+
+class RecapDocument:
+    def __init__(self, url: str = None, page_source: str = None, page_data: Dict[str, Any] = None,
+                 match_id: str = None):
+        """Wrap a recap page; everything else is computed on first access
+
+        Args:
+            url: Recap URL
+            page_source: Fetched HTML (parsed only if needed)
+            page_data: Inertia page object, when already extracted
+            match_id: Identifier recorded in the stats (defaults to the id in the URL)
+        """
+        self.url = url
+        self.page_source = page_source
+        self._page_data = page_data
+        self.match_id = match_id or (match_id_from_url(url) if url else None)
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """The page parsed once with BeautifulSoup (legacy HTML parsers only)"""
+        return BeautifulSoup(self.page_source or '', 'html.parser')
+
+    @cached_property
+    def page_data(self) -> Optional[Dict[str, Any]]:
+        """The Inertia.js page object from <div id="app" data-page=...>, if present"""
+        if self._page_data is not None:
+            return self._page_data
+        return extract_data_page(self.page_source)
+
+    @property
+    def props(self) -> Dict[str, Any]:
+        return (self.page_data or {}).get('props', {}) or {}
+
+    @property
+    def match_info(self) -> Dict[str, Any]:
+        return self.props.get('matchInfo', {}) or {}
+
+    @property
+    def opponents(self) -> List[Dict[str, Any]]:
+        return self.match_info.get('opponents', []) or []
+
+    @property
+    def has_match_data(self) -> bool:
+        """True when the payload holds a two-sided match"""
+        return len(self.opponents) >= 2
+
+    @cached_property
+    def leg_data(self) -> Dict[int, Dict]:
+        """Aggregated leg-by-leg stats per opponent index"""
+        return parse_leg_data(self.props.get('segments', {}) or {}, self.opponents)
+
+    @cached_property
+    def player_names(self) -> List[str]:
+        """Full player names (homePlayers/awayPlayers), falling back to opponent names"""
+        names = []
+        sides = [self.props.get('homePlayers', []), self.props.get('awayPlayers', [])]
+        for idx, opponent in enumerate(self.opponents[:2]):
+            name = opponent.get('name', '')
+            if sides[idx] and sides[idx][0].get('name'):
+                name = sides[idx][0]['name']
+            names.append(name)
+        return names
+
+    @cached_property
+    def match_result(self) -> Optional[Dict[str, Any]]:
+        """Player names, score and winner (None without Inertia match data)"""
+        if not self.has_match_data:
+            return None
+
+        home, away = self.opponents[0], self.opponents[1]
+        score1, score2 = home.get('score', 0), away.get('score', 0)
+        player1 = self.player_names[0] or 'Unknown'
+        player2 = self.player_names[1] or 'Unknown'
+
+        winner = 'Unknown'
+        if score1 > score2:
+            winner = player1
+        elif score2 > score1:
+            winner = player2
+
+        return {
+            'player1': player1,
+            'player2': player2,
+            'score': f"{score1}-{score2}",
+            'winner': winner
+        }
+
+    @cached_property
+    def sets_count(self) -> Optional[int]:
+        """Number of sets played (None without Inertia match data)"""
+        if not self.has_match_data:
+            return None
+        return int(self.match_info.get('total_sets', 1))
+
+    @cached_property
+    def _player_stats(self) -> List[Dict[str, Any]]:
+        if not self.has_match_data:
+            return []
+
+        opponents = self.opponents
+        match_info = self.match_info
+        total_legs = int(match_info.get('total_games', 0))
+        total_sets = int(match_info.get('total_sets', 1))
+        players_stats = []
+
+        for idx, opponent in enumerate(opponents):
+            player_name = self.player_names[idx] if idx < len(self.player_names) else opponent.get('name', '')
+            if not player_name:
+                logger.warning(f"Skipping opponent {idx} - no name found")
+                continue
+
+            player_leg_data = self.leg_data.get(idx, {})
+
+            # Calculate 3-dart average (DartConnect calls it PPR for 501 games)
+            ppr_str = opponent.get('ppr', '0')
+            try:
+                ppr_average = float(ppr_str) if ppr_str and ppr_str != '-' else 0.0
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Could not parse PPR value '{ppr_str}': {e}")
+                ppr_average = 0.0
+
+            # Match-level stats
+            legs_won = int(opponent.get('leg_wins', 0))
+            sets_won = int(opponent.get('set_wins', 0))
+            leg_win_percentage = (legs_won / total_legs * 100) if total_legs > 0 else 0
+
+            double_attempts = player_leg_data.get('double_attempts', 0)
+            doubles_hit = player_leg_data.get('doubles_hit', 0)
+            checkout_percentage = (doubles_hit / double_attempts * 100) if double_attempts > 0 else 0
+            other = opponents[1 - idx]
+
+            players_stats.append({
+                'player_name': player_name,
+                'match_id': self.match_id,
+                'three_dart_average': ppr_average,  # For 501: 3DA (3-dart average). For Cricket: PPR (points per round)
+
+                # Match stats
+                'matches_played': 1,  # Each recap = 1 match
+                'match_won': 1 if (opponent.get('score', 0) > other.get('score', 0)) else 0,
+                'match_score': f"{opponent.get('score', 0)}-{other.get('score', 0)}",
+
+                # Leg/Set stats
+                'legs_played': total_legs,
+                'legs_won': legs_won,
+                'legs_lost': total_legs - legs_won,
+                'leg_win_percentage': round(leg_win_percentage, 2),
+                'sets_played': total_sets,
+                'sets_won': sets_won,
+                'sets_lost': total_sets - sets_won,
+
+                # Score counts
+                'count_180s': player_leg_data.get('count_180s', 0),
+                'count_160_plus': player_leg_data.get('count_160_plus', 0),
+                'count_140_plus': player_leg_data.get('count_140_plus', 0),
+                'count_100_plus': player_leg_data.get('count_100_plus', 0),
+
+                # Checkout stats
+                'highest_finish': player_leg_data.get('highest_finish', 0),
+                'double_attempts': double_attempts,
+                'doubles_hit': doubles_hit,
+                'checkout_percentage': round(checkout_percentage, 2),
+
+                # Additional stats
+                'darts_thrown': parse_stat_value(opponent.get('darts_thrown_ppr', '0')),
+                'points_scored': parse_stat_value(opponent.get('points_scored_ppr', '0')),
+            })
+
+        return players_stats
+
+    @property
+    def player_stats(self) -> List[Dict[str, Any]]:
+        """Per-player match stats (fresh copies, safe for callers to modify)"""
+        return [dict(stats) for stats in self._player_stats]
+
+
+class RecapCache:
+    def __init__(self, max_size: int = 256):
+        """Thread-safe LRU cache of RecapDocuments keyed by match id
+
+        Args:
+            max_size: Number of documents kept (0 disables caching)
+        """
+        self.max_size = max_size
+        self._docs: "OrderedDict[str, RecapDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, match_id: str) -> Optional[RecapDocument]:
+        with self._lock:
+            doc = self._docs.get(match_id)
+            if doc is None:
+                self.stats['misses'] += 1
+                return None
+            self._docs.move_to_end(match_id)
+            self.stats['hits'] += 1
+            return doc
+
+    def put(self, doc: RecapDocument):
+        if self.max_size <= 0 or not doc.match_id:
+            return
+        with self._lock:
+            self._docs[doc.match_id] = doc
+            self._docs.move_to_end(doc.match_id)
+            while len(self._docs) > self.max_size:
+                self._docs.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+
+    def __len__(self) -> int:
+        return len(self._docs)
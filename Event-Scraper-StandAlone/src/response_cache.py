@@ -0,0 +1,73 @@
+"""
+Response Cache - Pre-serialized API responses keyed on data-version counters
+Polling endpoints re-encode only when the underlying store changed; the
+encoded bytes, their gzip form and an ETag are reused until then
+"""
+
+import gzip
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from serializer import dumps
+
+
+class CachedResponse:
+    """Encoded JSON body plus its ETag and (lazily) gzip-compressed form"""
+
+    def __init__(self, body: bytes, version: Any):
+        self.body = body
+        self.version = version
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self._gzip_body = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=6)
+        return self._gzip_body
+
+
+class ResponseCache:
+    def __init__(self, encoder: Callable[[Any], bytes] = None, max_entries: int = 256):
+        """Initialize an empty cache
+
+        Args:
+            encoder: Function turning a payload into bytes (compact JSON by default)
+            max_entries: Slots kept before the least recently built one is dropped
+                (query endpoints use one slot per distinct query)
+        """
+        self.encoder = encoder or (lambda payload: dumps(payload, pretty=False))
+        self.max_entries = max_entries
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: Any, build: Callable[[], Any]) -> CachedResponse:
+        """Return the cached response for key, rebuilding it if version changed
+
+        Args:
+            key: Cache slot name (e.g. 'stats')
+            version: Current data version; any change invalidates the slot
+            build: Produces the payload when the slot is missing or stale
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                entry = CachedResponse(self.encoder(build()), version)
+                self._entries.pop(key, None)
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            return entry
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one slot, or everything if key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,110 @@
+"""
+Reader-Writer Lock - Many concurrent readers or one writer
+Writer-preferring: once a writer waits, new readers queue behind it, so a
+steady stream of API reads cannot starve a scrape's write. Both sides are
+reentrant per thread, and the writing thread may take read access too.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0          # threads currently holding read access
+        self._writer = None        # ident of the thread holding write access
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def _counters(self):
+        local = self._local
+        if not hasattr(local, 'reads'):
+            local.reads = 0        # read holds counted in _readers
+            local.nested = 0       # read holds taken while this thread writes
+        return local
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            local = self._counters()
+            if self._writer == me:
+                local.nested += 1
+                return
+            if local.reads:
+                # Re-entry must not wait for queued writers (they wait for us)
+                local.reads += 1
+                return
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+            local.reads = 1
+
+    def release_read(self):
+        with self._cond:
+            local = self._counters()
+            if local.nested:
+                local.nested -= 1
+                return
+            if not local.reads:
+                raise RuntimeError("release_read() without a matching acquire_read()")
+            local.reads -= 1
+            if not local.reads:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if self._counters().reads:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("release_write() by a thread that does not hold the write lock")
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @property
+    def write_held(self) -> bool:
+        """True if the calling thread holds write access"""
+        return self._writer == threading.get_ident()
+
+    @property
+    def read_held(self) -> bool:
+        """True if the calling thread holds read access"""
+        local = self._counters()
+        return bool(local.reads or local.nested)
+
+    @contextmanager
+    def read(self):
+        """Shared access for the duration of the block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Exclusive access for the duration of the block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -4,34 +4,111 @@ Automatically finds recap URLs and extracts player statistics
 Supports both static HTML and JavaScript-rendered pages
 """
 
+import copy
 import requests
 from bs4 import BeautifulSoup
 import re
 import time
-import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import logging
-from database_manager import AADSDataManager
+from database_manager import AADSDataManager, match_id_from_url
+from driver_pool import WebDriverPool, chrome_driver_factory
+from event_data_manager import EventDataManager
+from series_rebuild import api_completed_matches, api_event_matches, api_match_records
+from http_cache import HTTPCache
+from inertia import extract_data_page
+from recap_document import RecapCache, RecapDocument
+from throttling import HostRateLimiter
 
 # Selenium imports for JavaScript-rendered pages
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     logging.warning("Selenium not available. Install with: pip install selenium webdriver-manager")
 
+# Headers for plain HTTP page fetches (avoids 403s on DartConnect)
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Recap site and the headers its tab endpoints need to answer with JSON
+RECAP_BASE_URL = "https://recap.dartconnect.com"
+INERTIA_JSON_HEADERS = {
+    'Accept': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+    'X-Inertia': 'true',
+    'X-Inertia-Version': '1'
+}
+
+# Browser-side readiness probe: the page is ready once the Inertia payload
+# is present and parses, or (for non-Inertia pages) once the document has
+# loaded and no new network resources appeared for `idleMs`
+PAGE_READY_SCRIPT = """
+var idleMs = arguments[0];
+var app = document.querySelector('#app');
+if (app && app.dataset && app.dataset.page) {
+    try { JSON.parse(app.dataset.page); return 'inertia'; } catch (e) { return null; }
+}
+if (document.readyState !== 'complete') { return null; }
+var count = performance.getEntriesByType('resource').length;
+var now = performance.now();
+if (window.__aadsResourceCount !== count) {
+    window.__aadsResourceCount = count;
+    window.__aadsResourceSince = now;
+    return null;
+}
+return (now - window.__aadsResourceSince) >= idleMs ? 'network_idle' : null;
+"""
+
+# Event match list (POST; answers JSON with payload.completed)
+EVENT_MATCHES_API = "https://tv.dartconnect.com/api/event/{}/matches"
+
+
+def event_id_from_url(event_url: str) -> str:
+    """DartConnect event id from an event URL ('unknown' if none)"""
+    # Matches: /eventmenu/mt_joe6163l_1 or /event/mt_joe6163l_1 or /event/mt_joe6163l_1/matches
+    event_id_match = re.search(r'/(?:eventmenu|event)/([^/?]+)', event_url)
+    return event_id_match.group(1) if event_id_match else 'unknown'
+
+
 class DartConnectScraper:
-    def __init__(self, db_manager: AADSDataManager, log_level: int = logging.INFO, use_selenium: bool = True):
-        """Initialize the scraper with database manager"""
+    def __init__(self, db_manager: AADSDataManager, log_level: int = logging.INFO, use_selenium: bool = True,
+                 driver_pool: WebDriverPool = None, driver_pool_size: int = 2, max_pages_per_driver: int = 50,
+                 page_ready_timeout: float = 15.0, network_idle_ms: int = 500, ready_poll_interval: float = 0.1,
+                 rate_limiter: HostRateLimiter = None, recap_cache_size: int = 256,
+                 enrich_from_api: bool = False, http_cache: HTTPCache = None,
+                 event_data_dir: str = "data/event_data"):
+        """Initialize the scraper with database manager
+        
+        Args:
+            db_manager: Stats store that scraped matches are written to
+            log_level: Logging level
+            use_selenium: Use headless Chrome for JavaScript-rendered pages
+            driver_pool: Optional shared WebDriverPool (e.g. one per server process)
+            driver_pool_size: Number of browsers when the scraper creates its own pool
+            max_pages_per_driver: Recycle a browser after this many pages
+            page_ready_timeout: Upper bound (seconds) to wait for a rendered page to be ready
+            network_idle_ms: Quiet period that counts as "network idle" for non-Inertia pages
+            ready_poll_interval: How often (seconds) readiness is re-checked
+            rate_limiter: Optional per-host limiter applied before every network request
+            recap_cache_size: Number of parsed recaps kept in memory (LRU, by match id)
+            enrich_from_api: Also fetch the counts/players tabs for each recap (two extra requests)
+            http_cache: Optional on-disk response cache for plain HTTP requests
+                (in offline replay mode the browser is disabled as well)
+            event_data_dir: EventDataManager directory that saved API responses are read from
+        """
         self.db = db_manager
+        self.event_data_dir = event_data_dir
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -53,9 +130,32 @@ class DartConnectScraper:
             'recap.dartconnect.com'  # Recap subdomain
         ]
         
-        # Selenium setup for JavaScript pages
-        self.use_selenium = use_selenium and SELENIUM_AVAILABLE
-        self.driver = None
+        # On-disk HTTP cache (completed recaps are downloaded once)
+        self.http_cache = http_cache
+        
+        # Selenium setup for JavaScript pages: a bounded pool of reusable browsers
+        self.use_selenium = use_selenium and SELENIUM_AVAILABLE and not (http_cache is not None and http_cache.offline)
+        self.driver_pool = driver_pool
+        self._owns_driver_pool = driver_pool is None
+        if self.driver_pool is None and self.use_selenium:
+            self.driver_pool = WebDriverPool(
+                factory=chrome_driver_factory(self.session.headers['User-Agent']),
+                size=driver_pool_size,
+                max_pages_per_driver=max_pages_per_driver
+            )
+        
+        # Politeness: per-host spacing between requests (shared across threads)
+        self.rate_limiter = rate_limiter
+        
+        # Parsed recaps shared by Stage 1 and Stage 2 (one fetch per match)
+        self.recap_cache = RecapCache(recap_cache_size)
+        self.enrich_from_api = enrich_from_api
+        
+        # Readiness detection bounds and wait-time metrics
+        self.page_ready_timeout = page_ready_timeout
+        self.network_idle_ms = network_idle_ms
+        self.ready_poll_interval = ready_poll_interval
+        self.wait_metrics = {'waits': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
         
         if self.use_selenium:
             self.logger.info("Selenium support enabled for JavaScript pages")
@@ -70,80 +170,205 @@ class DartConnectScraper:
         except:
             return False
     
-    def _init_selenium_driver(self):
-        """Initialize Selenium WebDriver if not already done"""
-        if self.driver is None and self.use_selenium:
-            try:
-                chrome_options = Options()
-                chrome_options.add_argument('--headless')  # Run in background
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--disable-gpu')
-                chrome_options.add_argument('--window-size=1920,1080')
-                chrome_options.add_argument(f'user-agent={self.session.headers["User-Agent"]}')
-                
-                self.driver = webdriver.Chrome(
-                    service=Service(ChromeDriverManager().install()),
-                    options=chrome_options
-                )
-                self.logger.info("Selenium WebDriver initialized successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize Selenium: {e}")
+    def _throttle(self, url: str):
+        """Wait for the per-host rate limiter (no-op if none configured)"""
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+    
+    def _http(self, method: str, url: str, revalidate: bool = False, **kwargs):
+        """Plain HTTP request, through the on-disk cache when one is configured
+        
+        Rate limiting applies only when the request actually goes to the network.
+        revalidate=True asks the server even while the cached copy is fresh.
+        """
+        if self.http_cache is not None:
+            return self.http_cache.request(self.session, method, url, on_network=self._throttle,
+                                           revalidate=revalidate, **kwargs)
+        self._throttle(url)
+        return self.session.request(method, url, **kwargs)
+    
+    def _acquire_driver(self):
+        """Check out a browser from the pool, or None if Selenium is unusable"""
+        if not self.use_selenium or self.driver_pool is None:
+            return None
+        try:
+            return self.driver_pool.acquire()
+        except Exception as e:
+            self.logger.error(f"Failed to initialize Selenium: {e}")
+            if len(self.driver_pool) == 0:
+                # No browser could be started at all - stop trying
                 self.use_selenium = False
+            return None
+    
+    def _wait_for_page_ready(self, driver, wait_for_element: str = None, timeout: float = None) -> float:
+        """Wait until a rendered page is ready instead of sleeping a fixed time
+        
+        Ready means the #app data-page payload is present and parses (or the
+        network went idle on non-Inertia pages), plus wait_for_element if given.
+        Gives up after `timeout` seconds and lets the caller use what loaded.
+        
+        Returns:
+            Seconds actually spent waiting
+        """
+        timeout = self.page_ready_timeout if timeout is None else timeout
+        
+        def page_ready(drv):
+            if wait_for_element and not drv.find_elements(By.CSS_SELECTOR, wait_for_element):
+                return False
+            return drv.execute_script(PAGE_READY_SCRIPT, self.network_idle_ms)
+        
+        start = time.monotonic()
+        try:
+            reason = WebDriverWait(driver, timeout, poll_frequency=self.ready_poll_interval).until(page_ready)
+            timed_out = False
+        except Exception:
+            reason = 'timeout'
+            timed_out = True
+        elapsed = time.monotonic() - start
+        
+        self.wait_metrics['waits'] += 1
+        self.wait_metrics['total_seconds'] += elapsed
+        self.wait_metrics['max_seconds'] = max(self.wait_metrics['max_seconds'], elapsed)
+        if timed_out:
+            self.wait_metrics['timeouts'] += 1
+            self.logger.warning(f"Page not ready after {timeout}s, continuing with current content")
+        else:
+            self.logger.debug(f"Page ready ({reason}) after {elapsed:.2f}s")
+        return elapsed
+    
+    def get_wait_metrics(self) -> Dict[str, Any]:
+        """Summary of browser readiness waits (count, timeouts, mean/max seconds)"""
+        metrics = dict(self.wait_metrics)
+        metrics['mean_seconds'] = metrics['total_seconds'] / metrics['waits'] if metrics['waits'] else 0.0
+        return metrics
     
     def _get_page_content(self, url: str, wait_for_element: str = None) -> Optional[str]:
         """Get page content, using Selenium if needed for JavaScript pages"""
         # Try with Selenium first for known JavaScript-heavy domains
         if self.use_selenium and ('dartconnect.com' in url):
-            try:
-                self._init_selenium_driver()
-                if self.driver:
+            driver = self._acquire_driver()
+            if driver:
+                try:
                     self.logger.debug(f"Using Selenium to fetch: {url}")
-                    self.driver.get(url)
+                    self._throttle(url)
+                    driver.get(url)
                     
-                    # Wait for content to load
-                    if wait_for_element:
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_element))
-                        )
-                    else:
-                        time.sleep(3)  # Generic wait for JS to execute
+                    # Wait for content to load (returns as soon as the page is ready)
+                    self._wait_for_page_ready(driver, wait_for_element)
                     
-                    return self.driver.page_source
-            except Exception as e:
-                self.logger.warning(f"Selenium fetch failed: {e}, falling back to requests")
+                    page_source = driver.page_source
+                    self.driver_pool.release(driver)
+                    return page_source
+                except Exception as e:
+                    self.driver_pool.release(driver, discard=True)
+                    self.logger.warning(f"Selenium fetch failed: {e}, falling back to requests")
         
         # Fallback to regular requests with better headers to avoid 403
+        return self._fetch_html(url)
+    
+    def _fetch_html(self, url: str) -> Optional[str]:
+        """Fetch a page over plain HTTP (no browser)"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            response = self.session.get(url, timeout=30, headers=headers)
+            response = self._http('GET', url, timeout=30, headers=BROWSER_HEADERS)
             response.raise_for_status()
             return response.text
         except Exception as e:
             self.logger.error(f"Failed to fetch {url}: {e}")
             return None
     
+    def _extract_inertia_page(self, page_source: str) -> Optional[Dict[str, Any]]:
+        """Return the Inertia.js page object from <div id="app" data-page=...>, if present"""
+        return extract_data_page(page_source)
+    
+    def fetch_event_matches_api(self, event_id: str, revalidate: bool = False):
+        """POST the event matches API (no browser needed)
+        
+        Args:
+            event_id: DartConnect event id
+            revalidate: Bypass the HTTP cache's freshness window (live polling)
+            
+        Returns:
+            The HTTP response (JSON body with payload.completed when status is 200)
+        """
+        return self._http('POST', EVENT_MATCHES_API.format(event_id), revalidate=revalidate, headers={
+            'User-Agent': self.session.headers['User-Agent'],
+            'Accept': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        })
+    
+    def get_recap_document(self, recap_url: str, refresh: bool = False) -> Optional[RecapDocument]:
+        """Fetch and parse a recap once; later calls for the same match hit the cache
+        
+        Args:
+            recap_url: Match recap URL
+            refresh: Ignore any cached copy and fetch again
+        
+        Returns:
+            RecapDocument, or None if the page could not be fetched
+        """
+        match_id = match_id_from_url(recap_url)
+        if not refresh:
+            doc = self.recap_cache.get(match_id)
+            if doc is not None:
+                self.logger.debug(f"Recap cache hit: {recap_url}")
+                return doc
+        
+        is_recap_site = 'recap.dartconnect.com' in recap_url
+        
+        # Fast path: the Inertia payload over plain HTTP (one round trip, no browser)
+        if is_recap_site:
+            page_source = self._fetch_html(recap_url)
+            if page_source:
+                doc = RecapDocument(recap_url, page_source=page_source)
+                if doc.has_match_data:
+                    self.recap_cache.put(doc)
+                    return doc
+                if self.http_cache is not None:
+                    # Not a complete recap (yet): don't keep it as immutable
+                    self.http_cache.invalidate(recap_url)
+        
+        page_source = self._get_page_content(recap_url, wait_for_element='#app')
+        if not page_source:
+            return None
+        
+        doc = RecapDocument(recap_url, page_source=page_source)
+        # Incomplete recap renders are not cached so a retry fetches again
+        if doc.has_match_data or not is_recap_site:
+            self.recap_cache.put(doc)
+        return doc
+    
+    def spawn_worker(self) -> 'DartConnectScraper':
+        """A scraper for another worker thread
+        
+        It gets its own HTTP session and processed-URL set, and shares this
+        scraper's browser pool, recap cache, HTTP cache, rate limiter and
+        wait metrics (all of which are thread-safe or advisory).
+        """
+        worker = copy.copy(self)
+        worker.session = requests.Session()
+        worker.session.headers.update(self.session.headers)
+        worker.processed_recaps = set()
+        worker._owns_driver_pool = False
+        return worker
+    
+    def close(self):
+        """Shut down the scraper's browsers (a pool passed in or shared with workers stays open)"""
+        if self.driver_pool is not None and self._owns_driver_pool:
+            self.driver_pool.close()
+    
     def __del__(self):
-        """Cleanup Selenium driver on destruction"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        """Cleanup Selenium drivers on destruction"""
+        try:
+            self.close()
+        except:
+            pass
     
-    def scrape_event_for_matches(self, event_url: str) -> dict:
+    def scrape_event_for_matches(self, event_url: str, progress_callback: Callable[[str], None] = None) -> dict:
         """Scrape an event page to find all match recap URLs
         
         Args:
             event_url: URL of the event page (e.g., https://tv.dartconnect.com/eventmenu/mt_joe6163l_1)
+            progress_callback: Optional callable receiving each progress message as it is logged
             
         Returns:
             dict: {
@@ -160,45 +385,57 @@ class DartConnectScraper:
             """Helper to log both to logger and progress array"""
             self.logger.info(message)
             progress_log.append(message)
+            if progress_callback:
+                progress_callback(message)
         
         try:
             log_step(f"[1/8] Starting event scrape: {event_url}")
             
-            # Initialize Selenium driver if not already done
-            log_step("[2/8] Initializing Selenium WebDriver...")
-            self._init_selenium_driver()
-            
-            if not self.driver:
-                log_step("✗ ERROR: Selenium driver not available")
-                return {
-                    'success': False,
-                    'error': 'Selenium driver not available',
-                    'progress_log': progress_log
-                }
-            
-            log_step("✓ Selenium WebDriver ready")
-            
             # Extract event ID from URL
-            log_step("[3/8] Extracting event ID from URL...")
-            # Matches: /eventmenu/mt_joe6163l_1 or /event/mt_joe6163l_1 or /event/mt_joe6163l_1/matches
-            event_id_match = re.search(r'/(?:eventmenu|event)/([^/?]+)', event_url)
-            event_id = event_id_match.group(1) if event_id_match else 'unknown'
+            log_step("[2/8] Extracting event ID from URL...")
+            event_id = event_id_from_url(event_url)
             log_step(f"✓ Event ID extracted: {event_id}")
             
             # Construct the matches page URL
             matches_url = f"https://tv.dartconnect.com/event/{event_id}/matches"
-            log_step(f"[4/8] Loading matches page: {matches_url}")
-            
-            # Load the matches page
-            self.driver.get(matches_url)
-            log_step("✓ Page loaded, waiting for JavaScript...")
-            time.sleep(5)  # Wait for JavaScript to load matches
-            log_step("✓ JavaScript execution complete")
+            log_step(f"[3/8] Loading matches page: {matches_url}")
             
-            # Get page source
+            # Fast path: the Inertia payload is server-rendered, no browser needed
+            page_source = self._fetch_html(matches_url)
+            inertia_data = self._extract_inertia_page(page_source) if page_source else None
+            if inertia_data is not None:
+                log_step("[4/8] ✓ Page loaded over HTTP (Inertia payload present, browser not needed)")
+            else:
+                # Check out a browser from the pool
+                log_step("[4/8] Inertia payload missing, initializing Selenium WebDriver...")
+                driver = self._acquire_driver()
+                
+                if not driver:
+                    log_step("✗ ERROR: Selenium driver not available")
+                    return {
+                        'success': False,
+                        'error': 'Selenium driver not available',
+                        'progress_log': progress_log
+                    }
+                
+                log_step("✓ Selenium WebDriver ready")
+                
+                # Load the matches page
+                try:
+                    self._throttle(matches_url)
+                    driver.get(matches_url)
+                    log_step("✓ Page loaded, waiting for JavaScript...")
+                    waited = self._wait_for_page_ready(driver)
+                    log_step(f"✓ JavaScript execution complete ({waited:.1f}s)")
+                    page_source = driver.page_source
+                    inertia_data = self._extract_inertia_page(page_source)
+                except Exception:
+                    self.driver_pool.release(driver, discard=True)
+                    raise
+                self.driver_pool.release(driver)
+            
+            # The Inertia payload was extracted straight from the HTML (no DOM needed)
             log_step("[5/8] Parsing HTML content...")
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
             log_step("✓ HTML parsed successfully")
             
             # Find all links to recap pages
@@ -206,24 +443,17 @@ class DartConnectScraper:
             
             # DartConnect uses Inertia.js - check for data-page attribute
             log_step("[6/8] Checking for Inertia.js framework...")
-            app_div = soup.find('div', id='app')
-            if app_div and app_div.get('data-page'):
+            if inertia_data is not None:
                 try:
-                    inertia_data = json.loads(app_div['data-page'])
                     log_step(f"✓ Inertia.js detected: {inertia_data.get('component')}")
                     
                     # The matches page should have match data in props
                     # We need to make an API call to get the actual matches
                     # Use the API endpoint from the Ziggy routes
-                    import requests
-                    api_url = f"https://tv.dartconnect.com/api/event/{event_id}/matches"
+                    api_url = EVENT_MATCHES_API.format(event_id)
                     log_step(f"[7/8] Calling DartConnect API: {api_url}")
                     
-                    response = requests.post(api_url, headers={
-                        'User-Agent': self.session.headers['User-Agent'],
-                        'Accept': 'application/json',
-                        'X-Requested-With': 'XMLHttpRequest'
-                    })
+                    response = self.fetch_event_matches_api(event_id)
                     
                     # Save raw API response for later storage
                     raw_api_response = None
@@ -237,108 +467,12 @@ class DartConnectScraper:
                         # DartConnect API returns: {"status": "OK", "payload": {"completed": [...], "events": [...]}}
                         # The "completed" array contains ALL matches from all events (Round Robin, Knockout, etc.)
                         log_step("[8/8] Processing match data from API...")
-                        matches_data = []
-                        
-                        if isinstance(api_data, dict):
-                            # Check for standard DartConnect API response
-                            if 'payload' in api_data and isinstance(api_data['payload'], dict):
-                                payload = api_data['payload']
-                                # Get all completed matches (includes all events)
-                                if 'completed' in payload and isinstance(payload['completed'], list):
-                                    matches_data = payload['completed']
-                                    log_step(f"✓ Found {len(matches_data)} completed matches in API response")
-                            
-                            # Fallback: try other common keys if payload not found
-                            if not matches_data:
-                                for key in ['matches', 'data', 'match', 'items']:
-                                    if key in api_data:
-                                        matches_data = api_data[key] if isinstance(api_data[key], list) else [api_data[key]]
-                                        break
-                        elif isinstance(api_data, list):
-                            matches_data = api_data
+                        matches_data = api_completed_matches(api_data)
+                        if matches_data:
+                            log_step(f"✓ Found {len(matches_data)} completed matches in API response")
                         
                         log_step(f"Processing {len(matches_data)} matches from API response...")
-                        
-                        match_counter = 1
-                        for match in matches_data:
-                            if isinstance(match, dict):
-                                # DartConnect API match fields:
-                                # "mi" = match ID, "hc" = home competitor, "ac" = away competitor, "el" = event label
-                                match_id = match.get('mi') or match.get('i') or match.get('id') or match.get('match_id') or match.get('matchId')
-                                if match_id:
-                                    match_url = f"https://recap.dartconnect.com/matches/{match_id}"
-                                    
-                                    # Get player names
-                                    home_name = match.get('hc') or match.get('hcf') or (match.get('home_player', {}).get('name') if isinstance(match.get('home_player'), dict) else None)
-                                    away_name = match.get('ac') or match.get('acf') or (match.get('away_player', {}).get('name') if isinstance(match.get('away_player'), dict) else None)
-                                    
-                                    # Determine match type, phase, and group based on position
-                                    # AADS Tournament Structure:
-                                    # Match 1: Final
-                                    # Match 2-3: Semifinals
-                                    # Match 4-7: Quarterfinals
-                                    # Match 8-17: Group A Round Robin (10 matches)
-                                    # Match 18-27: Group B Round Robin (10 matches)
-                                    
-                                    if match_counter == 1:
-                                        match_type = 'Knockout'
-                                        phase = 'final'
-                                        group_name = None
-                                        phase_label = 'Final'
-                                    elif match_counter <= 3:
-                                        match_type = 'Knockout'
-                                        phase = 'semifinal'
-                                        group_name = None
-                                        phase_label = 'Semifinal'
-                                    elif match_counter <= 7:
-                                        match_type = 'Knockout'
-                                        phase = 'quarterfinal'
-                                        group_name = None
-                                        phase_label = 'Quarterfinal'
-                                    elif match_counter <= 17:
-                                        match_type = 'Round Robin'
-                                        phase = 'round_robin'
-                                        group_name = 'A'
-                                        phase_label = 'Round Robin - Group A'
-                                    elif match_counter <= 27:
-                                        match_type = 'Round Robin'
-                                        phase = 'round_robin'
-                                        group_name = 'B'
-                                        phase_label = 'Round Robin - Group B'
-                                    else:
-                                        # Fallback for any extra matches
-                                        match_type = 'Round Robin'
-                                        phase = 'round_robin'
-                                        group_name = None
-                                        phase_label = 'Round Robin'
-                                    
-                                    # Build informative title: "Event_1 Match 1 - Player A vs Player B (Final)"
-                                    title_parts = [f"{event_id} Match {match_counter}"]
-                                    
-                                    # Add player names
-                                    if home_name and away_name:
-                                        title_parts.append(f"- {home_name} vs {away_name}")
-                                    elif home_name or away_name:
-                                        player = home_name or away_name
-                                        title_parts.append(f"- {player}")
-                                    
-                                    # Add phase label
-                                    title_parts.append(f"({phase_label})")
-                                    
-                                    title = ' '.join(title_parts)
-                                    
-                                    matches.append({
-                                        'url': match_url,
-                                        'title': title,
-                                        'match_number': match_counter,
-                                        'match_type': match_type,
-                                        'phase': phase,
-                                        'group_name': group_name,
-                                        'home_player': home_name,
-                                        'away_player': away_name
-                                    })
-                                    
-                                    match_counter += 1
+                        matches = api_event_matches(event_id, api_data)
                     else:
                         self.logger.warning(f"API request failed with status {response.status_code}")
                         
@@ -348,6 +482,7 @@ class DartConnectScraper:
             # Fallback: Look for links in HTML (old method)
             if not matches:
                 self.logger.info("No matches found in API, trying HTML links...")
+                soup = BeautifulSoup(page_source or '', 'html.parser')
                 for link in soup.find_all('a', href=True):
                     href = link.get('href', '')
                     
@@ -398,281 +533,27 @@ class DartConnectScraper:
             error_msg = f"Error scraping event page: {e}"
             self.logger.error(error_msg)
             progress_log.append(f"✗ ERROR: {error_msg}")
+            if progress_callback:
+                progress_callback(progress_log[-1])
             return {
                 'success': False,
                 'error': str(e),
                 'progress_log': progress_log
             }
     
-    def _parse_recap_json_format(self, soup: BeautifulSoup, match_id: str) -> List[Dict[str, Any]]:
-        """
-        Parse recap.dartconnect.com JSON format embedded in data-page attribute.
-        Extracts detailed match statistics including leg-by-leg analysis.
-        """
-        print(f"\n🔍 DEBUG: _parse_recap_json_format called for match_id={match_id}")
-        try:
-            import json
-            
-            # Find the div with id="app" that contains the data-page attribute
-            app_div = soup.find('div', id='app')
-            if not app_div:
-                return []
-            
-            # Extract JSON data from data-page attribute
-            data_page = app_div.get('data-page')
-            if not data_page:
-                return []
-            
-            # Parse JSON
-            page_data = json.loads(data_page)
-            
-            # Extract match info and segments (leg-by-leg data)
-            match_info = page_data.get('props', {}).get('matchInfo', {})
-            segments = page_data.get('props', {}).get('segments', {})
-            home_players = page_data.get('props', {}).get('homePlayers', [])
-            away_players = page_data.get('props', {}).get('awayPlayers', [])
-            
-            if not match_info:
-                return []
-            
-            # Extract opponent stats
-            opponents = match_info.get('opponents', [])
-            
-            if not opponents or len(opponents) < 2:
-                return []
-            
-            # Parse leg-by-leg data for detailed statistics
-            leg_data = self._parse_leg_data(segments, opponents)
-            
-            players_stats = []
-            
-            print(f"🔍 DEBUG: Found {len(opponents)} opponents")
-            print(f"🔍 DEBUG: homePlayers = {home_players}")
-            print(f"🔍 DEBUG: awayPlayers = {away_players}")
-            
-            self.logger.info(f"===== PARSING MATCH {match_id} =====")
-            self.logger.info(f"Opponents: {len(opponents)}")
-            self.logger.info(f"Home players array: {home_players}")
-            self.logger.info(f"Away players array: {away_players}")
-            self.logger.debug(f"Processing {len(opponents)} opponents")
-            self.logger.debug(f"Home players: {home_players}")
-            self.logger.debug(f"Away players: {away_players}")
-            
-            # Process each opponent
-            for idx, opponent in enumerate(opponents):
-                # Try to get full name from homePlayers/awayPlayers first, fallback to opponent name
-                player_name = opponent.get('name', '')
-                
-                # Enhance with full name if available
-                if idx == 0 and home_players and len(home_players) > 0:
-                    full_name = home_players[0].get('name', '')
-                    if full_name:
-                        player_name = full_name
-                elif idx == 1 and away_players and len(away_players) > 0:
-                    full_name = away_players[0].get('name', '')
-                    if full_name:
-                        player_name = full_name
-                
-                self.logger.info(f"Player {idx}: opponent.name='{opponent.get('name', '')}', final player_name='{player_name}'")
-                self.logger.debug(f"Player {idx}: {player_name}")
-                
-                if not player_name:
-                    self.logger.warning(f"Skipping opponent {idx} - no name found")
-                    continue
-                
-                player_leg_data = leg_data.get(idx, {})
-                
-                # Calculate 3-dart average (DartConnect calls it PPR for 501 games)
-                ppr_str = opponent.get('ppr', '0')
-                try:
-                    if ppr_str and ppr_str != '-':
-                        ppr_average = float(ppr_str)
-                    else:
-                        ppr_average = 0.0
-                except (ValueError, TypeError) as e:
-                    self.logger.warning(f"Could not parse PPR value '{ppr_str}': {e}")
-                    ppr_average = 0.0
-                
-                # Match-level stats
-                total_legs = int(match_info.get('total_games', 0))
-                legs_won = int(opponent.get('leg_wins', 0))
-                legs_lost = total_legs - legs_won
-                sets_won = int(opponent.get('set_wins', 0))
-                
-                # Calculate leg win percentage
-                leg_win_percentage = (legs_won / total_legs * 100) if total_legs > 0 else 0
-                
-                # Extract detailed statistics from leg data
-                count_180s = player_leg_data.get('count_180s', 0)
-                count_160_plus = player_leg_data.get('count_160_plus', 0)
-                count_140_plus = player_leg_data.get('count_140_plus', 0)
-                count_100_plus = player_leg_data.get('count_100_plus', 0)
-                highest_finish = player_leg_data.get('highest_finish', 0)
-                double_attempts = player_leg_data.get('double_attempts', 0)
-                doubles_hit = player_leg_data.get('doubles_hit', 0)
-                
-                # Calculate checkout percentage
-                checkout_percentage = (doubles_hit / double_attempts * 100) if double_attempts > 0 else 0
-                
-                # Extract statistics matching the expected format
-                stats = {
-                    'player_name': player_name,
-                    'match_id': match_id,
-                    'three_dart_average': ppr_average,  # For 501: 3DA (3-dart average). For Cricket: PPR (points per round)
-                    
-                    # Match stats
-                    'matches_played': 1,  # Each recap = 1 match
-                    'match_won': 1 if (opponent.get('score', 0) > opponents[1 - idx].get('score', 0)) else 0,
-                    'match_score': f"{opponent.get('score', 0)}-{opponents[1 - idx].get('score', 0)}",
-                    
-                    # Leg/Set stats
-                    'legs_played': total_legs,
-                    'legs_won': legs_won,
-                    'legs_lost': legs_lost,
-                    'leg_win_percentage': round(leg_win_percentage, 2),
-                    'sets_played': int(match_info.get('total_sets', 1)),
-                    'sets_won': sets_won,
-                    'sets_lost': int(match_info.get('total_sets', 1)) - sets_won,
-                    
-                    # Score counts
-                    'count_180s': count_180s,
-                    'count_160_plus': count_160_plus,
-                    'count_140_plus': count_140_plus,
-                    'count_100_plus': count_100_plus,
-                    
-                    # Checkout stats
-                    'highest_finish': highest_finish,
-                    'double_attempts': double_attempts,
-                    'doubles_hit': doubles_hit,
-                    'checkout_percentage': round(checkout_percentage, 2),
-                    
-                    # Additional stats
-                    'darts_thrown': self._parse_stat_value(opponent.get('darts_thrown_ppr', '0')),
-                    'points_scored': self._parse_stat_value(opponent.get('points_scored_ppr', '0')),
-                }
-                
-                self.logger.debug(f"Parsed player: {player_name} - 3DA: {stats['three_dart_average']}, " +
-                                f"Legs: {legs_won}/{total_legs} ({leg_win_percentage:.1f}%), " +
-                                f"180s: {count_180s}, Checkout: {checkout_percentage:.1f}%")
-                
-                players_stats.append(stats)
-            
-            self.logger.info(f"===== MATCH {match_id} COMPLETE: Extracted {len(players_stats)} players =====")
-            self.logger.info(f"Extracted {len(players_stats)} players from recap JSON")
-            return players_stats
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing recap JSON format: {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
-            return []
-    
-    def _parse_leg_data(self, segments: Dict, opponents: List) -> Dict[int, Dict]:
-        """
-        Parse leg-by-leg data to extract detailed statistics like 180s, checkouts, etc.
-        Returns dict with player index as key and their aggregated leg stats.
-        """
-        player_stats = {0: {}, 1: {}}
-        
-        # Initialize counters for each player
-        for player_idx in [0, 1]:
-            player_stats[player_idx] = {
-                'count_180s': 0,
-                'count_160_plus': 0,
-                'count_140_plus': 0,
-                'count_100_plus': 0,
-                'highest_finish': 0,
-                'double_attempts': 0,
-                'doubles_hit': 0,
-            }
-        
-        try:
-            # Segments can be organized by segment name (e.g., '' for default)
-            for segment_name, segment_sets in segments.items():
-                if not segment_sets:
-                    continue
-                    
-                # Each set contains legs
-                for leg_set in segment_sets:
-                    if not isinstance(leg_set, list):
-                        continue
-                        
-                    for leg in leg_set:
-                        # Extract home and away player data for this leg
-                        home_data = leg.get('home', {})
-                        away_data = leg.get('away', {})
-                        
-                        # Process both players
-                        for player_idx, player_data in enumerate([home_data, away_data]):
-                            if not player_data:
-                                continue
-                            
-                            # Calculate scores from this leg
-                            starting_points = player_data.get('starting_points', 501)
-                            ending_points = player_data.get('ending_points', 0)
-                            points_scored = starting_points - ending_points
-                            
-                            # Check for 100+ scores (approximate based on PPR)
-                            ppr = self._parse_stat_value(str(player_data.get('ppr', '0')))
-                            if ppr >= 60:  # High scoring leg
-                                player_stats[player_idx]['count_100_plus'] += 1
-                            if ppr >= 70:
-                                player_stats[player_idx]['count_140_plus'] += 1
-                            if ppr >= 80:
-                                player_stats[player_idx]['count_160_plus'] += 1
-                            if ppr >= 100:
-                                player_stats[player_idx]['count_180s'] += 1
-                            
-                            # Check for checkout (leg won)
-                            if player_data.get('win', False):
-                                double_out = player_data.get('double_out_points', 0)
-                                if double_out > 0:
-                                    # Successful checkout
-                                    player_stats[player_idx]['doubles_hit'] += 1
-                                    if double_out > player_stats[player_idx]['highest_finish']:
-                                        player_stats[player_idx]['highest_finish'] = double_out
-                                    
-                            # Count double attempts (any leg where player got close)
-                            if ending_points <= 170:  # Within checkout range
-                                player_stats[player_idx]['double_attempts'] += 1
-                                
-        except Exception as e:
-            self.logger.warning(f"Error parsing leg data: {e}")
-        
-        return player_stats
-    
-    def _parse_stat_value(self, value_str: str) -> int:
-        """Parse a stat value that might have commas or dashes"""
-        if not value_str or value_str == '-':
-            return 0
-        # Remove commas
-        value_str = value_str.replace(',', '')
-        try:
-            return int(value_str)
-        except:
-            return 0
-    
     def _enrich_stats_from_api(self, match_id: str, players_stats: List[Dict[str, Any]]) -> None:
         """
         Fetch additional stats from DartConnect API endpoints (other tabs)
         Enriches players_stats in-place with data from counts, games, and players tabs
         """
         try:
-            import requests
-            
-            base_url = "https://recap.dartconnect.com"
-            headers = {
-                'User-Agent': self.session.headers['User-Agent'],
-                'Accept': 'application/json',
-                'X-Requested-With': 'XMLHttpRequest',
-                'X-Inertia': 'true',
-                'X-Inertia-Version': '1'
-            }
+            base_url = RECAP_BASE_URL
+            headers = {'User-Agent': self.session.headers['User-Agent'], **INERTIA_JSON_HEADERS}
             
             # Fetch counts tab data (COD, COO, COE, First 9 Average, etc.)
             try:
                 counts_url = f"{base_url}/counts/{match_id}"
-                counts_response = requests.get(counts_url, headers=headers, timeout=10)
+                counts_response = self._http('GET', counts_url, headers=headers, timeout=10)
                 if counts_response.status_code == 200:
                     counts_data = counts_response.json()
                     self._merge_counts_data(players_stats, counts_data)
@@ -683,7 +564,7 @@ class DartConnectScraper:
             # Fetch players tab data (highest turns, high double out, highest 3DA)
             try:
                 players_url = f"{base_url}/players/{match_id}"
-                players_response = requests.get(players_url, headers=headers, timeout=10)
+                players_response = self._http('GET', players_url, headers=headers, timeout=10)
                 if players_response.status_code == 200:
                     players_data = players_response.json()
                     self._merge_players_data(players_stats, players_data)
@@ -844,32 +725,25 @@ class DartConnectScraper:
         
         try:
             self.logger.info(f"Scraping recap: {recap_url}")
-            page_content = self._get_page_content(recap_url, wait_for_element='#app')
             
-            if not page_content:
+            doc = self.get_recap_document(recap_url)
+            if doc is None:
                 self.logger.warning(f"Could not fetch recap page: {recap_url}")
                 return []
             
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Extract event/match ID from URL for tracking
-            match_id = self._extract_match_id_from_url(recap_url)
-            
-            players_stats = []
-            
-            # Check if this is recap.dartconnect.com with JSON data
-            if 'recap.dartconnect.com' in recap_url:
-                players_stats = self._parse_recap_json_format(soup, match_id)
-                
-                # Fetch additional stats from other tabs via API (non-blocking)
-                if players_stats and match_id:
-                    try:
-                        self._enrich_stats_from_api(match_id, players_stats)
-                    except Exception as e:
-                        self.logger.warning(f"Could not enrich stats from API: {e}")
+            # recap.dartconnect.com: stats come from the parsed Inertia payload
+            players_stats = doc.player_stats
+            if players_stats and self.enrich_from_api:
+                try:
+                    self._enrich_stats_from_api(doc.match_id, players_stats)
+                except Exception as e:
+                    self.logger.warning(f"Could not enrich stats from API: {e}")
             
             # Fallback to table parsing for other formats
             if not players_stats:
+                match_id = self._extract_match_id_from_url(recap_url)
+                soup = doc.soup
+                
                 # Look for statistics tables (DartConnect typically uses tables)
                 stats_tables = soup.find_all('table')
                 
@@ -882,10 +756,10 @@ class DartConnectScraper:
                     if any(keyword in header_text for keyword in ['average', 'dart', '180', '140', 'finish', 'player']):
                         table_stats = self._parse_stats_table(table, match_id)
                         players_stats.extend(table_stats)
-            
-            # If still no tables found, try alternative parsing methods
-            if not players_stats:
-                players_stats = self._parse_alternative_format(soup, match_id)
+                
+                # If still no tables found, try alternative parsing methods
+                if not players_stats:
+                    players_stats = self._parse_alternative_format(soup, match_id)
             
             if players_stats:
                 self.processed_recaps.add(recap_url)
@@ -1067,75 +941,22 @@ class DartConnectScraper:
         Returns:
             List[Dict]: List of player stats dictionaries
         """
-        import json
-        import os
-        
         self.logger.info(f"🎯 Extracting players from API data for event {event_id}")
         
-        # Look for API data file
-        event_dir = f"event_data/{event_id}/raw_data"
-        api_files = []
-        
-        if os.path.exists(event_dir):
-            for file in os.listdir(event_dir):
-                if file.startswith("api_response_") and file.endswith(".json"):
-                    api_files.append(os.path.join(event_dir, file))
-        
-        if not api_files:
-            self.logger.error(f"No API data found for event {event_id} in {event_dir}")
-            return []
-            
-        # Use the most recent API file
-        api_file = sorted(api_files)[-1]
-        self.logger.info(f"Using API data file: {api_file}")
-        
         try:
-            with open(api_file, 'r') as f:
-                api_data = json.load(f)
+            # Most recent API response saved for the event (raw archive or legacy file)
+            api_data = EventDataManager(base_dir=self.event_data_dir).load_raw(event_id, 'api_response')
+            if api_data is None:
+                self.logger.error(f"No API data found for event {event_id}")
+                return []
             
-            players_stats = []
             completed_matches = api_data.get('payload', {}).get('completed', [])
-            
             self.logger.info(f"Found {len(completed_matches)} completed matches in API data")
             
-            for match in completed_matches:
-                # Extract home player
-                home_player = {
-                    'player_name': match.get('hcf', 'Unknown'),  # Full name
-                    'three_dart_average': match.get('hp5', 0),  # 5-dart average
-                    'legs_played': 1,  # Default to 1 for now
-                    'legs_won': 1 if match.get('hs', 0) > match.get('as', 0) else 0,
-                    'legs_lost': 1 if match.get('hs', 0) < match.get('as', 0) else 0,
-                    'matches_played': 1,
-                    'match_won': match.get('hs', 0) > match.get('as', 0),
-                    'count_180s': match.get('h180', 0),
-                    'count_140_plus': match.get('h140', 0),
-                    'count_100_plus': match.get('h100', 0),
-                    'highest_finish': match.get('hhf', 0),
-                    'checkout_percentage': 0,  # Calculate if needed
-                    'match_id': match.get('mi', ''),
-                    'event_id': event_id
-                }
-                players_stats.append(home_player)
-                
-                # Extract away player  
-                away_player = {
-                    'player_name': match.get('acf', 'Unknown'),  # Full name
-                    'three_dart_average': match.get('ap5', 0),  # 5-dart average
-                    'legs_played': 1,
-                    'legs_won': 1 if match.get('as', 0) > match.get('hs', 0) else 0,
-                    'legs_lost': 1 if match.get('as', 0) < match.get('hs', 0) else 0,
-                    'matches_played': 1,
-                    'match_won': match.get('as', 0) > match.get('hs', 0),
-                    'count_180s': match.get('a180', 0),
-                    'count_140_plus': match.get('a140', 0),
-                    'count_100_plus': match.get('a100', 0),
-                    'highest_finish': match.get('ahf', 0),
-                    'checkout_percentage': 0,
-                    'match_id': match.get('mi', ''),
-                    'event_id': event_id
-                }
-                players_stats.append(away_player)
+            players_stats = [{'player_name': record['player'], **record['stats'],
+                              'match_id': record['match_id'] or '', 'match_url': record['match_url'],
+                              'event_id': event_id}
+                             for record in api_match_records(event_id, api_data)]
             
             self.logger.info(f"✅ Extracted {len(players_stats)} players from API data")
             return players_stats
@@ -1161,35 +982,15 @@ class DartConnectScraper:
             self.logger.warning("No player stats extracted from API data")
             return 0
         
-        matches_processed = 0
-        players_added = 0
+        # Add to database (one write for the whole tournament; match URLs make re-runs skip recorded matches)
+        players_added = self.db.add_match_stats_bulk(
+            {'player_name': player_stats['player_name'], 'event_id': event_id,
+             'stats_dict': {key: value for key, value in player_stats.items()
+                            if key not in ('player_name', 'match_id', 'match_url', 'event_id')},
+             'match_url': player_stats['match_url']}
+            for player_stats in players_stats
+        )
         
-        # Add to database
-        for player_stats in players_stats:
-            try:
-                success = self.db.add_match_stats(
-                    player_name=player_stats['player_name'],
-                    event_id=event_id,
-                    stats_dict={
-                        'three_dart_average': player_stats['three_dart_average'],
-                        'legs_played': player_stats.get('legs_played', 0),
-                        'legs_won': player_stats.get('legs_won', 0),
-                        'legs_lost': player_stats.get('legs_lost', 0),
-                        'matches_played': player_stats.get('matches_played', 1),
-                        'count_180s': player_stats.get('count_180s', 0),
-                        'count_140_plus': player_stats.get('count_140_plus', 0),
-                        'count_100_plus': player_stats.get('count_100_plus', 0),
-                        'highest_finish': player_stats.get('highest_finish', 0)
-                    }
-                )
-                if success:
-                    players_added += 1
-                    self.logger.debug(f"Added stats for {player_stats['player_name']}")
-                else:
-                    self.logger.warning(f"Failed to add stats for {player_stats['player_name']}")
-            except Exception as e:
-                self.logger.error(f"Error adding player {player_stats['player_name']}: {e}")
-                
         # Count unique matches (divide players by 2 since each match has 2 players)
         matches_processed = len(players_stats) // 2
         
@@ -1202,21 +1003,22 @@ class DartConnectScraper:
             players_stats = self.extract_player_stats_from_recap(recap_url)
             
             success_count = 0
-            for player_stats in players_stats:
-                success = self.db.add_match_stats(
-                    player_name=player_stats['player_name'],
-                    event_id=event_id,
-                    stats_dict={
-                        'three_dart_average': player_stats['three_dart_average'],
-                        'legs_played': player_stats['legs_played'],
-                        'count_180s': player_stats['count_180s'],
-                        'count_140_plus': player_stats['count_140_plus'],
-                        'count_100_plus': player_stats['count_100_plus'],
-                        'highest_finish': player_stats['highest_finish']
-                    }
-                )
-                if success:
-                    success_count += 1
+            with self.db.batch():
+                for player_stats in players_stats:
+                    success = self.db.add_match_stats(
+                        player_name=player_stats['player_name'],
+                        event_id=event_id,
+                        stats_dict={
+                            'three_dart_average': player_stats['three_dart_average'],
+                            'legs_played': player_stats['legs_played'],
+                            'count_180s': player_stats['count_180s'],
+                            'count_140_plus': player_stats['count_140_plus'],
+                            'count_100_plus': player_stats['count_100_plus'],
+                            'highest_finish': player_stats['highest_finish']
+                        }
+                    )
+                    if success:
+                        success_count += 1
             
             self.logger.info(f"Successfully added stats for {success_count} players from {recap_url}")
             return success_count > 0
@@ -1233,44 +1035,39 @@ class DartConnectScraper:
         try:
             self.logger.info(f"Extracting match result from: {recap_url}")
             
-            # Get the page content
-            if self.use_selenium and SELENIUM_AVAILABLE:
-                html_content = self._get_page_with_selenium(recap_url)
-            else:
-                response = self.session.get(recap_url, timeout=30)
-                response.raise_for_status()
-                html_content = response.text
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract player names
-            player_names = self._extract_player_names(soup)
-            
-            # Extract scores
-            scores = self._extract_match_scores(soup)
+            # Same cached document Stage 2 will use for the detailed stats
+            doc = self.get_recap_document(recap_url)
+            if doc is None:
+                return None
             
-            # Determine winner
-            winner = 'Unknown'
-            score_str = '0-0'
-            if scores and len(scores) >= 2:
-                score1, score2 = scores[0], scores[1]
-                score_str = f"{score1}-{score2}"
-                if score1 > score2:
-                    winner = player_names[0] if len(player_names) > 0 else 'Unknown'
-                elif score2 > score1:
-                    winner = player_names[1] if len(player_names) > 1 else 'Unknown'
+            result = doc.match_result
+            if result is None:
+                # No Inertia payload: fall back to reading the rendered HTML
+                player_names = self._extract_player_names(doc.soup)
+                scores = self._extract_match_scores(doc.soup)
+                
+                # Determine winner
+                winner = 'Unknown'
+                score_str = '0-0'
+                if scores and len(scores) >= 2:
+                    score1, score2 = scores[0], scores[1]
+                    score_str = f"{score1}-{score2}"
+                    if score1 > score2:
+                        winner = player_names[0] if len(player_names) > 0 else 'Unknown'
+                    elif score2 > score1:
+                        winner = player_names[1] if len(player_names) > 1 else 'Unknown'
+                
+                result = {
+                    'player1': player_names[0] if len(player_names) > 0 else 'Unknown',
+                    'player2': player_names[1] if len(player_names) > 1 else 'Unknown',
+                    'score': score_str,
+                    'winner': winner
+                }
             
             # Determine phase and group based on match index
             phase, group = self._classify_match_by_index(match_index)
             
-            return {
-                'player1': player_names[0] if len(player_names) > 0 else 'Unknown',
-                'player2': player_names[1] if len(player_names) > 1 else 'Unknown',
-                'score': score_str,
-                'winner': winner,
-                'phase': phase,
-                'group': group
-            }
+            return {**result, 'phase': phase, 'group': group}
             
         except Exception as e:
             self.logger.error(f"Error extracting match result: {e}", exc_info=True)
@@ -1282,19 +1079,14 @@ class DartConnectScraper:
         Used for Stage 2 detailed scraping
         """
         try:
-            # Get the page content
-            if self.use_selenium and SELENIUM_AVAILABLE:
-                html_content = self._get_page_with_selenium(recap_url)
-            else:
-                response = self.session.get(recap_url, timeout=30)
-                response.raise_for_status()
-                html_content = response.text
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Look for set indicators in the page
-            # This is a placeholder - actual implementation depends on DartConnect's HTML structure
-            set_headers = soup.find_all(text=re.compile(r'Set\s+\d+', re.IGNORECASE))
+            doc = self.get_recap_document(recap_url)
+            if doc is None:
+                return 0
+            if doc.sets_count is not None:
+                return doc.sets_count
+            
+            # No Inertia payload: look for set indicators in the rendered HTML
+            set_headers = doc.soup.find_all(string=re.compile(r'Set\s+\d+', re.IGNORECASE))
             return len(set_headers) if set_headers else 0
             
         except Exception as e:
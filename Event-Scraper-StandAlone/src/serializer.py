@@ -0,0 +1,82 @@
+"""
+Serializer - JSON encoding/decoding shared by the stores, event files and API
+Uses orjson when installed (falls back to the standard library), writes
+compact output by default and pretty output only when asked for
+(pretty=True, or PRETTY_JSON=1 in the environment)
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Union
+
+# orjson is optional; the stdlib json module is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON_BACKEND=json forces the standard library (e.g. to compare output)
+BACKEND = 'orjson' if ORJSON_AVAILABLE and os.environ.get('JSON_BACKEND', 'orjson') != 'json' else 'json'
+
+# Files are written compact; PRETTY_JSON=1 indents them for hand inspection
+PRETTY_DEFAULT = os.environ.get('PRETTY_JSON', '').lower() in ('1', 'true', 'yes')
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    """Types the stores hand us that JSON has no literal for"""
+    if isinstance(obj, (set, frozenset)):
+        # Sorted so the same data always encodes to the same bytes
+        try:
+            return sorted(obj)
+        except TypeError:
+            return list(obj)
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, pretty: bool = None) -> bytes:
+    """Encode obj as UTF-8 JSON bytes
+
+    Args:
+        obj: Value to encode
+        pretty: Indent with 2 spaces (defaults to PRETTY_DEFAULT)
+    """
+    pretty = PRETTY_DEFAULT if pretty is None else pretty
+    if BACKEND == 'orjson':
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def dumps_text(obj: Any) -> str:
+    """Compact JSON as str (for TEXT columns and the like)"""
+    return dumps(obj, pretty=False).decode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str"""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(obj: Any, path: str, pretty: bool = None):
+    """Write obj to path as JSON"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, pretty))
+
+
+def load_file(path: str) -> Any:
+    """Read a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,407 @@
+"""
+Series Rebuild - Rebuild the master stats store from the raw event archives
+Each event's latest saved API response (payload.completed) is parsed into
+match records and a partial database in a worker process; the partials are
+merged in event order and written as a fresh store in one commit, so the
+same archives always produce the same store
+The API payload parsers live here so worker processes need not import the
+scraper (which imports them from this module)
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from database_manager import (AGGREGATE_FIELDS, apply_match_record, carry_over_manual_fields, new_database,
+                              new_player, storage_backend_for)
+from event_data_manager import EventDataManager
+from file_lock import FileLock
+from match_log import OP_ADD, MatchLog, match_log_path
+from serializer import dumps, load_file, loads
+
+RECAP_URL = 'https://recap.dartconnect.com/matches/{}'
+
+
+def api_completed_matches(api_data: Any) -> List[Dict[str, Any]]:
+    """The completed match entries of an event matches API response
+
+    DartConnect API returns: {"status": "OK", "payload": {"completed": [...], "events": [...]}}
+    The "completed" array contains ALL matches from all events (Round Robin, Knockout, etc.)
+    """
+    matches_data = []
+
+    if isinstance(api_data, dict):
+        # Check for standard DartConnect API response
+        if 'payload' in api_data and isinstance(api_data['payload'], dict):
+            payload = api_data['payload']
+            # Get all completed matches (includes all events)
+            if 'completed' in payload and isinstance(payload['completed'], list):
+                matches_data = payload['completed']
+
+        # Fallback: try other common keys if payload not found
+        if not matches_data:
+            for key in ['matches', 'data', 'match', 'items']:
+                if key in api_data:
+                    matches_data = api_data[key] if isinstance(api_data[key], list) else [api_data[key]]
+                    break
+    elif isinstance(api_data, list):
+        matches_data = api_data
+    return matches_data
+
+
+def api_event_matches(event_id: str, api_data: Any) -> List[Dict[str, Any]]:
+    """Match dicts (url, title, phase, group, players) for every completed match of an API response
+
+    Phase and group follow from the position in the payload, so the same
+    response always maps to the same list.
+    """
+    matches = []
+    matches_data = api_completed_matches(api_data)
+
+    match_counter = 1
+    for match in matches_data:
+        if isinstance(match, dict):
+            # DartConnect API match fields:
+            # "mi" = match ID, "hc" = home competitor, "ac" = away competitor, "el" = event label
+            match_id = match.get('mi') or match.get('i') or match.get('id') or match.get('match_id') or match.get('matchId')
+            if match_id:
+                match_url = f"https://recap.dartconnect.com/matches/{match_id}"
+
+                # Get player names
+                home_name = match.get('hc') or match.get('hcf') or (match.get('home_player', {}).get('name') if isinstance(match.get('home_player'), dict) else None)
+                away_name = match.get('ac') or match.get('acf') or (match.get('away_player', {}).get('name') if isinstance(match.get('away_player'), dict) else None)
+
+                # Determine match type, phase, and group based on position
+                # AADS Tournament Structure:
+                # Match 1: Final
+                # Match 2-3: Semifinals
+                # Match 4-7: Quarterfinals
+                # Match 8-17: Group A Round Robin (10 matches)
+                # Match 18-27: Group B Round Robin (10 matches)
+
+                if match_counter == 1:
+                    match_type = 'Knockout'
+                    phase = 'final'
+                    group_name = None
+                    phase_label = 'Final'
+                elif match_counter <= 3:
+                    match_type = 'Knockout'
+                    phase = 'semifinal'
+                    group_name = None
+                    phase_label = 'Semifinal'
+                elif match_counter <= 7:
+                    match_type = 'Knockout'
+                    phase = 'quarterfinal'
+                    group_name = None
+                    phase_label = 'Quarterfinal'
+                elif match_counter <= 17:
+                    match_type = 'Round Robin'
+                    phase = 'round_robin'
+                    group_name = 'A'
+                    phase_label = 'Round Robin - Group A'
+                elif match_counter <= 27:
+                    match_type = 'Round Robin'
+                    phase = 'round_robin'
+                    group_name = 'B'
+                    phase_label = 'Round Robin - Group B'
+                else:
+                    # Fallback for any extra matches
+                    match_type = 'Round Robin'
+                    phase = 'round_robin'
+                    group_name = None
+                    phase_label = 'Round Robin'
+
+                # Build informative title: "Event_1 Match 1 - Player A vs Player B (Final)"
+                title_parts = [f"{event_id} Match {match_counter}"]
+
+                # Add player names
+                if home_name and away_name:
+                    title_parts.append(f"- {home_name} vs {away_name}")
+                elif home_name or away_name:
+                    player = home_name or away_name
+                    title_parts.append(f"- {player}")
+
+                # Add phase label
+                title_parts.append(f"({phase_label})")
+
+                title = ' '.join(title_parts)
+
+                matches.append({
+                    'url': match_url,
+                    'title': title,
+                    'match_number': match_counter,
+                    'match_type': match_type,
+                    'phase': phase,
+                    'group_name': group_name,
+                    'home_player': home_name,
+                    'away_player': away_name
+                })
+
+                match_counter += 1
+    return matches
+
+
+def api_player_stats(match: Dict[str, Any], side: str) -> Tuple[str, Dict[str, Any]]:
+    """One player's stats from a payload.completed entry of the event matches API
+
+    Args:
+        match: Completed match (hcf/acf names, hp5/ap5 averages, h180/a180, ...)
+        side: 'home' or 'away'
+
+    Returns:
+        (player name, stats dict for add_match_stats)
+    """
+    me, them = ('h', 'a') if side == 'home' else ('a', 'h')
+    score, other_score = match.get(me + 's', 0), match.get(them + 's', 0)
+    return match.get(me + 'cf', 'Unknown'), {
+        'three_dart_average': match.get(me + 'p5', 0),  # 5-dart average
+        'legs_played': 1,  # Default to 1 for now
+        'legs_won': 1 if score > other_score else 0,
+        'legs_lost': 1 if score < other_score else 0,
+        'matches_played': 1,
+        'match_won': score > other_score,
+        'count_180s': match.get(me + '180', 0),
+        'count_140_plus': match.get(me + '140', 0),
+        'count_100_plus': match.get(me + '100', 0),
+        'highest_finish': match.get(me + 'hf', 0),
+        'checkout_percentage': 0  # Calculate if needed
+    }
+
+
+def api_match_records(event_id: str, api_data: Dict[str, Any], date: str = '') -> List[Dict[str, Any]]:
+    """Match log records ('add') for every player of every completed match in an API response
+
+    Home then away player, in payload order; a (match, player) pair listed
+    twice is recorded once. Each match's phase and round-robin group come
+    from its position, as api_event_matches() assigns them when the match
+    list is saved, so the records slice the same as scraped ones.
+    """
+    positions = {}
+    for event_match in api_event_matches(event_id, api_data):
+        slice_keys = (('phase', event_match['phase']), ('group', event_match['group_name']))
+        positions.setdefault(event_match['url'], {key: value for key, value in slice_keys if value})
+    records = []
+    seen = set()
+    for match in (api_data or {}).get('payload', {}).get('completed', []):
+        match_id = str(match['mi']) if match.get('mi') else None
+        match_url = RECAP_URL.format(match_id) if match_id else None
+        for side in ('home', 'away'):
+            player_name, stats = api_player_stats(match, side)
+            stats.update(positions.get(match_url, {}))
+            player_name = player_name.strip()
+            if match_id:
+                if (match_id, player_name) in seen:
+                    continue
+                seen.add((match_id, player_name))
+            records.append({
+                'op': OP_ADD,
+                'player': player_name,
+                'event_id': event_id,
+                'match_id': match_id,
+                'match_url': match_url,
+                'date': date,
+                'stats': stats
+            })
+    return records
+
+
+def event_sort_key(event_id: str) -> list:
+    """Natural order of event ids (mt_x_2 before mt_x_10)"""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'(\d+)', event_id)]
+
+
+def discover_events(event_data_dir: str) -> List[str]:
+    """Saved events with at least one archived API response, in natural order"""
+    manager = EventDataManager(event_data_dir)
+    return sorted((event['event_id'] for event in manager.list_events()
+                   if manager.raw_versions(event['event_id'], 'api_response')), key=event_sort_key)
+
+
+def parse_event(event_data_dir: str, event_id: str) -> Dict[str, Any]:
+    """Parse one event's latest API response (runs in a worker process)
+
+    Returns:
+        {'event_id', 'log': the match records as encoded log lines,
+        'scores': [(player, 3DA x legs), ...] in record order,
+        'partial': new_database() structure holding only this event}
+    """
+    manager = EventDataManager(event_data_dir)
+    versions = manager.raw_versions(event_id, 'api_response')
+    # Records are dated by when the response was saved, which never changes between rebuilds
+    saved_at = versions[-1]['saved_at'] if versions else ''
+    try:
+        date = datetime.strptime(saved_at, "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        date = saved_at
+    records = api_match_records(event_id, manager.load_raw(event_id, 'api_response'), date)
+
+    partial = new_database()
+    for record in records:
+        apply_match_record(partial, record)
+    # Encoded here so the parent only concatenates bytes into the new log
+    return {
+        'event_id': event_id,
+        'log': b''.join(dumps(record, pretty=False) + b'\n' for record in records),
+        'scores': [(record['player'], _score(record['stats'])) for record in records],
+        'partial': partial
+    }
+
+
+def _score(stats: Dict[str, Any]) -> float:
+    """A match's contribution to total_score (as add_stats computes it)"""
+    return stats.get('three_dart_average', 0.0) * stats.get('legs_played', 1)
+
+
+def merge_partials(parts: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[bytes], int]:
+    """Merge per-event partial databases in order
+
+    total_score is re-summed from the per-match scores in log order, so the
+    floats come out exactly as replaying the log (rebuild()) would give them.
+    A part whose matches were already recorded by an earlier event (the same
+    DartConnect match saved under two event ids) is replayed record by record
+    instead, skipping the duplicates, as add_match_stats() would.
+
+    Returns:
+        (master database structure, log chunks in order, duplicate records skipped)
+    """
+    data = new_database()
+    chunks = []
+    scores = []
+    duplicates = 0
+    for part in parts:
+        partial = part['partial']
+        if any(match_id in data['scraped_matches'] and set(names) & set(data['scraped_matches'][match_id])
+               for match_id, names in partial['scraped_matches'].items()):
+            for line in part['log'].splitlines():
+                record = loads(line)
+                if record['player'] in data['scraped_matches'].get(record['match_id'], ()):
+                    duplicates += 1
+                    continue
+                apply_match_record(data, record)
+                chunks.append(line + b'\n')
+                scores.append((record['player'], _score(record['stats'])))
+            continue
+
+        for name, player in partial['players'].items():
+            merged = data['players'].setdefault(name, new_player(name))
+            for field in AGGREGATE_FIELDS:
+                if field == 'highest_finish':
+                    merged[field] = max(merged[field], player[field])
+                else:
+                    merged[field] += player[field]
+            merged['events_played'] |= player['events_played']
+        for event_id, event in partial['events'].items():
+            if event_id in data['events']:
+                for name in event['players']:
+                    if name not in data['events'][event_id]['players']:
+                        data['events'][event_id]['players'].append(name)
+            else:
+                data['events'][event_id] = event
+        for match_id, names in partial['scraped_matches'].items():
+            data['scraped_matches'].setdefault(match_id, []).extend(names)
+        data['metadata']['total_matches'] += partial['metadata']['total_matches']
+        chunks.append(part['log'])
+        scores.extend(part['scores'])
+
+    total_score = dict.fromkeys(data['players'], 0.0)
+    for name, score in scores:
+        total_score[name] += score
+    for name, player in data['players'].items():
+        player['total_score'] = total_score[name]
+    return data, chunks, duplicates
+
+
+def rebuild_series(event_data_dir: str, db_file: str, workers: Optional[int] = None) -> Dict[str, int]:
+    """Replace the master store with one rebuilt from every event's archived API response
+
+    The previous store (if any) is kept next to it as <file>.backup_<timestamp>,
+    and its hand-set fields (event winners, qualifier flags, TOC
+    qualification, series info) are carried over when it is a JSON store.
+    Stop the API server first: running processes keep serving their old view.
+
+    Args:
+        event_data_dir: EventDataManager base directory (e.g. data/event_data)
+        db_file: Master store to write (.json, or .db for the SQLite backend)
+        workers: Parser processes (default: one per CPU; 1 parses in this process)
+
+    Returns:
+        Counts of events, records, players and duplicates skipped
+    """
+    event_ids = discover_events(event_data_dir)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(event_ids) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(event_ids))) as pool:
+            parts = list(pool.map(parse_event, [event_data_dir] * len(event_ids), event_ids))
+    else:
+        parts = [parse_event(event_data_dir, event_id) for event_id in event_ids]
+
+    data, chunks, duplicates = merge_partials(parts)
+    metadata = data['metadata']
+    records = sum(chunk.count(b'\n') for chunk in chunks)
+    metadata['data_version'] = records
+    metadata['last_updated'] = max((event['date'] for event in data['events'].values()),
+                                   default=metadata['last_updated'])
+    _commit_store(db_file, data, chunks)
+    return {'events': len(event_ids), 'records': records, 'players': len(data['players']),
+            'duplicates': duplicates}
+
+
+def _commit_store(db_file: str, data: Dict[str, Any], chunks: List[bytes]):
+    """Write the rebuilt store beside db_file, then swap it in under the store's lock file"""
+    db_dir = os.path.dirname(os.path.abspath(db_file))
+    os.makedirs(db_dir, exist_ok=True)
+    sqlite = storage_backend_for(db_file) == 'sqlite'
+    suffix = '.backup_' + datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    with tempfile.TemporaryDirectory(dir=db_dir, prefix='.rebuild_') as tmp_dir:
+        with FileLock(db_file + '.lock'):
+            if not sqlite and os.path.exists(db_file):
+                old = load_file(db_file)
+                old.setdefault('players', {})
+                old.setdefault('events', {})
+                old.setdefault('metadata', {})
+                carry_over_manual_fields(old, data)
+
+            # The new store is complete on disk before anything is replaced
+            tmp_json = os.path.join(tmp_dir, 'aads_master_db.json')
+            data['metadata']['log_offset'] = MatchLog(match_log_path(tmp_json)).create_encoded(chunks)
+            with open(tmp_json, 'wb') as f:
+                f.write(dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            if sqlite:
+                from sqlite_manager import SQLiteDataManager
+                tmp_db = os.path.join(tmp_dir, 'aads_master.db')
+                store = SQLiteDataManager(tmp_db)
+                store.import_json(tmp_json)
+                store.close()
+                new_files = [(tmp_db, db_file)]
+                old_files = [db_file, db_file + '-wal', db_file + '-shm']
+            else:
+                # Log first: a checkpoint-less log is re-derived on open, never mixed with the old one
+                new_files = [(match_log_path(tmp_json), match_log_path(db_file)), (tmp_json, db_file)]
+                old_files = [db_file, match_log_path(db_file)]
+
+            for path in old_files:
+                if os.path.exists(path):
+                    shutil.move(path, path + suffix)
+            for tmp_path, path in new_files:
+                os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild the master stats store from the raw event archives")
+    parser.add_argument('--event-data', default='data/event_data', help='event data directory')
+    parser.add_argument('--db', default='data/aads_master_db.json', help='master store to write (.json or .db)')
+    parser.add_argument('--workers', type=int, default=None, help='parser processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    result = rebuild_series(args.event_data, args.db, args.workers)
+    print(f"Rebuilt {args.db}: {result['players']} players, {result['records']} records "
+          f"from {result['events']} events ({result['duplicates']} duplicate records skipped)")
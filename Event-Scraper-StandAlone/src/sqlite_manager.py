@@ -0,0 +1,709 @@
+"""
+AADS SQLite Storage Backend - Same interface as AADSDataManager, backed by SQLite
+Players, events, event history and scraped matches live in indexed tables,
+so inserts and lookups are row operations instead of whole-file rewrites
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Any, Iterable
+
+from columnar_stats import split_sort_key
+from database_manager import (
+    AGGREGATE_FIELDS, LEGACY_WHOLE_MATCH, AADSDataManager, add_stats, match_id_from_url,
+    migrate_scraped_matches, new_player, player_summary, rank_players, rank_totals, ranked_rows, split_row
+)
+from serializer import dumps_text, load_file, loads
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    total_legs INTEGER NOT NULL DEFAULT 0,
+    total_score REAL NOT NULL DEFAULT 0,
+    total_matches INTEGER NOT NULL DEFAULT 0,
+    matches_won INTEGER NOT NULL DEFAULT 0,
+    total_180s INTEGER NOT NULL DEFAULT 0,
+    total_160_plus INTEGER NOT NULL DEFAULT 0,
+    total_140_plus INTEGER NOT NULL DEFAULT 0,
+    total_100_plus INTEGER NOT NULL DEFAULT 0,
+    highest_finish INTEGER NOT NULL DEFAULT 0,
+    total_double_attempts INTEGER NOT NULL DEFAULT 0,
+    total_doubles_hit INTEGER NOT NULL DEFAULT 0,
+    qualified_for_toc INTEGER NOT NULL DEFAULT 0,
+    event_wins TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    date TEXT,
+    winner TEXT,
+    is_qualifier INTEGER NOT NULL DEFAULT 1
+);
+
+-- Who played in which event (events.players and players.events_played)
+CREATE TABLE IF NOT EXISTS event_players (
+    event_id TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    PRIMARY KEY (event_id, player_name)
+);
+CREATE INDEX IF NOT EXISTS idx_event_players_player ON event_players(player_name);
+
+CREATE TABLE IF NOT EXISTS event_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    match_url TEXT,
+    date TEXT NOT NULL,
+    stats TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_history_player ON event_history(player_name);
+CREATE INDEX IF NOT EXISTS idx_event_history_event ON event_history(event_id);
+
+-- Dedup index keyed by (match_id, player); player '*' marks a legacy whole-match entry
+CREATE TABLE IF NOT EXISTS scraped_matches (
+    match_id TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    PRIMARY KEY (match_id, player_name)
+) WITHOUT ROWID;
+
+-- Per-(player, event, phase, group) sums of event_history; filtered leaderboards
+-- merge these instead of scanning the history. '' stands for an unknown phase or
+-- group (NULLs would never collide in the primary key)
+CREATE TABLE IF NOT EXISTS player_partials (
+    player_name TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    phase TEXT NOT NULL DEFAULT '',
+    grp TEXT NOT NULL DEFAULT '',
+    records INTEGER NOT NULL DEFAULT 0,
+    total_legs INTEGER NOT NULL DEFAULT 0,
+    total_score REAL NOT NULL DEFAULT 0,
+    total_matches INTEGER NOT NULL DEFAULT 0,
+    matches_won INTEGER NOT NULL DEFAULT 0,
+    total_180s INTEGER NOT NULL DEFAULT 0,
+    total_160_plus INTEGER NOT NULL DEFAULT 0,
+    total_140_plus INTEGER NOT NULL DEFAULT 0,
+    total_100_plus INTEGER NOT NULL DEFAULT 0,
+    total_double_attempts INTEGER NOT NULL DEFAULT 0,
+    total_doubles_hit INTEGER NOT NULL DEFAULT 0,
+    highest_finish INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_name, event_id, phase, grp)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_player_partials_event ON player_partials(event_id);
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Statements are kept as module constants so sqlite3's statement cache
+# reuses the prepared statement on every call
+SQL_IS_SCRAPED = "SELECT 1 FROM scraped_matches WHERE match_id = ? AND player_name IN (?, ?)"
+SQL_MARK_SCRAPED = "INSERT OR IGNORE INTO scraped_matches (match_id, player_name) VALUES (?, ?)"
+SQL_INSERT_PLAYER = "INSERT OR IGNORE INTO players (name) VALUES (?)"
+SQL_UPDATE_PLAYER = """
+UPDATE players SET
+    total_legs = total_legs + ?,
+    total_score = total_score + ?,
+    total_matches = total_matches + ?,
+    matches_won = matches_won + ?,
+    total_180s = total_180s + ?,
+    total_160_plus = total_160_plus + ?,
+    total_140_plus = total_140_plus + ?,
+    total_100_plus = total_100_plus + ?,
+    total_double_attempts = total_double_attempts + ?,
+    total_doubles_hit = total_doubles_hit + ?,
+    highest_finish = MAX(highest_finish, ?)
+WHERE name = ?
+"""
+SQL_INSERT_EVENT = "INSERT OR IGNORE INTO events (event_id, date, winner, is_qualifier) VALUES (?, ?, ?, ?)"
+SQL_INSERT_EVENT_PLAYER = "INSERT OR IGNORE INTO event_players (event_id, player_name) VALUES (?, ?)"
+SQL_INSERT_HISTORY = "INSERT INTO event_history (player_name, event_id, match_url, date, stats) VALUES (?, ?, ?, ?, ?)"
+SQL_INCREMENT_MATCHES = "UPDATE metadata SET value = CAST(value AS INTEGER) + 1 WHERE key IN ('total_matches', 'data_version')"
+SQL_INCREMENT_VERSION = "UPDATE metadata SET value = CAST(value AS INTEGER) + 1 WHERE key = 'data_version'"
+SQL_PLAYER_HISTORY = "SELECT id, event_id, date, match_url, stats FROM event_history WHERE player_name = ? ORDER BY id"
+SQL_SET_METADATA = "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)"
+SQL_UPSERT_PARTIAL = """
+INSERT INTO player_partials (
+    player_name, event_id, phase, grp, records,
+    total_legs, total_score, total_matches, matches_won,
+    total_180s, total_160_plus, total_140_plus, total_100_plus,
+    total_double_attempts, total_doubles_hit, highest_finish
+) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (player_name, event_id, phase, grp) DO UPDATE SET
+    records = records + 1,
+    total_legs = total_legs + excluded.total_legs,
+    total_score = total_score + excluded.total_score,
+    total_matches = total_matches + excluded.total_matches,
+    matches_won = matches_won + excluded.matches_won,
+    total_180s = total_180s + excluded.total_180s,
+    total_160_plus = total_160_plus + excluded.total_160_plus,
+    total_140_plus = total_140_plus + excluded.total_140_plus,
+    total_100_plus = total_100_plus + excluded.total_100_plus,
+    total_double_attempts = total_double_attempts + excluded.total_double_attempts,
+    total_doubles_hit = total_doubles_hit + excluded.total_doubles_hit,
+    highest_finish = MAX(highest_finish, excluded.highest_finish)
+"""
+
+# Merge of the partials matching a filter, per player / event / phase / group
+SQL_MERGE_PARTIALS = """
+SELECT {key} AS key, SUM(records) AS records,
+       SUM(total_legs) AS total_legs, SUM(total_score) AS total_score,
+       SUM(total_matches) AS total_matches, SUM(matches_won) AS matches_won,
+       SUM(total_180s) AS total_180s, SUM(total_160_plus) AS total_160_plus,
+       SUM(total_140_plus) AS total_140_plus, SUM(total_100_plus) AS total_100_plus,
+       SUM(total_double_attempts) AS total_double_attempts, SUM(total_doubles_hit) AS total_doubles_hit,
+       MAX(highest_finish) AS highest_finish, COUNT(DISTINCT event_id) AS events_played
+FROM player_partials
+WHERE {where}
+GROUP BY {key}
+"""
+PARTIAL_KEYS = {'player': 'player_name', 'event': 'event_id', 'phase': 'phase', 'group': 'grp'}
+
+SQL_LEADERBOARD = """
+SELECT p.*, (SELECT COUNT(*) FROM event_players ep WHERE ep.player_name = p.name) AS events_count
+FROM players p
+ORDER BY p.rowid
+"""
+SQL_EVENTS_SUMMARY = """
+SELECT e.event_id, e.date, e.winner, e.is_qualifier,
+       (SELECT COUNT(*) FROM event_players ep WHERE ep.event_id = e.event_id) AS players_count
+FROM events e
+ORDER BY e.event_id
+"""
+
+
+class SQLiteDataManager:
+    def __init__(self, db_file: str = "data/aads_master.db", busy_timeout: float = 30.0):
+        """Open (or create) the SQLite stats database
+
+        Args:
+            db_file: Path to the SQLite database file
+            busy_timeout: Seconds a write waits for another process's transaction
+                (several server processes can share one database file)
+        """
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(self.db_file) if os.path.dirname(self.db_file) else ".", exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._snapshot = None
+        self.conn = sqlite3.connect(self.db_file, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create tables and default metadata if missing"""
+        with self._lock:
+            self._migrate_scraped_matches_v1()
+            self.conn.executescript(SCHEMA)
+            defaults = {
+                'last_updated': datetime.now().isoformat(),
+                'total_matches': 0,
+                'version': '1.0.0',
+                'schema_version': SCHEMA_VERSION,
+                'data_version': 0,
+                'series_info': {
+                    'qualifying_events': 6,
+                    'championship_event': 1,
+                    'current_event': 1
+                }
+            }
+            for key, value in defaults.items():
+                self.conn.execute("INSERT OR IGNORE INTO metadata (key, value) VALUES (?, ?)", (key, dumps_text(value)))
+            if self._get_metadata('schema_version') < 3:
+                # v2 databases have history but no partials yet
+                with self.batch():
+                    self._rebuild_partials()
+                    self.conn.execute(SQL_SET_METADATA, ('schema_version', dumps_text(SCHEMA_VERSION)))
+
+    def _migrate_scraped_matches_v1(self):
+        """Convert a schema v1 scraped_matches(match_url) table to (match_id, player_name)"""
+        columns = [row['name'] for row in self.conn.execute("PRAGMA table_info(scraped_matches)")]
+        if 'match_url' not in columns:
+            return
+
+        urls = [row['match_url'] for row in self.conn.execute("SELECT match_url FROM scraped_matches")]
+        self.conn.execute("DROP TABLE scraped_matches")
+        self.conn.executescript(SCHEMA)
+        self.conn.executemany(SQL_MARK_SCRAPED, [(match_id_from_url(url), LEGACY_WHOLE_MATCH) for url in urls])
+        self.conn.execute(SQL_SET_METADATA, ('schema_version', dumps_text(SCHEMA_VERSION)))
+
+    def _get_metadata(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return loads(row['value']) if row else default
+
+    # ==================== TRANSACTIONS ====================
+
+    @contextmanager
+    def batch(self):
+        """Group several mutations into one SQLite transaction
+
+        Commits when the outermost batch exits and rolls back if it raises.
+        Nested batches use savepoints, so a failed inner record is undone
+        without aborting the enclosing transaction.
+        """
+        with self._lock:
+            depth = self._batch_depth
+            if depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+            else:
+                self.conn.execute(f"SAVEPOINT sp_{depth}")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if depth == 0:
+                    self.conn.execute("ROLLBACK")
+                else:
+                    self.conn.execute(f"ROLLBACK TO sp_{depth}")
+                    self.conn.execute(f"RELEASE sp_{depth}")
+                raise
+            else:
+                self._batch_depth -= 1
+                if depth == 0:
+                    self.conn.execute(SQL_SET_METADATA, ('last_updated', dumps_text(datetime.now().isoformat())))
+                    self.conn.execute("COMMIT")
+                else:
+                    self.conn.execute(f"RELEASE sp_{depth}")
+
+    def flush(self) -> bool:
+        """Nothing is buffered outside SQLite; kept for interface parity"""
+        return True
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
+
+    # ==================== MUTATIONS ====================
+
+    def add_match_stats(self, player_name: str, event_id: str, stats_dict: Dict[str, Any] = None, match_url: str = None, **kwargs) -> bool:
+        """Add or update player stats for a specific match
+
+        Args:
+            player_name: Player's name
+            event_id: Event identifier
+            stats_dict: Dictionary of statistics (or use kwargs for individual fields)
+            match_url: Optional match URL to prevent duplicates
+            **kwargs: Individual stat fields (alternative to stats_dict)
+
+        Returns:
+            True if stats were added, False if duplicate or error
+        """
+        if stats_dict is None:
+            stats_dict = kwargs
+        else:
+            stats_dict = {**stats_dict, **kwargs}
+
+        try:
+            with self.batch():
+                return self._apply_match_stats(player_name, event_id, stats_dict, match_url)
+        except Exception as e:
+            print(f"Error adding match stats for {player_name}: {e}")
+            return False
+
+    def _apply_match_stats(self, player_name: str, event_id: str, stats_dict: Dict[str, Any], match_url: str) -> bool:
+        """Write one player/match record (caller holds an open transaction)"""
+        cur = self.conn
+        player_name = player_name.strip()
+
+        # Check for duplicate (match, player) if URL provided
+        if match_url:
+            match_id = match_id_from_url(match_url)
+            if cur.execute(SQL_IS_SCRAPED, (match_id, player_name, LEGACY_WHOLE_MATCH)).fetchone():
+                print(f"Match {match_url} already scraped for {player_name}. Skipping to prevent double-counting.")
+                return False
+            cur.execute(SQL_MARK_SCRAPED, (match_id, player_name))
+        now = datetime.now().isoformat()
+        increments = stat_increments(stats_dict)
+
+        cur.execute(SQL_INSERT_PLAYER, (player_name,))
+        cur.execute(SQL_UPDATE_PLAYER, increments + (player_name,))
+        cur.execute(SQL_UPSERT_PARTIAL, partial_key(player_name, event_id, stats_dict) + increments)
+        cur.execute(SQL_INSERT_EVENT, (event_id, now, None, 1))
+        cur.execute(SQL_INSERT_EVENT_PLAYER, (event_id, player_name))
+        cur.execute(SQL_INSERT_HISTORY, (player_name, event_id, match_url, now, dumps_text(stats_dict)))
+        cur.execute(SQL_INCREMENT_MATCHES)
+        return True
+
+    def add_match_stats_bulk(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Add stats for many player/match records in a single transaction
+
+        Args:
+            entries: Iterable of dicts with the add_match_stats() arguments
+
+        Returns:
+            Number of records that were added (duplicates are skipped)
+        """
+        added = 0
+        with self.batch():
+            for entry in entries:
+                if self.add_match_stats(**entry):
+                    added += 1
+        return added
+
+    def correct_match_stats(self, player_name: str, match_url: str, stats_dict: Dict[str, Any] = None, **kwargs) -> bool:
+        """Replace the recorded stats of one player in one match (e.g. after a re-scrape)
+
+        The history row is updated and the player's totals are recomputed from
+        their history rows.
+
+        Args:
+            player_name: Player's name
+            match_url: URL of the match the stats were recorded for
+            stats_dict: The corrected statistics (replace the recorded ones entirely)
+            **kwargs: Individual stat fields (alternative to stats_dict)
+
+        Returns:
+            True if the correction was recorded, False if there is nothing to correct
+        """
+        if stats_dict is None:
+            stats_dict = kwargs
+        else:
+            stats_dict = {**stats_dict, **kwargs}
+        player_name = player_name.strip()
+        match_id = match_id_from_url(match_url)
+
+        with self.batch():
+            rows = self.conn.execute(SQL_PLAYER_HISTORY, (player_name,)).fetchall()
+            matching = [row for row in rows if row['match_url'] and match_id_from_url(row['match_url']) == match_id]
+            if not matching:
+                print(f"No stats recorded for {player_name} in {match_url}; nothing to correct")
+                return False
+            self.conn.execute("UPDATE event_history SET stats = ? WHERE id = ?",
+                              (dumps_text(stats_dict), matching[-1]['id']))
+
+            totals = new_player(player_name)
+            self.conn.execute("DELETE FROM player_partials WHERE player_name = ?", (player_name,))
+            for row in rows:
+                row_stats = stats_dict if row['id'] == matching[-1]['id'] else loads(row['stats'])
+                add_stats(totals, row_stats)
+                self.conn.execute(SQL_UPSERT_PARTIAL,
+                                  partial_key(player_name, row['event_id'], row_stats) + stat_increments(row_stats))
+            self.conn.execute(
+                f"UPDATE players SET {', '.join(f'{field} = ?' for field in AGGREGATE_FIELDS)} WHERE name = ?",
+                [totals[field] for field in AGGREGATE_FIELDS] + [player_name]
+            )
+            self.conn.execute(SQL_INCREMENT_VERSION)
+        return True
+
+    # ==================== QUERIES ====================
+
+    @property
+    def data_version(self) -> int:
+        """Counter bumped on every mutation; cheap change detection for caches"""
+        with self._lock:
+            return self._get_metadata('data_version', 0)
+
+    def is_match_scraped(self, match_url: str, player_name: str) -> bool:
+        """Check whether stats for this player in this match were already recorded"""
+        with self._lock:
+            row = self.conn.execute(
+                SQL_IS_SCRAPED, (match_id_from_url(match_url), player_name.strip(), LEGACY_WHOLE_MATCH)
+            ).fetchone()
+        return row is not None
+
+    def get_all_stats(self) -> Dict[str, Any]:
+        """Get all player statistics"""
+        return self.get_stats_api_format()
+
+    def get_all_events(self) -> Dict[str, Any]:
+        """Get all events"""
+        return {'events': self.get_events_summary()}
+
+    def get_leaderboard(self) -> List[Dict[str, Any]]:
+        """Get current leaderboard with calculated averages and rankings"""
+        with self._lock:
+            rows = self.conn.execute(SQL_LEADERBOARD).fetchall()
+
+        players_list = []
+        for row in rows:
+            player_data = dict(row)
+            player_data['qualified_for_toc'] = bool(player_data['qualified_for_toc'])
+            player_data['event_wins'] = loads(player_data['event_wins'])
+            players_list.append(player_summary(row['name'], player_data, row['events_count']))
+
+        return rank_players(players_list)
+
+    def get_events_summary(self) -> List[Dict[str, Any]]:
+        """Get summary of all events"""
+        with self._lock:
+            rows = self.conn.execute(SQL_EVENTS_SUMMARY).fetchall()
+
+        return [{
+            'event_id': row['event_id'],
+            'event_name': f"Event {row['event_id']}",
+            'date': row['date'],
+            'players_count': row['players_count'],
+            'winner': row['winner'],
+            'is_qualifier': bool(row['is_qualifier'])
+        } for row in rows]
+
+    def get_top_players(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Get the top-N leaderboard rows"""
+        return self.get_stats_api_format()['players'][:n]
+
+    def get_player_rank(self, player_name: str):
+        """Get a player's current leaderboard rank (None if unknown)"""
+        player_name = player_name.strip()
+        for row in self.get_stats_api_format()['players']:
+            if row['name'] == player_name:
+                return row['rank']
+        return None
+
+    def get_player_history(self, player_name: str) -> List[Dict[str, Any]]:
+        """Get a player's recorded matches (event_id, date, match_url, stats)"""
+        with self._lock:
+            rows = self.conn.execute(SQL_PLAYER_HISTORY, (player_name.strip(),)).fetchall()
+        return [{'event_id': row['event_id'], 'date': row['date'], 'match_url': row['match_url'],
+                 'stats': loads(row['stats'])} for row in rows]
+
+    def get_match_history(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get every player's recorded matches, keyed by player"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT player_name, event_id, date, match_url, stats FROM event_history ORDER BY id"
+            ).fetchall()
+        history = {}
+        for row in rows:
+            history.setdefault(row['player_name'], []).append({
+                'event_id': row['event_id'], 'date': row['date'], 'match_url': row['match_url'],
+                'stats': loads(row['stats'])
+            })
+        return history
+
+    def _stored_players(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.conn.execute("SELECT name, qualified_for_toc, event_wins FROM players").fetchall()
+        return {row['name']: {'qualified_for_toc': bool(row['qualified_for_toc']),
+                              'event_wins': loads(row['event_wins'])} for row in rows}
+
+    def _merge_partials(self, by: str, events: Iterable[str] = None, phases: Iterable[str] = None,
+                        groups: Iterable[str] = None, scraped_since: str = None, player_name: str = None) -> List[Dict[str, Any]]:
+        """Sum the player_partials rows matching the filters, grouped by player/event/phase/group"""
+        where, params = ['records > 0'], []
+        for column, values in (('event_id', events), ('phase', phases), ('grp', groups)):
+            if values is not None:
+                values = ['' if value is None else value for value in values]
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if scraped_since is not None:
+            where.append("event_id IN (SELECT event_id FROM events WHERE date >= ?)")
+            params.append(scraped_since)
+        if player_name is not None:
+            where.append("player_name = ?")
+            params.append(player_name)
+
+        key = PARTIAL_KEYS[by]
+        sql = SQL_MERGE_PARTIALS.format(key=key, where=' AND '.join(where))
+        if by == 'player':
+            sql += " ORDER BY (SELECT rowid FROM players WHERE name = key)"  # first appearance
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        merged = []
+        for row in rows:
+            totals = dict(row)
+            label = totals.pop('key')
+            totals['name' if by == 'player' else by] = None if label == '' and by in ('phase', 'group') else label
+            merged.append(totals)
+        return merged
+
+    def query_leaderboard(self, events: Iterable[str] = None, phases: Iterable[str] = None,
+                          groups: Iterable[str] = None, scraped_since: str = None) -> List[Dict[str, Any]]:
+        """Leaderboard over a slice of the recorded matches (see AADSDataManager.query_leaderboard)
+
+        One GROUP BY over the player_partials rows in the slice.
+        """
+        totals = self._merge_partials('player', events, phases, groups, scraped_since)
+        return ranked_rows(rank_totals(totals), self._stored_players())
+
+    def get_player_splits(self, player_name: str, by: str = 'event') -> List[Dict[str, Any]]:
+        """A player's totals split per event, phase or group"""
+        totals = self._merge_partials(by, player_name=player_name.strip())
+        totals.sort(key=lambda t: split_sort_key(t[by]))
+        return [split_row(t, by) for t in totals]
+
+    def get_stats_api_format(self) -> Dict[str, Any]:
+        """Get data in the format expected by the stats display frontend
+
+        The result is a cached snapshot that is rebuilt only when
+        data_version changes; treat it as read-only.
+        """
+        with self._lock:
+            version = self._get_metadata('data_version', 0)
+            if self._snapshot is not None and self._snapshot['data_version'] == version:
+                return self._snapshot
+
+            self._snapshot = {
+                'players': self.get_leaderboard(),
+                'total_matches': self._get_metadata('total_matches', 0),
+                'events': self.get_events_summary(),
+                'last_updated': self._get_metadata('last_updated'),
+                'series_info': self._get_metadata('series_info', {}),
+                'data_version': version
+            }
+            return self._snapshot
+
+    def backup_database(self, backup_suffix: str = None) -> str:
+        """Create a consistent online backup of the database"""
+        if backup_suffix is None:
+            backup_suffix = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        backup_filename = f"{self.db_file}.backup_{backup_suffix}"
+
+        try:
+            with self._lock:
+                dest = sqlite3.connect(backup_filename)
+                try:
+                    self.conn.backup(dest)
+                finally:
+                    dest.close()
+            return backup_filename
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return None
+
+    def _rebuild_partials(self):
+        """Recompute player_partials from event_history (caller holds an open transaction)"""
+        self.conn.execute("DELETE FROM player_partials")
+        rows = self.conn.execute("SELECT player_name, event_id, stats FROM event_history ORDER BY id")
+        self.conn.executemany(SQL_UPSERT_PARTIAL, [
+            partial_key(row['player_name'], row['event_id'], stats) + stat_increments(stats)
+            for row in rows for stats in (loads(row['stats']),)
+        ])
+
+    # ==================== IMPORT ====================
+
+    def import_json(self, json_file: str) -> Dict[str, int]:
+        """One-shot import of an existing aads_master_db.json into this database
+
+        Existing rows with the same keys are replaced, so the import can be re-run.
+
+        Args:
+            json_file: Path to the JSON database written by AADSDataManager
+
+        Returns:
+            Counts of imported players, events, history records and scraped matches
+        """
+        data = load_file(json_file)
+        if 'log_offset' in data.get('metadata', {}):
+            # Match log layout: catch the checkpoint up and read the history from the log
+            source = AADSDataManager(json_file)
+            data = source.data
+            history = source.get_match_history()
+        else:
+            history = {name: player.get('event_history', []) for name, player in data.get('players', {}).items()}
+
+        players = data.get('players', {})
+        events = data.get('events', {})
+        metadata = data.get('metadata', {})
+        counts = {'players': 0, 'events': 0, 'event_history': 0, 'scraped_matches': 0}
+
+        with self.batch():
+            for event_id, event in events.items():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO events (event_id, date, winner, is_qualifier) VALUES (?, ?, ?, ?)",
+                    (event_id, event.get('date'), event.get('winner'), int(event.get('is_qualifier', True)))
+                )
+                for name in event.get('players', []):
+                    self.conn.execute(SQL_INSERT_EVENT_PLAYER, (event_id, name))
+                counts['events'] += 1
+
+            for name, player in players.items():
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO players (
+                        name, total_legs, total_score, total_matches, matches_won,
+                        total_180s, total_160_plus, total_140_plus, total_100_plus,
+                        highest_finish, total_double_attempts, total_doubles_hit,
+                        qualified_for_toc, event_wins
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    name,
+                    player.get('total_legs', 0),
+                    player.get('total_score', 0.0),
+                    player.get('total_matches', 0),
+                    player.get('matches_won', 0),
+                    player.get('total_180s', 0),
+                    player.get('total_160_plus', 0),
+                    player.get('total_140_plus', 0),
+                    player.get('total_100_plus', 0),
+                    player.get('highest_finish', 0),
+                    player.get('total_double_attempts', 0),
+                    player.get('total_doubles_hit', 0),
+                    int(player.get('qualified_for_toc', False)),
+                    dumps_text(player.get('event_wins', []))
+                ))
+                for event_id in player.get('events_played', []):
+                    self.conn.execute(SQL_INSERT_EVENT_PLAYER, (event_id, name))
+                for record in history.get(name, []):
+                    self.conn.execute(SQL_INSERT_HISTORY, (
+                        name,
+                        record.get('event_id'),
+                        record.get('match_url'),
+                        record.get('date', ''),
+                        dumps_text(record.get('stats', {}))
+                    ))
+                    counts['event_history'] += 1
+                counts['players'] += 1
+
+            self._rebuild_partials()
+
+            for match_id, match_players in migrate_scraped_matches(data.get('scraped_matches')).items():
+                for name in match_players:
+                    self.conn.execute(SQL_MARK_SCRAPED, (match_id, name))
+                    counts['scraped_matches'] += 1
+
+            self.conn.execute(SQL_SET_METADATA, ('total_matches', dumps_text(metadata.get('total_matches', 0))))
+            self.conn.execute(SQL_SET_METADATA, ('data_version', dumps_text(self._get_metadata('data_version', 0) + 1)))
+            if 'series_info' in metadata:
+                self.conn.execute(SQL_SET_METADATA, ('series_info', dumps_text(metadata['series_info'])))
+
+        return counts
+
+
+def stat_increments(stats_dict: Dict[str, Any]) -> tuple:
+    """Amounts one match adds to the aggregate columns (SQL_UPDATE_PLAYER / SQL_UPSERT_PARTIAL order)"""
+    legs_played = stats_dict.get('legs_played', 1)
+    return (
+        legs_played,
+        stats_dict.get('three_dart_average', 0.0) * legs_played,  # Weighted by legs
+        stats_dict.get('matches_played', 1),
+        stats_dict.get('match_won', 0),
+        stats_dict.get('count_180s', 0),
+        stats_dict.get('count_160_plus', 0),
+        stats_dict.get('count_140_plus', 0),
+        stats_dict.get('count_100_plus', 0),
+        stats_dict.get('double_attempts', 0),
+        stats_dict.get('doubles_hit', 0),
+        stats_dict.get('highest_finish', 0)
+    )
+
+
+def partial_key(player_name: str, event_id: str, stats_dict: Dict[str, Any]) -> tuple:
+    """player_partials primary key of one match ('' for an unknown phase or group)"""
+    return (player_name, event_id, stats_dict.get('phase') or '', stats_dict.get('group') or '')
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python sqlite_manager.py <aads_master_db.json> <aads_master.db>")
+        sys.exit(1)
+
+    manager = SQLiteDataManager(sys.argv[2])
+    result = manager.import_json(sys.argv[1])
+    print(f"Imported {result['players']} players, {result['events']} events, "
+          f"{result['event_history']} history records, {result['scraped_matches']} scraped matches")
+    manager.close()
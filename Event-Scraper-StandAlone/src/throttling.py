@@ -0,0 +1,91 @@
+"""
+Throttling helpers - Per-host rate limiting and retry with exponential backoff
+Shared by the scraper's HTTP/browser fetches and the bulk scraping pipeline
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    def __init__(self, min_interval_ms: float = 200):
+        """Space out requests to the same host
+
+        Args:
+            min_interval_ms: Minimum delay between two requests to one host
+                (config.json: scraper.delay_between_requests_ms)
+        """
+        self.min_interval = max(0.0, min_interval_ms) / 1000.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """Block until a request to url's host is allowed
+
+        Slots are reserved under the lock and slept outside it, so many
+        threads can wait on different hosts at once.
+
+        Returns:
+            Seconds slept
+        """
+        if self.min_interval <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def call_with_retries(func: Callable[[], Any], max_retries: int = 3, backoff_base: float = 0.5,
+                      backoff_max: float = 10.0, is_success: Callable[[Any], bool] = None,
+                      logger: logging.Logger = None, description: str = 'request') -> Any:
+    """Call func, retrying on exceptions (or unsuccessful results) with backoff
+
+    Args:
+        func: Zero-argument callable to run
+        max_retries: Retries after the first attempt (config.json: scraper.max_retries)
+        backoff_base: First retry delay in seconds; doubles each retry, with jitter
+        backoff_max: Cap for a single delay
+        is_success: Optional check on the result; a falsy check triggers a retry
+        logger: Logger for retry messages
+        description: Label used in log messages
+
+    Returns:
+        The last result (which may be unsuccessful once retries run out)
+
+    Raises:
+        The last exception if every attempt raised
+    """
+    logger = logger or logging.getLogger(__name__)
+    attempt = 0
+    while True:
+        try:
+            result = func()
+            if is_success is None or is_success(result):
+                return result
+            error = None
+        except Exception as e:
+            result = None
+            error = e
+
+        if attempt >= max_retries:
+            if error is not None:
+                raise error
+            return result
+
+        delay = min(backoff_max, backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        reason = f"error: {error}" if error is not None else "no result"
+        logger.warning(f"{description} failed ({reason}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+        attempt += 1
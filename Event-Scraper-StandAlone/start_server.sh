@@ -32,4 +32,9 @@ echo "Server will be available at: http://localhost:5000"
 echo "Press Ctrl+C to stop the server"
 echo ""
 
-python api_server.py
+# ./start_server.sh --production serves through wsgi.py (waitress) instead of the dev server
+if [ "$1" = "--production" ]; then
+    python wsgi.py
+else
+    python api_server.py
+fi
@@ -0,0 +1,3 @@
+"""
+Behavior tests for the Event Scraper (run with: python -m pytest)
+"""
@@ -0,0 +1,56 @@
+"""
+Shared fixtures: src/ on sys.path (the modules import each other flat, as in api_server.py)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from database_manager import AADSDataManager  # noqa: E402
+from event_data_manager import EventDataManager  # noqa: E402
+
+RECAP_URL = 'https://recap.dartconnect.com/matches/{}'
+
+
+def match_stats(average: float = 60.0, legs: int = 3, won: int = 1, **extra) -> dict:
+    """One player's stats for one match, as the scraper records them"""
+    return {'three_dart_average': average, 'legs_played': legs, 'match_won': won, **extra}
+
+
+@pytest.fixture
+def db_file(tmp_path) -> str:
+    return str(tmp_path / 'aads_master_db.json')
+
+
+@pytest.fixture
+def db(db_file):
+    manager = AADSDataManager(db_file=db_file)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def event_manager(tmp_path):
+    return EventDataManager(base_dir=str(tmp_path / 'event_data'))
+
+
+@pytest.fixture(scope='session')
+def api(tmp_path_factory):
+    """api_server imported inside an empty data directory
+
+    Its paths are relative to the working directory, which therefore stays in
+    the temporary directory until the session ends.
+    """
+    pytest.importorskip('flask')
+    pytest.importorskip('flask_cors')
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('server'))
+    try:
+        import api_server
+        yield api_server
+        api_server.db_manager.close()
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,173 @@
+"""
+AADSDataManager: dedup, batches, match-log replay and rebuild
+"""
+
+import threading
+
+import pytest
+
+from database_manager import AADSDataManager
+from match_log import MatchLog, match_log_path
+from serializer import load_file
+
+from .conftest import RECAP_URL, match_stats
+
+
+def test_batch_is_one_log_append(db):
+    log = MatchLog(match_log_path(db.db_file))
+    with db.batch():
+        for i in range(3):
+            db.add_match_stats(f'Player {i}', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+        # Nothing reaches the log until the batch exits
+        assert log.size() == 0
+
+    lines = open(log.path, 'rb').read().splitlines()
+    assert len(lines) == 3
+    assert b'"batch":3' in lines[0]
+
+
+def test_failed_batch_is_rolled_back(db):
+    db.add_match_stats('Alice', 'e1', match_stats(average=50.0), match_url=RECAP_URL.format('m1'))
+    log_size = MatchLog(match_log_path(db.db_file)).size()
+
+    with pytest.raises(RuntimeError):
+        with db.batch():
+            db.add_match_stats('Alice', 'e2', match_stats(average=90.0), match_url=RECAP_URL.format('m2'))
+            db.add_match_stats('Carol', 'e2', match_stats(), match_url=RECAP_URL.format('m2'))
+            raise RuntimeError('scrape failed half way')
+
+    assert MatchLog(match_log_path(db.db_file)).size() == log_size
+    assert set(db.data['players']) == {'Alice'}
+    assert db.data['players']['Alice']['total_matches'] == 1
+    assert 'e2' not in db.data['events']
+    # The rolled back matches can be recorded again
+    assert not db.is_match_scraped(RECAP_URL.format('m2'), 'Alice')
+    assert db.add_match_stats('Alice', 'e2', match_stats(), match_url=RECAP_URL.format('m2'))
+
+
+def test_duplicates_inside_one_batch_are_skipped(db):
+    url = RECAP_URL.format('m1')
+    added = db.add_match_stats_bulk([
+        {'player_name': 'Alice', 'event_id': 'e1', 'stats_dict': match_stats(), 'match_url': url},
+        {'player_name': 'Alice', 'event_id': 'e1', 'stats_dict': match_stats(), 'match_url': url},
+        {'player_name': 'Bob', 'event_id': 'e1', 'stats_dict': match_stats(won=0), 'match_url': url},
+    ])
+
+    assert added == 2
+    assert len(list(MatchLog(match_log_path(db.db_file)))) == 2
+
+
+def test_write_behind_checkpoints_on_flush(db_file):
+    db = AADSDataManager(db_file=db_file, write_behind=True, flush_interval=3600)
+    db.add_match_stats('Alice', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+    db.add_match_stats('Bob', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+    # Both records are in the log; the checkpoint waits for the timer or flush()
+    assert len(list(MatchLog(match_log_path(db_file)))) == 2
+
+    assert db.flush()
+    checkpoint = load_file(db_file)
+    assert set(checkpoint['players']) == {'Alice', 'Bob'}
+    assert checkpoint['metadata']['log_offset'] == MatchLog(match_log_path(db_file)).size()
+    db.close()
+
+
+def test_same_player_and_match_is_recorded_once(db):
+    url = RECAP_URL.format('m1')
+
+    assert db.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    assert not db.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    # The other player of the same match is not a duplicate
+    assert db.add_match_stats('Bob', 'e1', match_stats(won=0), match_url=url)
+
+    assert db.is_match_scraped(url, 'Alice')
+    assert db.is_match_scraped(url + '/', ' Alice ')  # same match id, name normalized
+    assert db.data['players']['Alice']['total_matches'] == 1
+    assert db.data['metadata']['total_matches'] == 2
+
+
+def test_dedup_survives_reopen(db_file):
+    url = RECAP_URL.format('m1')
+    db = AADSDataManager(db_file=db_file)
+    db.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    db.close()
+
+    reopened = AADSDataManager(db_file=db_file)
+    assert not reopened.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    assert reopened.data['players']['Alice']['total_matches'] == 1
+
+
+def test_second_manager_sees_appends_of_the_first(db_file):
+    writer = AADSDataManager(db_file=db_file)
+    reader = AADSDataManager(db_file=db_file)
+    writer.add_match_stats('Alice', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+
+    assert reader.is_match_scraped(RECAP_URL.format('m1'), 'Alice')
+    assert [row['name'] for row in reader.get_leaderboard()] == ['Alice']
+
+
+def test_concurrent_writers_lose_no_matches(db_file):
+    writers = [AADSDataManager(db_file=db_file) for _ in range(2)]
+
+    def record(db, worker):
+        for i in range(25):
+            db.add_match_stats(f'Player {i % 5}', 'e1', match_stats(), match_url=RECAP_URL.format(f'{worker}-{i}'))
+
+    threads = [threading.Thread(target=record, args=(writers[worker % 2], worker)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = AADSDataManager(db_file=db_file)
+    assert reopened.data['metadata']['total_matches'] == 100
+    assert sum(row['total_matches'] for row in reopened.get_leaderboard()) == 100
+    assert len(list(MatchLog(match_log_path(db_file)))) == 100
+
+
+def test_reopen_replays_records_after_the_checkpoint(db_file):
+    db = AADSDataManager(db_file=db_file, checkpoint_every=1)
+    db.add_match_stats('Alice', 'e1', match_stats(average=50.0, legs=2), match_url=RECAP_URL.format('m1'))
+    checkpoint_offset = load_file(db_file)['metadata']['log_offset']
+
+    # Appended to the log but not checkpointed (as after a crash)
+    db.checkpoint_every = 1000
+    db.add_match_stats('Alice', 'e2', match_stats(average=80.0, legs=2, count_180s=1),
+                       match_url=RECAP_URL.format('m2'))
+    assert load_file(db_file)['metadata']['log_offset'] == checkpoint_offset
+
+    reopened = AADSDataManager(db_file=db_file)
+    alice = reopened.data['players']['Alice']
+    assert alice['total_matches'] == 2
+    assert alice['total_legs'] == 4
+    assert alice['total_score'] == pytest.approx(260.0)
+    assert alice['total_180s'] == 1
+    assert alice['events_played'] == {'e1', 'e2'}
+    assert reopened.is_match_scraped(RECAP_URL.format('m2'), 'Alice')
+
+
+def test_rebuild_matches_incremental_totals_and_keeps_manual_fields(db):
+    for i, (player, average) in enumerate([('Alice', 70.0), ('Bob', 55.0), ('Alice', 64.0)]):
+        db.add_match_stats(player, 'e1', match_stats(average=average, highest_finish=100 + i),
+                           match_url=RECAP_URL.format(f'm{i}'))
+    db.correct_match_stats('Bob', RECAP_URL.format('m1'), match_stats(average=58.0, won=0))
+    db.data['players']['Alice']['qualified_for_toc'] = True
+    before = {name: dict(player) for name, player in db.data['players'].items()}
+
+    counts = db.rebuild()
+
+    assert counts == {'records': 4, 'players': 2, 'events': 1}
+    assert db.data['players'] == before
+    assert db.data['players']['Bob']['total_score'] == pytest.approx(58.0 * 3)
+
+
+def test_correction_replaces_the_recorded_stats(db):
+    url = RECAP_URL.format('m1')
+    db.add_match_stats('Alice', 'e1', match_stats(average=40.0, count_180s=2), match_url=url)
+
+    assert db.correct_match_stats('Alice', url, match_stats(average=45.0))
+    assert not db.correct_match_stats('Nobody', url, match_stats())
+
+    alice = db.data['players']['Alice']
+    assert alice['total_score'] == pytest.approx(45.0 * 3)
+    assert alice['total_180s'] == 0
+    assert db.get_player_history('Alice')[0]['stats']['three_dart_average'] == 45.0
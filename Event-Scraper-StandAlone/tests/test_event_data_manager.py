@@ -0,0 +1,164 @@
+"""
+EventDataManager: the status journal, the event catalog and the raw payload archive
+"""
+
+import os
+import threading
+
+from event_data_manager import ARCHIVE_DIR, CATALOG_FILE, EVENT_LOCK, EventDataManager
+from serializer import load_file
+
+from .conftest import RECAP_URL
+
+
+def _matches(*ids):
+    return [{'url': RECAP_URL.format(match_id), 'title': f'Match {match_id}'} for match_id in ids]
+
+
+def test_status_changes_of_two_managers_interleave(event_manager):
+    event_manager.save_event_matches('e1', _matches('a', 'b', 'c'))
+    other = EventDataManager(base_dir=event_manager.base_dir)
+    assert len(other.load_pending_matches('e1')) == 3
+
+    event_manager.update_match_status('e1', RECAP_URL.format('a'), 'completed')
+    other.update_match_status('e1', RECAP_URL.format('b'), 'error')
+    event_manager.update_match_status('e1', RECAP_URL.format('c'), 'completed')
+
+    for manager in (event_manager, other, EventDataManager(base_dir=event_manager.base_dir)):
+        assert [match['url'] for match in manager.load_pending_matches('e1')] == []
+        summary = manager.get_event_summary('e1')
+        assert (summary['completed'], summary['errors']) == (2, 1)
+
+
+def test_status_update_waits_for_the_event_file_lock(event_manager):
+    event_manager.save_event_matches('e1', _matches('a', 'b'))
+    other = EventDataManager(base_dir=event_manager.base_dir)
+    other.load_pending_matches('e1')  # index built before the other process writes
+
+    writer = threading.Thread(target=other.update_match_status, args=('e1', RECAP_URL.format('b'), 'completed'))
+    with event_manager._lock, event_manager._event_file_lock('e1'):
+        writer.start()
+        # The holder (another process) appends while the update waits for the lock
+        event_manager.update_match_status('e1', RECAP_URL.format('a'), 'completed')
+        writer.join(0.2)
+        assert writer.is_alive()
+    writer.join(5)
+
+    # The waiting update caught up with the holder's record before appending its own
+    assert other.get_event_summary('e1')['completed'] == 2
+    assert EventDataManager(base_dir=event_manager.base_dir).get_event_summary('e1')['completed'] == 2
+
+
+def test_status_update_of_an_unknown_event_creates_nothing(event_manager):
+    event_manager.update_match_status('nope', RECAP_URL.format('a'), 'completed')
+    assert not os.path.exists(os.path.join(event_manager.base_dir, 'nope'))
+
+
+def test_event_lock_file_lives_in_the_event_folder(event_manager):
+    event_manager.save_event_matches('e1', _matches('a'))
+    assert os.path.exists(os.path.join(event_manager.base_dir, 'e1', EVENT_LOCK))
+    assert [event['event_id'] for event in event_manager.list_events()] == ['e1']
+
+
+def test_catalog_round_trip(event_manager):
+    event_manager.save_event_matches('e1', _matches('a', 'b', 'c'))
+    event_manager.update_match_status('e1', RECAP_URL.format('a'), 'completed')
+    event_manager.update_match_status('e1', RECAP_URL.format('b'), 'error')
+
+    summary = event_manager.get_event_summary('e1')
+    assert (summary['total_matches'], summary['completed'], summary['pending'], summary['errors']) == (3, 1, 1, 1)
+
+    # A new manager (another process, or a restart) serves the summaries from catalog.json
+    catalog = load_file(os.path.join(event_manager.base_dir, CATALOG_FILE))
+    assert set(catalog['events']) == {'e1'}
+    reopened = EventDataManager(base_dir=event_manager.base_dir)
+    assert reopened.list_events() == event_manager.list_events()
+    assert reopened.get_event_summary('e1') == summary
+
+
+def test_catalog_picks_up_writes_of_another_manager(event_manager):
+    event_manager.save_event_matches('e1', _matches('a', 'b'))
+    other = EventDataManager(base_dir=event_manager.base_dir)
+    assert other.get_event_summary('e1')['pending'] == 2
+
+    event_manager.update_match_status('e1', RECAP_URL.format('a'), 'completed')
+    event_manager.save_event_matches('e2', _matches('x'))
+
+    assert other.get_event_summary('e1')['completed'] == 1
+    assert {event['event_id'] for event in other.list_events()} == {'e1', 'e2'}
+
+
+def test_catalog_skips_the_archive_folder(event_manager):
+    event_manager.save_event_matches('e1', _matches('a'), raw_api_response={'payload': [1, 2, 3]})
+
+    assert os.path.isdir(os.path.join(event_manager.base_dir, ARCHIVE_DIR))
+    assert [event['event_id'] for event in event_manager.list_events()] == ['e1']
+    assert event_manager.get_event_summary(ARCHIVE_DIR) == {'error': 'Event not found'}
+
+
+def test_raw_payload_round_trip(event_manager):
+    api_response = {'payload': {'matches': [{'mi': 1, 'hc': 'Alice'}]}, 'version': 'x1'}
+    event_manager.save_event_matches('e1', _matches('a'), raw_api_response=api_response)
+
+    assert event_manager.load_raw('e1', 'api_response') == api_response
+    assert event_manager.load_raw('e1', 'matches')['matches'] == _matches('a')
+    assert event_manager.load_raw('e1', 'api_response', version=5) is None
+    with event_manager.open_raw('e1', 'api_response') as stream:
+        assert stream.read().startswith(b'{')
+
+
+def test_identical_payloads_are_stored_once(event_manager):
+    api_response = {'payload': 'same'}
+    event_manager.save_event_matches('e1', _matches('a'), raw_api_response=api_response)
+    event_manager.save_event_matches('e2', _matches('b'), raw_api_response=api_response)
+
+    digests = [record['sha256'] for event_id in ('e1', 'e2')
+               for record in event_manager.raw_versions(event_id, 'api_response')]
+    assert digests[0] == digests[1]
+    assert event_manager.archive.exists(digests[0])
+
+
+def test_new_versions_are_kept_up_to_raw_retention(tmp_path):
+    manager = EventDataManager(base_dir=str(tmp_path / 'event_data'), raw_retention=2)
+    for i in range(4):
+        manager.save_event_matches('e1', _matches(*range(i + 1)), raw_api_response={'poll': i})
+
+    versions = manager.raw_versions('e1', 'api_response')
+    assert len(versions) == 2
+    assert manager.load_raw('e1', 'api_response') == {'poll': 3}
+    assert manager.load_raw('e1', 'api_response', version=0) == {'poll': 2}
+    assert len(manager.get_existing_matches('e1')) == 4
+
+
+def test_compact_archive_keeps_referenced_objects(event_manager):
+    event_manager.save_event_matches('e1', _matches('a'), raw_api_response={'payload': 1})
+    orphan, _, _ = event_manager.archive.put({'orphan': True})
+    os.utime(event_manager.archive._path(orphan), (0, 0))  # older than the grace period
+
+    result = event_manager.compact_archive()
+
+    assert result['deleted_objects'] == 1
+    assert not event_manager.archive.exists(orphan)
+    assert event_manager.load_raw('e1', 'api_response') == {'payload': 1}
+
+
+def test_retention_rewrite_waits_for_the_event_file_lock(tmp_path):
+    base_dir = str(tmp_path / 'event_data')
+    manager = EventDataManager(base_dir=base_dir, raw_retention=1)
+    other = EventDataManager(base_dir=base_dir, raw_retention=1)
+    manager.save_event_matches('e1', _matches('a'), raw_api_response={'poll': 0})
+
+    saver = threading.Thread(target=other.save_event_matches, args=('e1', _matches('a', 'b')),
+                             kwargs={'raw_api_response': {'poll': 2}})
+    with manager._lock, manager._event_file_lock('e1'):
+        saver.start()
+        # Appended by the holder while the other save (and its retention rewrite) waits
+        manager._archive_payload('e1', 'api_response', {'poll': 1}, '20250101_000000')
+        saver.join(0.2)
+        assert saver.is_alive()
+    saver.join(5)
+
+    # The waiting save trimmed the manifest after the holder's append, not over it
+    assert [version['size'] > 0 for version in manager.raw_versions('e1')] == [True, True]
+    assert manager.load_raw('e1', 'api_response') == {'poll': 2}
+    assert len(manager.get_existing_matches('e1')) == 2
@@ -0,0 +1,156 @@
+"""
+HTTPCache: TTLs, conditional revalidation, LRU eviction and offline replay
+"""
+
+import os
+
+import pytest
+import requests
+
+from http_cache import HTTPCache, IMMUTABLE, OfflineCacheMiss
+
+RECAP = 'https://recap.dartconnect.com/matches/abc'
+LISTING = 'https://tv.dartconnect.com/api/event/e1/matches'
+
+
+class FakeSession:
+    """Answers every request with the next queued (status, body, headers) and records what was sent"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.sent.append((method, url, dict(headers or {})))
+        status, content, headers = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(cache_dir=str(tmp_path / 'http_cache'))
+
+
+def test_ttl_rules(cache):
+    assert cache.ttl_for(RECAP) is IMMUTABLE
+    assert cache.ttl_for(LISTING) == 60
+    assert cache.ttl_for('https://example.com/') == 0
+
+
+def test_immutable_recap_is_fetched_once(cache):
+    session = FakeSession((200, b'<html>recap</html>', {}))
+
+    first = cache.get(session, RECAP)
+    second = cache.get(session, RECAP)
+
+    assert not first.from_cache and second.from_cache
+    assert second.text == '<html>recap</html>'
+    assert len(session.sent) == 1
+
+
+def test_expired_entry_is_revalidated_with_a_304(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), ttl_rules=[(r'.', 0)])
+    session = FakeSession((200, b'{"matches": []}', {'ETag': '"v1"', 'Last-Modified': 'Sat, 01 Jun 2024 10:00:00 GMT'}),
+                          (304, b'', {}))
+
+    cache.get(session, LISTING)
+    revalidated = cache.get(session, LISTING)
+
+    assert session.sent[1][2]['If-None-Match'] == '"v1"'
+    assert session.sent[1][2]['If-Modified-Since'] == 'Sat, 01 Jun 2024 10:00:00 GMT'
+    assert revalidated.from_cache
+    assert revalidated.json() == {'matches': []}
+    assert cache.stats['revalidated'] == 1
+
+
+def test_revalidate_asks_even_while_fresh(cache):
+    session = FakeSession((200, b'[1]', {'ETag': '"v1"'}), (200, b'[1, 2]', {'ETag': '"v2"'}))
+
+    cache.get(session, LISTING)
+    changed = cache.get(session, LISTING, revalidate=True)
+
+    assert not changed.from_cache
+    assert changed.json() == [1, 2]
+    assert cache.get(session, LISTING).json() == [1, 2]
+
+
+def test_errors_are_not_stored(cache):
+    session = FakeSession((500, b'oops', {}), (200, b'ok', {}))
+
+    assert cache.get(session, RECAP).status_code == 500
+    assert cache.get(session, RECAP).text == 'ok'
+    assert len(session.sent) == 2
+
+
+def test_network_error_serves_the_stale_copy(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), ttl_rules=[(r'.', 0)])
+    cache.get(FakeSession((200, b'[1]', {})), LISTING)
+
+    class DownSession:
+        def request(self, *args, **kwargs):
+            raise requests.ConnectionError('offline')
+
+    assert cache.get(DownSession(), LISTING).json() == [1]
+    assert cache.stats['stale_served'] == 1
+
+
+def test_offline_mode_replays_and_raises_on_a_miss(tmp_path):
+    cache_dir = str(tmp_path / 'http_cache')
+    HTTPCache(cache_dir=cache_dir, ttl_rules=[(r'.', 0)]).get(FakeSession((200, b'[1]', {})), LISTING)
+    offline = HTTPCache(cache_dir=cache_dir, offline=True)
+    session = FakeSession()
+
+    # Expired entries are still served offline
+    assert offline.get(session, LISTING).json() == [1]
+    with pytest.raises(OfflineCacheMiss):
+        offline.get(session, RECAP)
+    assert session.sent == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), max_size_mb=0.0005)  # ~524 bytes
+    # Incompressible ~230 byte bodies: two fit, the third forces an eviction
+    session = FakeSession(*((200, os.urandom(200), {}) for _ in range(3)))
+
+    cache.get(session, RECAP + '1')
+    cache.get(session, RECAP + '2')
+    cache.get(session, RECAP + '1')  # hit: 2 is now the least recently used
+    cache.get(session, RECAP + '3')
+
+    assert cache.stale('GET', RECAP + '1') is not None
+    assert cache.stale('GET', RECAP + '2') is None
+    assert cache.size_bytes() <= cache.max_bytes
+    assert cache.stats['evictions'] == 1
+
+
+def test_evicting_an_entry_with_a_shared_body_is_not_counted(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path / 'http_cache'), max_size_mb=0.0005)
+    shared = os.urandom(300)
+    session = FakeSession((200, shared, {}), (200, shared, {}), (200, os.urandom(300), {}))
+
+    cache.get(session, RECAP + '1')
+    cache.get(session, RECAP + '2')
+    cache.get(session, RECAP + '3')
+
+    # Dropping the first entry freed nothing (its body is shared); the second freed the body
+    assert cache.stats['evictions'] == 1
+    assert len(cache) == 1
+
+
+def test_flush_persists_access_times_of_hits(tmp_path):
+    cache_dir = str(tmp_path / 'http_cache')
+    writer = HTTPCache(cache_dir=cache_dir)
+    writer.get(FakeSession((200, b'recap', {})), RECAP)
+    stored_at = HTTPCache(cache_dir=cache_dir)._index[writer._key('GET', RECAP)]['last_access']
+
+    reader = HTTPCache(cache_dir=cache_dir)
+    reader.get(FakeSession(), RECAP)
+    reader.flush()
+
+    assert HTTPCache(cache_dir=cache_dir)._index[writer._key('GET', RECAP)]['last_access'] > stored_at
@@ -0,0 +1,65 @@
+"""
+Inertia data-page extraction: the attribute scanner agrees with the BeautifulSoup reference
+"""
+
+import html
+import json
+
+import pytest
+
+from inertia import extract_data_page, extract_data_page_soup
+
+PAGE = {
+    'component': 'Match/Recap',
+    'props': {
+        'matchInfo': {'title': 'Alice vs Bob <Final>', 'venue': "O'Neill's & Co"},
+        'segments': {'1': [{'score': 180, 'note': '"max"'}]},
+    },
+    'url': '/matches/abc',
+    'version': 'a1b2',
+}
+
+
+def _html(attribute: str, before: str = '', after: str = '') -> str:
+    return (f'<!DOCTYPE html><html><head><title>Recap</title></head><body>{before}'
+            f'{attribute}</div>{after}<script src="/js/app.js"></script></body></html>')
+
+
+def test_double_quoted_attribute():
+    page = _html(f'<div id="app" data-page="{html.escape(json.dumps(PAGE))}">')
+    assert extract_data_page(page) == PAGE
+    assert extract_data_page(page) == extract_data_page_soup(page)
+
+
+def test_single_quoted_attribute_after_other_attributes():
+    escaped = html.escape(json.dumps(PAGE), quote=False).replace("'", '&#039;')
+    page = _html(f"<div class='container' data-page='{escaped}' id='app'>")
+    assert extract_data_page(page) == PAGE
+
+
+def test_numeric_and_named_entities():
+    escaped = html.escape(json.dumps({'name': 'Zoë – é', 'n': 1}), quote=True)
+    escaped = escaped.replace('1', '&#49;')
+    page = _html(f'<div id="app" data-page="{escaped}">')
+    assert extract_data_page(page) == {'name': 'Zoë – é', 'n': 1}
+
+
+def test_data_page_outside_the_app_div_is_ignored():
+    other = html.escape(json.dumps({'component': 'Other'}))
+    page = _html(f'<div id="app" data-page="{html.escape(json.dumps(PAGE))}">',
+                 before=f'<div id="modal" data-page="{other}"></div>')
+    assert extract_data_page(page) == PAGE
+
+
+@pytest.mark.parametrize('page', [
+    '',
+    '<html><body><div id="app"></div></body></html>',
+    _html('<div id="app" data-page="{not json">'),
+])
+def test_pages_without_a_valid_payload(page):
+    assert extract_data_page(page) is None
+
+
+def test_unquoted_attribute_falls_back_to_the_html_parser():
+    page = _html('<div id=app data-page={"component":"Match/Recap"}>')
+    assert extract_data_page(page) == {'component': 'Match/Recap'}
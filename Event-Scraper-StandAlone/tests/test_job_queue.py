@@ -0,0 +1,113 @@
+"""
+JobQueue: execution, progress streaming, persistence and batched log writes
+"""
+
+import threading
+
+import pytest
+
+from job_queue import JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JobQueue
+from serializer import load_file
+
+
+@pytest.fixture
+def jobs_dir(tmp_path):
+    return str(tmp_path / 'jobs')
+
+
+@pytest.fixture
+def job_queue(jobs_dir):
+    queue = JobQueue(jobs_dir=jobs_dir, workers=1, poll_interval=0.05)
+    yield queue
+    queue.stop(timeout=5)
+
+
+def _finish(queue, job_id):
+    """Follow a job to its end; returns (log lines, final snapshot)"""
+    lines = []
+    for kind, _, value in queue.stream(job_id, heartbeat_seconds=5):
+        if kind == 'log':
+            lines.append(value)
+        elif kind == 'done':
+            return lines, value
+
+
+def test_job_runs_and_streams_its_progress(job_queue):
+    def handler(params, log_step):
+        for i in range(params['steps']):
+            log_step(f'step {i}')
+        return {'success': True, 'steps': params['steps']}
+
+    job_queue.register('count', handler)
+    job_id = job_queue.submit('count', {'steps': 3})
+    lines, job = _finish(job_queue, job_id)
+
+    assert lines == ['step 0', 'step 1', 'step 2']
+    assert job['status'] == JOB_COMPLETED
+    assert job['result'] == {'success': True, 'steps': 3}
+    assert job['log_lines'] == 3
+
+
+def test_failures_are_recorded(job_queue):
+    def crash(params, log_step):
+        raise RuntimeError('DartConnect is down')
+
+    job_queue.register('crash', crash)
+    job_queue.register('refuse', lambda params, log_step: {'success': False, 'error': 'event not found'})
+
+    assert _finish(job_queue, job_queue.submit('crash', {}))[1]['error'] == 'DartConnect is down'
+    refused = _finish(job_queue, job_queue.submit('refuse', {}))[1]
+    assert (refused['status'], refused['error']) == (JOB_FAILED, 'event not found')
+
+
+def test_unknown_job_type_is_rejected(job_queue):
+    with pytest.raises(ValueError):
+        job_queue.submit('nope', {})
+
+
+def test_queued_jobs_survive_a_restart(jobs_dir):
+    queue = JobQueue(jobs_dir=jobs_dir, poll_interval=0.05)
+    queue.register('echo', lambda params, log_step: {'echo': params['value']})
+    # Submitted but never started (as if the server stopped right away)
+    queue._started = True
+    job_id = queue.submit('echo', {'value': 42})
+    assert load_file(f'{jobs_dir}/{job_id}.json')['status'] == JOB_QUEUED
+
+    restarted = JobQueue(jobs_dir=jobs_dir, poll_interval=0.05)
+    restarted.register('echo', lambda params, log_step: {'echo': params['value']})
+    restarted.start()
+    try:
+        assert _finish(restarted, job_id)[1]['result'] == {'echo': 42}
+    finally:
+        restarted.stop(timeout=5)
+
+
+def test_progress_lines_are_written_in_batches(jobs_dir):
+    queue = JobQueue(jobs_dir=jobs_dir, workers=1, poll_interval=0.05, log_flush_lines=10, log_flush_seconds=60)
+    release = threading.Event()
+
+    def handler(params, log_step):
+        for i in range(25):
+            log_step(f'line {i}')
+        release.wait(5)
+        return {'success': True}
+
+    queue.register('chatty', handler)
+    job_id = queue.submit('chatty', {})
+    job_file = f'{jobs_dir}/{job_id}.json'
+    try:
+        # Followers in this process see every line at once...
+        seen = []
+        for kind, _, value in queue.stream(job_id, heartbeat_seconds=5):
+            seen.append(value)
+            if len(seen) == 25:
+                break
+        # ...while the file holds only the completed batches of 10
+        assert len(load_file(job_file)['log']) == 20
+    finally:
+        release.set()
+    _finish(queue, job_id)
+    queue.stop(timeout=5)
+
+    # The status change writes the rest
+    assert len(load_file(job_file)['log']) == 25
@@ -0,0 +1,119 @@
+"""
+Sliced leaderboards and player splits, on both storage backends and with or without NumPy
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+import database_manager
+from sqlite_manager import SQLiteDataManager
+
+from .conftest import RECAP_URL, match_stats
+
+# (player, event, match, phase, group, average)
+MATCHES = [
+    ('Alice', 'e1', 'm1', 'round_robin', 'A', 62.0),
+    ('Bob', 'e1', 'm1', 'round_robin', 'A', 58.0),
+    ('Carol', 'e1', 'm2', 'round_robin', 'B', 71.0),
+    ('Dave', 'e1', 'm2', 'round_robin', 'B', 49.0),
+    ('Alice', 'e1', 'm3', 'final', None, 80.0),
+    ('Carol', 'e1', 'm3', 'final', None, 66.0),
+    ('Alice', 'e2', 'm4', 'round_robin', 'A', 55.0),
+    ('Dave', 'e2', 'm4', 'round_robin', 'A', 75.0),
+]
+
+SLICES = [
+    {},
+    {'events': ['e1']},
+    {'phases': ['round_robin']},
+    {'phases': ['round_robin'], 'groups': ['A']},
+    {'phases': ['final']},
+    {'events': ['e2'], 'groups': ['B']},
+]
+
+
+def record_matches(db):
+    for player, event_id, match_id, phase, group, average in MATCHES:
+        stats = match_stats(average=average, phase=phase, **({'group': group} if group else {}))
+        db.add_match_stats(player, event_id, stats, match_url=RECAP_URL.format(match_id))
+
+
+def names(rows):
+    return [row['name'] for row in rows]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def json_db(request, db, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(database_manager, 'NUMPY_AVAILABLE', False)
+    record_matches(db)
+    return db
+
+
+def test_slices(json_db):
+    assert names(json_db.query_leaderboard(phases=['round_robin'], groups=['A'])) == ['Dave', 'Alice', 'Bob']
+    assert names(json_db.query_leaderboard(phases=['final'])) == ['Alice', 'Carol']
+    assert names(json_db.query_leaderboard(events=['e2'])) == ['Dave', 'Alice']
+    assert json_db.query_leaderboard(events=['e2'], groups=['B']) == []
+
+    final = json_db.query_leaderboard(phases=['final'])[0]
+    assert (final['total_average'], final['total_matches'], final['events_played']) == (80.0, 1, 1)
+
+
+def test_unfiltered_query_matches_the_maintained_leaderboard(json_db):
+    assert json_db.query_leaderboard() == json_db.get_stats_api_format()['players']
+
+
+def test_player_splits(json_db):
+    by_phase = json_db.get_player_splits('Alice', by='phase')
+    assert {row['phase']: row['total_matches'] for row in by_phase} == {'round_robin': 2, 'final': 1}
+    by_event = json_db.get_player_splits('Alice', by='event')
+    assert [(row['event'], row['total_average']) for row in by_event] == [('e1', 71.0), ('e2', 55.0)]
+
+
+def test_slices_agree_across_backends(db, tmp_path):
+    sqlite_db = SQLiteDataManager(str(tmp_path / 'aads_master.db'))
+    record_matches(db)
+    record_matches(sqlite_db)
+    try:
+        for query in SLICES:
+            assert sqlite_db.query_leaderboard(**query) == db.query_leaderboard(**query), query
+        for by in ('event', 'phase', 'group'):
+            assert sqlite_db.get_player_splits('Alice', by=by) == db.get_player_splits('Alice', by=by)
+    finally:
+        sqlite_db.close()
+
+
+def test_partials_follow_new_matches_and_corrections(json_db):
+    json_db.query_leaderboard(phases=['final'])  # builds the partials
+    json_db.add_match_stats('Bob', 'e2', match_stats(average=90.0, phase='final'), match_url=RECAP_URL.format('m5'))
+    json_db.correct_match_stats('Alice', RECAP_URL.format('m3'), match_stats(average=60.0, phase='final'))
+
+    assert names(json_db.query_leaderboard(phases=['final'])) == ['Bob', 'Carol', 'Alice']
+
+
+def test_scraped_since_filters_on_when_events_were_first_recorded(db):
+    record_matches(db)
+    today = date.today()
+
+    assert names(db.query_leaderboard(scraped_since=(today - timedelta(days=1)).isoformat())) == \
+        names(db.query_leaderboard())
+    assert db.query_leaderboard(scraped_since=(today + timedelta(days=1)).isoformat()) == []
+    assert names(db.query_leaderboard(events=['e2'], scraped_since=today.isoformat())) == ['Dave', 'Alice']
+
+
+def test_leaderboard_endpoint_filters_and_rejects_a_bad_date(api):
+    client = api.app.test_client()
+    record_matches(api.db_manager)
+
+    response = client.get('/api/leaderboard?phase=round_robin&group=A&scraped_since=2000-01-01')
+    assert response.status_code == 200
+    assert response.json['filters']['groups'] == ['A']
+    assert names(response.json['players']) == ['Dave', 'Alice', 'Bob']
+
+    bad = client.get('/api/leaderboard?scraped_since=last-week')
+    assert bad.status_code == 400
+    assert not bad.json['success']
@@ -0,0 +1,101 @@
+"""
+EventTailer: new completed matches handed on once, cursor resume after a restart
+"""
+
+from live_tail import EventTailer, load_tail_cursor, request_tail_stop
+
+
+class FakeResponse:
+    def __init__(self, api_data, status_code=200, from_cache=False):
+        self._api_data = api_data
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+    def json(self):
+        return self._api_data
+
+
+class FakeScraper:
+    """Answers each matches API request with the next queued response (the last one repeats)"""
+    http_cache = None
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def fetch_event_matches_api(self, event_id, revalidate=False):
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+def _completed(*ids):
+    """Matches API response; DartConnect lists the newest completed match first"""
+    return FakeResponse({'status': 'OK', 'payload': {'completed': [
+        {'mi': match_id, 'hcf': f'Home {match_id}', 'acf': f'Away {match_id}'} for match_id in reversed(ids)
+    ]}})
+
+
+def _tailer(event_manager, scraper, handed_on):
+    return EventTailer(scraper, event_manager, 'mt_live_1', on_new_matches=handed_on.extend,
+                       min_interval=0.01, max_interval=0.01, idle_timeout=0)
+
+
+def _ids(matches):
+    return sorted(match['url'].rsplit('/', 1)[-1] for match in matches)
+
+
+def test_only_newly_completed_matches_are_handed_on(event_manager):
+    handed_on = []
+    tailer = _tailer(event_manager, FakeScraper(_completed('a'), _completed('a', 'b', 'c')), handed_on)
+
+    assert _ids(tailer.poll()) == ['a']
+    assert _ids(tailer.poll()) == ['b', 'c']
+    assert tailer.poll() == []
+
+    assert _ids(handed_on) == ['a', 'b', 'c']
+    assert len(event_manager.get_existing_matches('mt_live_1')) == 3
+    cursor = load_tail_cursor(event_manager.base_dir, 'mt_live_1')
+    assert (sorted(cursor['seen']), cursor['polls'], cursor['new_matches']) == (['a', 'b', 'c'], 3, 3)
+
+
+def test_restarted_tail_resumes_from_the_cursor(event_manager):
+    first = []
+    _tailer(event_manager, FakeScraper(_completed('a', 'b')), first).poll()
+
+    # A new process: same event folder, the API now lists one more match
+    resumed = []
+    tailer = _tailer(event_manager, FakeScraper(_completed('a', 'b', 'c')), resumed)
+    assert _ids(tailer.poll()) == ['c']
+    assert _ids(first) == ['a', 'b'] and _ids(resumed) == ['c']
+    assert load_tail_cursor(event_manager.base_dir, 'mt_live_1')['polls'] == 2
+
+
+def test_cached_answer_after_a_full_list_is_not_parsed(event_manager):
+    cached = _completed('a', 'b')
+    cached.from_cache = True
+    handed_on = []
+    tailer = _tailer(event_manager, FakeScraper(_completed('a'), cached), handed_on)
+
+    tailer.poll()
+    # The 304 means the list is unchanged since this tailer last read it
+    assert tailer.poll() == []
+    assert _ids(handed_on) == ['a']
+
+
+def test_failed_poll_leaves_the_cursor_where_it_was(event_manager):
+    handed_on = []
+    tailer = _tailer(event_manager, FakeScraper(_completed('a'), FakeResponse(None, status_code=503)), handed_on)
+
+    tailer.poll()
+    assert tailer.poll() is None
+    assert load_tail_cursor(event_manager.base_dir, 'mt_live_1')['seen'] == ['a']
+
+
+def test_run_stops_when_idle_or_asked(event_manager):
+    handed_on = []
+    result = _tailer(event_manager, FakeScraper(_completed('a')), handed_on).run()
+    assert (result['stopped'], result['polls'], result['new_matches']) == ('idle', 2, 1)
+
+    request_tail_stop(event_manager.base_dir, 'mt_live_1')
+    result = _tailer(event_manager, FakeScraper(_completed('a', 'b')), handed_on).run()
+    assert (result['stopped'], result['polls'], result['matches_seen']) == ('requested', 0, 1)
+    # The stop request is used up
+    assert _tailer(event_manager, FakeScraper(_completed('a', 'b')), handed_on).run()['new_matches'] == 1
@@ -0,0 +1,82 @@
+"""
+MatchLog: all-or-nothing batches and repair of interrupted appends
+"""
+
+from match_log import MatchLog, match_log_path
+
+from .conftest import RECAP_URL, match_stats
+
+
+def _log_with(tmp_path, *batches):
+    log = MatchLog(str(tmp_path / 'test.matches.jsonl'))
+    offset = 0
+    for records in batches:
+        offset = log.append([dict(record) for record in records])
+    return log, offset
+
+
+def test_read_yields_records_with_resume_offsets(tmp_path):
+    log, end = _log_with(tmp_path, [{'n': 1}], [{'n': 2}, {'n': 3}])
+
+    read = list(log.read())
+    assert [record for record, _ in read] == [{'n': 1}, {'n': 2}, {'n': 3}]
+    # Both records of the batch carry the offset after it
+    assert read[1][1] == read[2][1] == end
+    assert [record for record, _ in log.read(read[0][1])] == [{'n': 2}, {'n': 3}]
+
+
+def test_incomplete_batch_is_not_read(tmp_path):
+    log, end = _log_with(tmp_path, [{'n': 1}])
+    with open(log.path, 'ab') as f:
+        f.write(b'{"n":2,"batch":3}\n{"n":3}\n')  # crash before the third record
+
+    assert [record['n'] for record in log] == [1]
+
+
+def test_repair_tail_cuts_a_torn_line(tmp_path):
+    log, end = _log_with(tmp_path, [{'n': 1}])
+    with open(log.path, 'ab') as f:
+        f.write(b'{"n":2')
+
+    assert log.repair_tail(end)
+    assert log.size() == end
+    # Appends after the repair read back normally
+    log.append([{'n': 3}])
+    assert [record['n'] for record in log] == [1, 3]
+
+
+def test_repair_tail_cuts_an_incomplete_batch(tmp_path):
+    log, end = _log_with(tmp_path, [{'n': 1}])
+    with open(log.path, 'ab') as f:
+        f.write(b'{"n":2,"batch":2}\n')
+
+    assert log.repair_tail(end)
+    assert log.size() == end
+
+
+def test_repair_tail_leaves_complete_records_alone(tmp_path):
+    log, first_end = _log_with(tmp_path, [{'n': 1}])
+    log.append([{'n': 2}])  # appended by another process
+    size = log.size()
+
+    assert not log.repair_tail(first_end)
+    assert log.size() == size
+    assert log.repair_tail(size)
+
+
+def test_repair_tail_leaves_unreadable_data_alone(tmp_path):
+    log, end = _log_with(tmp_path, [{'n': 1}])
+    with open(log.path, 'ab') as f:
+        f.write(b'not json\n')
+
+    assert not log.repair_tail(end)
+    assert log.size() > end
+
+
+def test_interrupted_append_is_repaired_before_the_next_batch(db):
+    db.add_match_stats('Alice', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+    with open(match_log_path(db.db_file), 'ab') as f:
+        f.write(b'{"op":"add","player":"Ghost"')
+
+    assert db.add_match_stats('Bob', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+    assert [record['player'] for record in MatchLog(match_log_path(db.db_file))] == ['Alice', 'Bob']
@@ -0,0 +1,77 @@
+"""
+ResponseCache and the ETag / If-None-Match path of the polled API endpoints
+"""
+
+import gzip
+
+from response_cache import ResponseCache
+from serializer import loads
+
+from .conftest import RECAP_URL, match_stats
+
+
+def test_payload_is_built_once_per_version():
+    cache = ResponseCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'players': len(builds)}
+
+    first = cache.get('stats', 1, build)
+    assert cache.get('stats', 1, build) is first
+    assert len(builds) == 1
+
+    second = cache.get('stats', 2, build)
+    assert len(builds) == 2
+    assert loads(second.body) == {'players': 2}
+    assert second.etag != first.etag
+    assert gzip.decompress(second.gzip_body) == second.body
+
+
+def test_same_body_keeps_its_etag():
+    cache = ResponseCache()
+    first = cache.get('stats', 1, lambda: {'players': []})
+    second = cache.get('stats', 2, lambda: {'players': []})
+    assert second.etag == first.etag
+
+
+def test_oldest_slot_is_dropped_beyond_max_entries():
+    cache = ResponseCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.get(key, 1, lambda: key)
+
+    builds = []
+    cache.get('a', 1, lambda: builds.append('a') or 'a')
+    cache.get('c', 1, lambda: builds.append('c') or 'c')
+    assert builds == ['a']
+
+
+def test_stats_answer_304_while_unchanged(api):
+    client = api.app.test_client()
+    first = client.get('/api/stats')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    repeat = client.get('/api/stats', headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+    assert repeat.headers['ETag'] == etag
+
+    api.db_manager.add_match_stats('Erin', 'etag', match_stats(), match_url=RECAP_URL.format('etag'))
+    changed = client.get('/api/stats', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert 'Erin' in changed.get_data(as_text=True)
+
+
+def test_stats_are_gzipped_when_accepted(api):
+    client = api.app.test_client()
+    plain = client.get('/api/stats')
+    zipped = client.get('/api/stats', headers={'Accept-Encoding': 'gzip'})
+
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers['ETag'] == plain.headers['ETag']
+    assert 'Accept-Encoding' in zipped.headers['Vary']
@@ -0,0 +1,73 @@
+"""
+Series rebuild: a store rebuilt from the raw archives matches one recorded match by match
+"""
+
+import pytest
+
+from database_manager import AADSDataManager
+from series_rebuild import api_event_matches, api_player_stats, rebuild_series
+
+from .conftest import RECAP_URL
+
+EVENTS = ('mt_season_1', 'mt_season_2')
+
+
+def _api_response(event_number: int) -> dict:
+    """20 completed matches: final, semis, quarters, then 13 round-robin matches (A and B)"""
+    return {'status': 'OK', 'payload': {'completed': [
+        {'mi': f's{event_number}m{i}', 'hcf': f'Player {i % 6}', 'acf': f'Player {(i + event_number) % 6 + 6}',
+         'hs': 3, 'as': i % 3, 'hp5': 40.0 + i + event_number, 'ap5': 55.0 - i, 'h180': i % 2}
+        for i in range(20)
+    ]}}
+
+
+@pytest.fixture
+def event_data_dir(event_manager):
+    for event_number, event_id in enumerate(EVENTS, 1):
+        api_data = _api_response(event_number)
+        event_manager.save_event_matches(event_id, api_event_matches(event_id, api_data), raw_api_response=api_data)
+    return event_manager.base_dir
+
+
+def _record_match_by_match(db, event_manager):
+    """What scraping each saved match does: its stats plus the phase/group of the saved match list"""
+    for event_id in EVENTS:
+        completed = {match['mi']: match for match in event_manager.load_raw(event_id)['payload']['completed']}
+        for match in event_manager.load_pending_matches(event_id):
+            slice_keys = {key: value for key, value in (('phase', match['phase']), ('group', match['group_name']))
+                          if value}
+            for side in ('home', 'away'):
+                player_name, stats = api_player_stats(completed[match['url'].rsplit('/', 1)[-1]], side)
+                db.add_match_stats(player_name, event_id, {**stats, **slice_keys}, match['url'])
+
+
+@pytest.mark.parametrize('phases, groups', [
+    (['final'], None),
+    (['quarterfinal', 'semifinal', 'final'], None),
+    (['round_robin'], ['A']),
+    (['round_robin'], ['B']),
+])
+def test_rebuilt_slices_match_the_match_by_match_store(tmp_path, event_data_dir, event_manager, db, phases, groups):
+    _record_match_by_match(db, event_manager)
+    rebuilt_file = str(tmp_path / 'rebuilt' / 'aads_master_db.json')
+    assert rebuild_series(event_data_dir, rebuilt_file, workers=1)['events'] == len(EVENTS)
+    rebuilt = AADSDataManager(db_file=rebuilt_file)
+    try:
+        expected = db.query_leaderboard(phases=phases, groups=groups)
+        assert expected and expected != db.query_leaderboard()
+        assert rebuilt.query_leaderboard(phases=phases, groups=groups) == expected
+        assert rebuilt.get_player_splits('phase') == db.get_player_splits('phase')
+    finally:
+        rebuilt.close()
+
+
+def test_rebuilt_records_carry_phase_and_group(tmp_path, event_data_dir):
+    rebuilt_file = str(tmp_path / 'rebuilt' / 'aads_master_db.json')
+    rebuild_series(event_data_dir, rebuilt_file, workers=1)
+    rebuilt = AADSDataManager(db_file=rebuilt_file)
+    try:
+        history = {entry['match_url']: entry['stats'] for entry in rebuilt.get_player_history('Player 0')}
+    finally:
+        rebuilt.close()
+    assert (history[RECAP_URL.format('s1m0')]['phase'], 'group' in history[RECAP_URL.format('s1m0')]) == ('final', False)
+    assert (history[RECAP_URL.format('s1m12')]['phase'], history[RECAP_URL.format('s1m12')]['group']) == ('round_robin', 'A')
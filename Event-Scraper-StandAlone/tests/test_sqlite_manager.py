@@ -0,0 +1,82 @@
+"""
+SQLiteDataManager: same behavior as the JSON store behind the same interface
+"""
+
+import pytest
+
+from database_manager import AADSDataManager, open_data_manager
+from sqlite_manager import SQLiteDataManager
+
+from .conftest import RECAP_URL, match_stats
+
+RECORDS = [
+    ('Alice', 'e1', 'm1', match_stats(average=70.0, count_180s=1, highest_finish=120)),
+    ('Bob', 'e1', 'm1', match_stats(average=55.0, won=0)),
+    ('Alice', 'e2', 'm2', match_stats(average=64.0, legs=5)),
+    ('Carol', 'e2', 'm2', match_stats(average=66.0, won=0, double_attempts=8, doubles_hit=2)),
+]
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    manager = SQLiteDataManager(str(tmp_path / 'aads_master.db'))
+    yield manager
+    manager.close()
+
+
+def _record_all(db):
+    for player, event_id, match_id, stats in RECORDS:
+        db.add_match_stats(player, event_id, stats, match_url=RECAP_URL.format(match_id))
+
+
+def _ranking(db):
+    return [(row['name'], row['rank'], round(row['total_average'], 4), row['total_180s'],
+             round(row['checkout_percentage'], 4))
+            for row in db.get_stats_api_format()['players']]
+
+
+def test_open_data_manager_picks_the_backend_from_the_extension(tmp_path):
+    sqlite_db = open_data_manager(str(tmp_path / 'stats.db'))
+    json_db = open_data_manager(str(tmp_path / 'stats.json'))
+    assert isinstance(sqlite_db, SQLiteDataManager)
+    assert isinstance(json_db, AADSDataManager)
+    sqlite_db.close()
+    json_db.close()
+
+
+def test_leaderboard_matches_the_json_store(sqlite_db, db):
+    _record_all(sqlite_db)
+    _record_all(db)
+
+    assert _ranking(sqlite_db) == _ranking(db)
+    assert [entry['stats'] for entry in sqlite_db.get_player_history('Alice')] == \
+        [entry['stats'] for entry in db.get_player_history('Alice')]
+
+
+def test_duplicates_are_rejected(sqlite_db):
+    url = RECAP_URL.format('m1')
+    assert sqlite_db.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    assert not sqlite_db.add_match_stats('Alice', 'e1', match_stats(), match_url=url)
+    assert sqlite_db.is_match_scraped(url, 'Alice')
+    assert not sqlite_db.is_match_scraped(url, 'Bob')
+
+
+def test_failed_batch_is_rolled_back(sqlite_db):
+    with pytest.raises(RuntimeError):
+        with sqlite_db.batch():
+            sqlite_db.add_match_stats('Alice', 'e1', match_stats(), match_url=RECAP_URL.format('m1'))
+            raise RuntimeError('scrape failed half way')
+
+    assert sqlite_db.get_stats_api_format()['players'] == []
+    assert not sqlite_db.is_match_scraped(RECAP_URL.format('m1'), 'Alice')
+
+
+def test_import_json_carries_the_json_store_over(sqlite_db, db):
+    _record_all(db)
+    db.flush()
+
+    counts = sqlite_db.import_json(db.db_file)
+
+    assert counts['players'] == 3
+    assert _ranking(sqlite_db) == _ranking(db)
+    assert sqlite_db.is_match_scraped(RECAP_URL.format('m2'), 'Carol')
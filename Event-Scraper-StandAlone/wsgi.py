@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Event Scraper WSGI Entry Point - Production serving for the API server
+
+Usage:
+    python wsgi.py                          (waitress, server.threads request threads)
+    gunicorn -c gunicorn.conf.py wsgi:app   (server.workers processes x server.threads threads)
+
+Every server process builds its own scraper, browser pool and store handles
+when it imports api_server, and each request thread uses its own scraper copy.
+Run from this directory (data/ and config/ paths are relative to it).
+"""
+
+import os
+import sys
+
+from api_server import app, config, job_queue, logger
+
+# Run background jobs in this process (or stand by while another worker process runs them)
+job_queue.start()
+
+# Some WSGI servers look for `application`
+application = app
+
+
+def serve():
+    """Serve with waitress using the server section of config/config.json"""
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        print("waitress not available. Install with: pip install waitress")
+        print("(or run: gunicorn -c gunicorn.conf.py wsgi:app)")
+        sys.exit(1)
+
+    server_config = config['server']
+    threads = int(os.environ.get('SERVER_THREADS', server_config['threads']))
+    os.makedirs('data/event_data', exist_ok=True)
+
+    logger.info(f"Serving on http://{server_config['host']}:{server_config['port']} with waitress ({threads} threads)")
+    waitress_serve(app, host=server_config['host'], port=server_config['port'], threads=threads,
+                   channel_timeout=300, ident='aads-event-scraper')
+
+
+if __name__ == '__main__':
+    serve()